@@ -0,0 +1,142 @@
+"""
+ABR detail parsing: etree_to_dict + format_record versus BusinessEntityExtractor.
+
+Uses SearchByABNv201408 responses synthesised from data/raw/abn_register_results_*.csv
+and checks that both paths produce identical records before timing them. The dict-tree
+path is the parser search_abn_register used before web_worker.abr_extract, kept here as
+the reference the extractor must agree with.
+
+    python -m benchmarks.bench_abr_extract --repeat 5
+"""
+import argparse
+import json
+import time
+import xml.etree.ElementTree as ET
+from typing import Any
+
+from benchmarks.fixtures import abr_details_fixtures
+from web_worker.abr_extract import ENTITY_EXTRACTOR
+from web_worker.records import ABNRecord
+
+def etree_to_dict(elem) -> Any:
+    """
+    Recursively convert an xml.etree.ElementTree.Element into a dict or a text value.
+    """
+    d = {}
+    children = list(elem)
+    if children:
+        child_dict = {}
+        for child in children:
+            tag = child.tag
+            ns_idx = tag.find('}')
+            if ns_idx != -1:
+                tag = tag[ns_idx + 1:]
+            child_value = etree_to_dict(child)
+            if tag in child_dict:
+                if isinstance(child_dict[tag], list):
+                    child_dict[tag].append(child_value)
+                else:
+                    child_dict[tag] = [child_dict[tag], child_value]
+            else:
+                child_dict[tag] = child_value
+        d.update(child_dict)
+    text = (elem.text or '').strip()
+    if text and not children:
+        return text
+    elif text:
+        d['value'] = text
+    return d
+
+def extract_business_entity(details: dict) -> dict:
+    """
+    Returns the businessEntity201408 dictionary from parsed ABR XML.
+    """
+    response = (
+        details.get("Body", {})
+        .get("SearchByABNv201408Response", {})
+        .get("ABRPayloadSearchResults", {})
+        .get("response", {})
+    )
+    return response.get("businessEntity201408", {})
+
+def format_record(be: dict) -> ABNRecord:
+    """
+    Formats a businessEntity201408 dict into the requested flat record structure.
+    """
+    def get_path(node, *path):
+        curr = node
+        for key in path:
+            if isinstance(curr, list):
+                curr = curr[0] if curr else None
+            if not isinstance(curr, dict):
+                return None
+            curr = curr.get(key)
+        if isinstance(curr, dict) or isinstance(curr, list):
+            return curr
+        return curr
+
+    abn = get_path(be, "ABN", "identifierValue")
+    is_current = get_path(be, "ABN", "isCurrentIndicator")
+    replaced_from = get_path(be, "ABN", "replacedFrom")
+    entity_status = get_path(be, "entityStatus", "entityStatusCode")
+    effective_from = get_path(be, "entityStatus", "effectiveFrom")
+    effective_to = get_path(be, "entityStatus", "effectiveTo")
+    entity_type_code = get_path(be, "entityType", "entityTypeCode")
+    entity_type_description = get_path(be, "entityType", "entityDescription")
+    acnc_status = get_path(be, "ACNCRegistration", "status")
+    acnc_status_from = get_path(be, "ACNCRegistration", "effectiveFrom")
+    acnc_status_to = get_path(be, "ACNCRegistration", "effectiveTo")
+    record_last_updated = be.get("recordLastUpdatedDate")
+
+    # ABNRecord encodes the nested values to JSON strings
+    return ABNRecord(
+        abn,
+        is_current,
+        replaced_from,
+        entity_status,
+        effective_from,
+        effective_to,
+        entity_type_code,
+        entity_type_description,
+        acnc_status,
+        acnc_status_from,
+        acnc_status_to,
+        record_last_updated,
+        be.get("goodsAndServicesTax"),
+        be.get("dgrEndorsement"),
+        be.get("mainTradingName"),
+        be.get("otherTradingName"),
+        be.get("mainBusinessPhysicalAddress"),
+        be.get("taxConcessionCharityEndorsement"),
+    )
+
+def dict_tree(content: bytes):
+    return format_record(extract_business_entity(etree_to_dict(ET.fromstring(content))))
+
+def extractor(content: bytes):
+    return ENTITY_EXTRACTOR.parse(content)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    responses = list(abr_details_fixtures())
+    for content in responses:
+        if dict(dict_tree(content)) != dict(extractor(content)):
+            raise SystemExit(f"Extractor output differs from etree_to_dict for {content[:200]!r}")
+
+    results = {}
+    for name, parse in (("etree_to_dict", dict_tree), ("extractor", extractor)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for content in responses:
+                parse(content)
+            best = min(best, time.perf_counter() - started)
+        results[name] = {"responses": len(responses), "best_seconds": round(best, 4),
+                         "per_second": round(len(responses) / best)}
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Addresses per minute through address_columns for each register's address format.
+
+Rows are synthesised from the region file with the variations seen in the registers
+(case, punctuation, abbreviations, full state names, a street on the front, blanks), so
+each source has about --distinct different addresses repeated to --rows.
+
+    python -m benchmarks.bench_addresses --rows 300000 --distinct 20000
+"""
+import argparse
+import json
+import random
+import time
+
+import pandas as pd
+
+from config_data.regions import STATES, load_regions
+from data.processing.address_columns import address_columns, region_matcher
+
+STATE_NAMES = {"NSW": "New South Wales", "VIC": "Victoria", "QLD": "Queensland"}
+
+def variant(rng: random.Random, suburb: str) -> str:
+    choice = rng.random()
+    if choice < 0.25:
+        return suburb.title()
+    if choice < 0.35:
+        return suburb.replace("MOUNT ", "MT. ")
+    return suburb
+
+def frames(rows: int, distinct: int, seed: int = 1):
+    rng = random.Random(seed)
+    index = load_regions()
+    nsw, acnc, abr = [], [], []
+    for _ in range(distinct):
+        i = rng.randrange(len(index))
+        suburb, state, postcode = variant(rng, index.suburbs[i]), STATES[index.states[i]], f"{index.postcodes[i]:04d}"
+        street = f"{rng.randint(1, 999)} HIGH ST{',' if rng.random() < 0.5 else ''} " if rng.random() < 0.3 else ""
+        nsw.append("" if rng.random() < 0.1 else f"{street}{suburb} {state} {postcode}")
+        acnc.append((suburb, STATE_NAMES.get(state, state) if rng.random() < 0.2 else state, postcode))
+        abr.append(json.dumps({"stateCode": state, "postcode": postcode, "effectiveFrom": f"20{rng.randint(10, 24)}-01-01"}))
+    picks = [rng.randrange(distinct) for _ in range(rows)]
+    return {
+        "nsw": pd.DataFrame({"registered_office_address": [nsw[p] for p in picks]}, dtype=str),
+        "acnc": pd.DataFrame([acnc[p] for p in picks], columns=["Town_City", "State", "Postcode"], dtype=str),
+        "abr": pd.DataFrame({"main_business_physical_address": [abr[p] for p in picks]}, dtype=str),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--distinct", type=int, default=20_000)
+    args = parser.parse_args()
+    data = frames(args.rows, args.distinct)
+    region_matcher()
+    results = {}
+    for source, frame in data.items():
+        started = time.perf_counter()
+        columns = address_columns(frame, source)
+        elapsed = time.perf_counter() - started
+        results[source] = {
+            "rows": len(frame),
+            "seconds": round(elapsed, 3),
+            "rows_per_minute": int(len(frame) / elapsed * 60),
+            "matched": {k: int(v) for k, v in columns["address_match"].fillna("no_address").value_counts().items()},
+        }
+    print(json.dumps(results, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+End-to-end main.main() throughput against a local replay of the registers.
+
+Serves a recording (see benchmarks.replay; by default one synthesised from data/raw)
+with each --latency in turn, runs main.py against it in a subprocess with the
+politeness delays off, and reports units, rows and requests per second from the run
+summary it writes. Exits non-zero if main.py fails or makes a request the recording
+does not cover, so changes to what the scrapers send show up as failures.
+
+    python -m benchmarks.bench_end_to_end --latency 0,0.05
+    python -m benchmarks.bench_end_to_end --recording benchmarks/recordings/batlow
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import ROOT
+from benchmarks.replay import Recording, ReplayServer, replay_env, synthesize
+
+def run(recording: Recording, latency: float, jitter: float) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench_e2e_") as output_dir, \
+            ReplayServer(recording, latency, jitter) as server:
+        env = {**os.environ, **replay_env(server.url), "REGIONS_FILE": recording.regions_file, "OUTPUT_DIR": output_dir,
+               # Fresh outcome and ABN details databases, so no unit is skipped as known empty and no
+               # ABN is served from an earlier run
+               "RUN_DB": os.path.join(output_dir, "runs.sqlite"),
+               "ABN_DETAILS_DB": os.path.join(output_dir, "abn_details.sqlite")}
+        started = time.perf_counter()
+        process = subprocess.run([sys.executable, "main.py"], cwd=ROOT, env=env, capture_output=True, text=True)
+        seconds = time.perf_counter() - started
+        if process.returncode != 0:
+            print(process.stderr[-4000:], file=sys.stderr)
+            raise SystemExit(f"FAIL: main.py exited with {process.returncode} at latency {latency}")
+        with open(glob.glob(os.path.join(output_dir, "run_summary_*.json"))[0], encoding="utf-8") as file:
+            summary = json.load(file)
+    rows = sum(source["rows"] for source in summary["sources"].values())
+    return {
+        "latency": latency,
+        "seconds": round(seconds, 2),
+        "units": summary["units"],
+        "units_per_second": round(summary["units"] / seconds, 2),
+        "rows_per_second": round(rows / seconds, 1),
+        "requests": server.served,
+        "requests_per_second": round(server.served / seconds, 1),
+        "not_recorded": len(server.missed),
+        "sources": summary["sources"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recording", help="recording directory (default: synthesise one from data/raw)")
+    parser.add_argument("--latency", default="0,0.05", help="comma-separated per-response latencies in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_recording_") as scratch:
+        directory = args.recording
+        if directory is None:
+            directory = scratch
+            synthesize(directory)
+        recording = Recording(directory)
+        results = [run(recording, float(latency), args.jitter) for latency in args.latency.split(",")]
+
+    print(json.dumps(results, indent=2))
+    missed = sum(r["not_recorded"] for r in results)
+    if missed:
+        print(f"FAIL: {missed} requests were not in the recording")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Import time of main.py and the web_worker modules, and what each import drags in.
+
+Each module is imported in a fresh interpreter (-X importtime, best of --repeat) with
+PRIVATE_ABN_SEARCH_GUID unset. Exits non-zero if an import fails or loads one of the
+HEAVY packages, which should only be imported once the stage that needs them runs.
+
+    python -m benchmarks.bench_import_time --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.fixtures import ROOT
+
+MODULES = (
+    "main",
+    "web_worker.http_transport",
+    "web_worker.search_nsw_assoc_register",
+    "web_worker.search_anc_register",
+    "web_worker.search_abn_register",
+)
+
+HEAVY = ("zeep", "ckanapi", "bs4", "sqlalchemy", "lxml", "dotenv")
+
+PROBE = "import sys, json, {module}; print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+
+def import_once(module: str) -> dict:
+    env = {k: v for k, v in os.environ.items() if k != "PRIVATE_ABN_SEARCH_GUID"}
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, heavy=HEAVY)],
+                             cwd=ROOT, env=env, capture_output=True, text=True)
+    if process.returncode != 0:
+        return {"error": process.stderr.strip().splitlines()[-1]}
+    # Lines read "import time: self [us] | cumulative | name", the name indented by nesting depth
+    cumulative = next(int(line.split("|")[1]) for line in process.stderr.splitlines()
+                      if line.startswith("import time:") and line.split("|")[2].strip() == module)
+    return {"ms": cumulative / 1000, "heavy": json.loads(process.stdout)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results, failures = {}, []
+    for module in MODULES:
+        runs = [import_once(module) for _ in range(args.repeat)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            results[module] = {"error": errors[0]}
+            failures.append(f"{module} failed to import: {errors[0]}")
+            continue
+        results[module] = {"ms": round(min(run["ms"] for run in runs), 1), "heavy": runs[0]["heavy"]}
+        if runs[0]["heavy"]:
+            failures.append(f"{module} imports {', '.join(runs[0]['heavy'])}")
+
+    print(json.dumps(results, indent=2))
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
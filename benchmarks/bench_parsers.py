@@ -0,0 +1,99 @@
+"""
+Parser microbenchmarks over recorded register responses.
+
+Times each parse stage the scrapers run on a response, in isolation from the network:
+NSW result pages (BeautifulSoup + _parse_results), ACNC datastore pages (json +
+ACNCCharityRecord), ABR charity searches (ElementTree) and ABR details
+(BusinessEntityExtractor).
+
+    python -m benchmarks.bench_parsers --repeat 5
+    python -m benchmarks.bench_parsers --recording benchmarks/recordings/batlow
+"""
+import argparse
+import json
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from bs4 import BeautifulSoup
+
+from benchmarks.replay import Recording, synthesize
+
+_scraper = None
+
+def nsw_page(content: bytes) -> int:
+    global _scraper
+    if _scraper is None:
+        from web_worker.search_nsw_assoc_register import NSWAssociationScraper
+        _scraper = NSWAssociationScraper()
+    soup = BeautifulSoup(content.decode("utf-8"), "html.parser")
+    return len(_scraper._parse_results(soup))
+
+def acnc_page(content: bytes) -> int:
+    from web_worker.records import ACNCCharityRecord
+
+    return len([ACNCCharityRecord(record) for record in json.loads(content)["result"]["records"]])
+
+def abr_search(content: bytes) -> int:
+    from web_worker.search_abn_register import NAMESPACE
+
+    return len(ET.fromstring(content).findall(".//ns:abn", namespaces=NAMESPACE))
+
+def abr_details(content: bytes) -> int:
+    from web_worker.abr_extract import ENTITY_EXTRACTOR
+
+    return int(ENTITY_EXTRACTOR.parse(content) is not None)
+
+def stage(entry) -> str:
+    key, content_type = entry["key"], entry["content_type"]
+    if "html" in content_type and "ResultDataList" in entry.get("body", ""):
+        return "nsw_page"
+    if "json" in content_type and "datastore_search" in key:
+        return "acnc_page"
+    if "SearchByCharity" in key:
+        return "abr_search"
+    if "SearchByABNv201408" in key:
+        return "abr_details"
+    return ""
+
+PARSERS = {"nsw_page": nsw_page, "acnc_page": acnc_page, "abr_search": abr_search, "abr_details": abr_details}
+
+def bench(parse, responses, repeat: int) -> dict:
+    parse(responses[0])
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = sum(parse(content) for content in responses)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "responses": len(responses),
+        "rows": rows,
+        "mb": round(sum(len(c) for c in responses) / 1_000_000, 2),
+        "us_per_response": round(best / len(responses) * 1e6, 1),
+        "rows_per_second": round(rows / best) if best else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recording", help="recording directory (default: synthesise one from data/raw)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_recording_") as scratch:
+        directory = args.recording
+        if directory is None:
+            directory = scratch
+            synthesize(directory)
+        recording = Recording(directory)
+
+    responses = {name: [] for name in PARSERS}
+    for entry in recording.entries():
+        name = stage(entry)
+        if name and entry["status"] == 200:
+            responses[name].append(recording.content(entry))
+    results = {name: bench(PARSERS[name], contents, args.repeat) for name, contents in responses.items() if contents}
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
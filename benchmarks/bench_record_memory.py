@@ -0,0 +1,78 @@
+"""
+Peak RSS for holding a large run's scraped rows as plain dicts versus record classes.
+
+Rows are built from the raw CSVs in data/raw and repeated to --rows per source. Each
+variant runs in its own subprocess so ru_maxrss reflects only that variant.
+
+    python -m benchmarks.bench_record_memory --rows 200000
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_DIR = os.path.join(ROOT, "data", "raw")
+
+def latest(pattern):
+    files = sorted(glob.glob(os.path.join(RAW_DIR, pattern)))
+    if not files:
+        raise FileNotFoundError(f"No {pattern} in {RAW_DIR}")
+    return files[-1]
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def build(kind: str, rows: int):
+    from web_worker.records import ABNRecord, NSWAssociationRecord
+
+    with open(latest("abn_register_results_*.csv"), newline="", encoding="utf-8") as f:
+        abn_rows = list(csv.DictReader(f))
+    with open(latest("fair_trading_incorporation_register_results_*.csv"), newline="", encoding="utf-8") as f:
+        nsw_rows = list(csv.DictReader(f))
+
+    baseline = peak_rss_mb()
+    held = []
+    started = time.perf_counter()
+    for i in range(rows):
+        # Fresh strings per row, as they would be when parsed from separate responses
+        abn = {k: (v + " ")[:-1] if v else None for k, v in abn_rows[i % len(abn_rows)].items()}
+        nsw = {k: (v + " ")[:-1] if v else None for k, v in nsw_rows[i % len(nsw_rows)].items()}
+        if kind == "dict":
+            held.append(abn)
+            held.append(nsw)
+        else:
+            values = [json.loads(abn[f]) if f in ABNRecord.JSON_FIELDS and abn[f] else abn[f]
+                      for f in ABNRecord.FIELDS]
+            held.append(ABNRecord(*values))
+            held.append(NSWAssociationRecord.from_dict(nsw))
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "kind": kind,
+        "rows_per_source": rows,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_over_baseline_mb": round(peak_rss_mb() - baseline, 1),
+        "build_seconds": round(elapsed, 2),
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--kind", choices=["dict", "record"])
+    args = parser.parse_args()
+    if args.kind:
+        build(args.kind, args.rows)
+        return
+    for kind in ("dict", "record"):
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_record_memory", "--kind", kind,
+                        "--rows", str(args.rows)], cwd=ROOT, check=True)
+
+if __name__ == "__main__":
+    main()
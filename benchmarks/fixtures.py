@@ -0,0 +1,187 @@
+"""
+Synthetic register responses built from the rows in data/raw, for offline benchmarks.
+"""
+import csv
+import glob
+import json
+import os
+from typing import Dict, Iterator, List
+from xml.sax.saxutils import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_DIR = os.path.join(ROOT, "data", "raw")
+
+def latest_raw(pattern: str) -> str:
+    files = sorted(glob.glob(os.path.join(RAW_DIR, pattern)))
+    if not files:
+        raise FileNotFoundError(f"No {pattern} in {RAW_DIR}")
+    return files[-1]
+
+def read_rows(pattern: str) -> List[Dict[str, str]]:
+    with open(latest_raw(pattern), newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+def _xml(tag: str, value) -> str:
+    """Inverse of etree_to_dict for the shapes found in the ABR CSV JSON columns."""
+    if isinstance(value, list):
+        return "".join(_xml(tag, item) for item in value)
+    if isinstance(value, dict):
+        inner = "".join(_xml(k, v) for k, v in value.items() if k != "value")
+        return f"<{tag}>{escape(value.get('value', ''))}{inner}</{tag}>"
+    if value in (None, ""):
+        return f"<{tag}/>"
+    return f"<{tag}>{escape(str(value))}</{tag}>"
+
+NESTED_COLUMNS = {
+    "gst": "goodsAndServicesTax",
+    "dgr": "dgrEndorsement",
+    "main_trading_names": "mainTradingName",
+    "other_trading_names": "otherTradingName",
+    "main_business_physical_address": "mainBusinessPhysicalAddress",
+    "tax_concession_endorsements": "taxConcessionCharityEndorsement",
+}
+
+def abr_details_xml(row: Dict[str, str]) -> bytes:
+    """A SearchByABNv201408 SOAP response for one row of abn_register_results_*.csv."""
+    entity = [
+        _xml("recordLastUpdatedDate", row["record_last_updated"]),
+        _xml("ABN", {"identifierValue": row["abn"], "isCurrentIndicator": row["isCurrent"],
+                     "replacedFrom": row["replacedFrom"]}),
+        _xml("entityStatus", {"entityStatusCode": row["entityStatus"], "effectiveFrom": row["effectiveFrom"],
+                              "effectiveTo": row["effectiveTo"]}),
+        "<ASICNumber/>",
+        _xml("entityType", {"entityTypeCode": row["entityTypeCode"], "entityDescription": row["entityDescription"]}),
+    ]
+    for column, tag in NESTED_COLUMNS.items():
+        if row.get(column):
+            entity.append(_xml(tag, json.loads(row[column])))
+    entity.append(_xml("ACNCRegistration", {"status": row["acnc_status"], "effectiveFrom": row["acnc_status_from"],
+                                            "effectiveTo": row["acnc_status_to"]}))
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">'
+        '<soap:Body><SearchByABNv201408Response xmlns="http://abr.business.gov.au/ABRXMLSearch/">'
+        '<ABRPayloadSearchResults><request><identifierSearchRequest>'
+        f'<authenticationGUID>00000000-0000-0000-0000-000000000000</authenticationGUID>'
+        f'<identifierType>ABN</identifierType><identifierValue>{row["abn"]}</identifierValue>'
+        '<history>N</history></identifierSearchRequest></request>'
+        '<response><usageStatement>Fixture</usageStatement>'
+        '<dateRegisterLastUpdated>2025-09-07</dateRegisterLastUpdated>'
+        '<dateTimeRetrieved>2025-09-07T12:19:00+10:00</dateTimeRetrieved>'
+        f'<businessEntity201408>{"".join(entity)}</businessEntity201408>'
+        '</response></ABRPayloadSearchResults></SearchByABNv201408Response></soap:Body></soap:Envelope>'
+    ).encode("utf-8")
+
+def abr_details_fixtures() -> Iterator[bytes]:
+    for row in read_rows("abn_register_results_*.csv"):
+        yield abr_details_xml(row)
+
+ABR_NAMESPACE = "http://abr.business.gov.au/ABRXMLSearch/"
+ABR_SERVICE_URL = "https://abr.business.gov.au/abrxmlsearch/AbrXmlSearch.asmx"
+
+# Request elements of the ABR operations the client calls
+ABR_OPERATIONS = {
+    "SearchByCharity": ("postcode", "state", "charityTypeCode", "concessionTypeCode", "authenticationGuid"),
+    "SearchByABNv201408": ("searchString", "includeHistoricalDetails", "authenticationGuid"),
+}
+
+def abr_wsdl(address: str = ABR_SERVICE_URL) -> bytes:
+    """A document/literal WSDL with just the ABR operations the client calls; responses are left untyped."""
+    elements, messages, port_ops, binding_ops = [], [], [], []
+    for operation, params in ABR_OPERATIONS.items():
+        fields = "".join(f'<s:element minOccurs="0" name="{p}" type="s:string"/>' for p in params)
+        elements.append(f'<s:element name="{operation}"><s:complexType><s:sequence>{fields}</s:sequence></s:complexType></s:element>'
+                        f'<s:element name="{operation}Response"><s:complexType><s:sequence>'
+                        '<s:any minOccurs="0" maxOccurs="unbounded" processContents="lax"/>'
+                        '</s:sequence></s:complexType></s:element>')
+        messages.append(f'<wsdl:message name="{operation}SoapIn"><wsdl:part name="parameters" element="tns:{operation}"/></wsdl:message>'
+                        f'<wsdl:message name="{operation}SoapOut"><wsdl:part name="parameters" element="tns:{operation}Response"/></wsdl:message>')
+        port_ops.append(f'<wsdl:operation name="{operation}"><wsdl:input message="tns:{operation}SoapIn"/>'
+                        f'<wsdl:output message="tns:{operation}SoapOut"/></wsdl:operation>')
+        binding_ops.append(f'<wsdl:operation name="{operation}"><soap:operation soapAction="{ABR_NAMESPACE}{operation}" style="document"/>'
+                           '<wsdl:input><soap:body use="literal"/></wsdl:input><wsdl:output><soap:body use="literal"/></wsdl:output>'
+                           '</wsdl:operation>')
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<wsdl:definitions xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/" xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/" '
+        f'xmlns:s="http://www.w3.org/2001/XMLSchema" xmlns:tns="{ABR_NAMESPACE}" targetNamespace="{ABR_NAMESPACE}">'
+        f'<wsdl:types><s:schema elementFormDefault="qualified" targetNamespace="{ABR_NAMESPACE}">{"".join(elements)}</s:schema></wsdl:types>'
+        f'{"".join(messages)}<wsdl:portType name="ABRXMLSearchSoap">{"".join(port_ops)}</wsdl:portType>'
+        '<wsdl:binding name="ABRXMLSearchSoap" type="tns:ABRXMLSearchSoap"><soap:binding transport="http://schemas.xmlsoap.org/soap/http"/>'
+        f'{"".join(binding_ops)}</wsdl:binding>'
+        '<wsdl:service name="ABRXMLSearch"><wsdl:port name="ABRXMLSearchSoap" binding="tns:ABRXMLSearchSoap">'
+        f'<soap:address location="{escape(address)}"/></wsdl:port></wsdl:service></wsdl:definitions>'
+    ).encode("utf-8")
+
+def abr_charity_search_xml(abns: List[str]) -> bytes:
+    """A SearchByCharity SOAP response listing abns."""
+    listed = "".join(f"<abn>{escape(abn)}</abn>" for abn in abns)
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+        f'<soap:Body><SearchByCharityResponse xmlns="{ABR_NAMESPACE}"><ABRPayloadSearchResults>'
+        '<response><usageStatement>Fixture</usageStatement>'
+        f'<charitySearchResults><numberOfRecords>{len(abns)}</numberOfRecords>{listed}</charitySearchResults>'
+        '</response></ABRPayloadSearchResults></SearchByCharityResponse></soap:Body></soap:Envelope>'
+    ).encode("utf-8")
+
+def abr_postcode(row: Dict[str, str]) -> str:
+    address = json.loads(row["main_business_physical_address"]) if row.get("main_business_physical_address") else None
+    if isinstance(address, list):
+        address = address[0] if address else None
+    return (address or {}).get("postcode", "")
+
+NSW_FIELD = "ctl00$MainArea$AdvancedSearchSection$"
+NSW_NEXT = "ctl00$MainArea$PageNextLink"
+
+def nsw_form(view_state: str, postcode: str = "", rows: List[Dict[str, str]] = (), has_next: bool = False) -> bytes:
+    """
+    An NSW register search page: the ASP.NET form, its result rows (parsed by
+    NSWAssociationScraper._parse_results) and, when has_next, the next page link.
+    """
+    results = []
+    for row in rows:
+        details = "".join(f"<div>{label}: {escape(row.get(column) or '')}</div>" for label, column in (
+            ("Organisation Number", "organisation_number"), ("Organisation Type", "organisation_type"),
+            ("Date Registered", "date_registered"), ("Date Removed", "date_removed"),
+            ("Registered Office Address", "registered_office_address")))
+        results.append(
+            '<div class="row"><div class="col-md-10">'
+            f'<a href="PublicRegisterDetails.aspx?Organisationid={escape(row.get("organisation_id") or "")}">{escape(row["name"])}</a>'
+            f'<div class="row text-secondary">{details}</div></div>'
+            f'<div class="col-md-2"><figure><figcaption><span>{escape(row.get("status") or "")}</span></figcaption></figure></div></div>'
+        )
+    listing = f'<span id="ctl00_MainArea_ResultDataList">{"".join(results)}</span>' if rows else ""
+    next_link = (f'<a id="ctl00_MainArea_PageNextLink" href="javascript:__doPostBack(&#39;{NSW_NEXT}&#39;,&#39;&#39;)">Next</a>'
+                 if has_next else "")
+    return (
+        '<!DOCTYPE html><html><head><title>Search the register</title></head><body>'
+        '<form method="post" action="./RegistrationSearch.aspx" id="aspnetForm">'
+        f'<input type="hidden" name="__VIEWSTATE" value="{escape(view_state)}"/>'
+        '<input type="hidden" name="__EVENTTARGET" value=""/><input type="hidden" name="__EVENTARGUMENT" value=""/>'
+        f'<input type="text" name="{NSW_FIELD}Postcode" value="{escape(postcode)}"/>'
+        f'{listing}{next_link}</form></body></html>'
+    ).encode("utf-8")
+
+def acnc_record(row: Dict[str, str], town_city: str, state: str, postcode: str, record_id: int) -> Dict:
+    """An ACNC datastore record for an ABR row, located in town_city."""
+    names = json.loads(row["main_trading_names"]) if row.get("main_trading_names") else None
+    if isinstance(names, list):
+        names = names[0] if names else None
+    name = (names or {}).get("organisationName") if isinstance(names, dict) else None
+    return {
+        "_id": record_id,
+        "ABN": row["abn"],
+        "Charity_Legal_Name": name or f"CHARITY {row['abn']}",
+        "Other_Organisation_Names": "",
+        "Address_Type": "Australian",
+        "Town_City": town_city,
+        "State": state,
+        "Postcode": postcode,
+        "Country": "Australia",
+        "Charity_Website": "",
+        "Registration_Date": row.get("acnc_status_from") or "",
+        "Date_Organisation_Established": row.get("effectiveFrom") or "",
+        "Charity_Size": "Small",
+    }
@@ -0,0 +1,390 @@
+"""
+Record and replay register traffic, so benchmarks run without touching the real registers.
+
+    python -m benchmarks.replay record benchmarks/recordings/batlow NSW:2730
+    python -m benchmarks.replay synthesize benchmarks/recordings/raw
+    python -m benchmarks.replay serve benchmarks/recordings/batlow --latency 0.05
+
+A recording is a directory holding exchanges.jsonl (the final response to every request
+made through RetryingSession, keyed by request_key) and regions.csv (the suburbs it
+covers). `record` captures live NSW HTML, ACNC CKAN JSON and ABR SOAP XML for the
+selected regions; `synthesize` builds an equivalent recording from the rows in data/raw.
+ReplayServer serves a recording on localhost under /<original host>/..., with optional
+latency, and rewrites https links to the original hosts to itself. replay_env() returns the
+environment that points the scrapers at it.
+"""
+import argparse
+import base64
+import csv
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from benchmarks import fixtures
+from web_worker.http_transport import REGISTER_URLS
+
+logger = logging.getLogger(__name__)
+
+EXCHANGES = "exchanges.jsonl"
+REGIONS = "regions.csv"
+
+# Request fields that differ between a recording and its replay without changing the response
+VOLATILE_FIELDS = frozenset({"authenticationGuid", "authenticationGUID"})
+
+XML_LEAF = re.compile(r"<(?:[\w.-]+:)?([\w.-]+)(?:\s[^>]*)?>([^<]+)</")
+
+def _text(body) -> str:
+    if body is None:
+        return ""
+    return body.decode("utf-8", "replace") if isinstance(body, bytes) else body
+
+def _header(headers, name: str) -> str:
+    return next((v for k, v in (headers or {}).items() if k.lower() == name.lower()), "")
+
+def request_key(method: str, path: str, headers=None, body=None) -> str:
+    """
+    Identifies a request by method, /host/path?query, SOAP action and the meaningful
+    fields of its body (form fields, JSON, or XML leaf values), ignoring VOLATILE_FIELDS
+    and empty values so that replays match recordings made with other credentials.
+    """
+    content_type = _header(headers, "Content-Type")
+    action = _header(headers, "SOAPAction").strip('"')
+    text = _text(body)
+    fields: List[Tuple[str, str]] = []
+    if text:
+        if "json" in content_type:
+            fields = [("json", json.dumps(json.loads(text), sort_keys=True))]
+        elif "xml" in content_type:
+            fields = XML_LEAF.findall(text)
+        else:
+            fields = parse_qsl(text)
+    fields = sorted((k, v.strip()) for k, v in fields if k not in VOLATILE_FIELDS and v.strip())
+    return f"{method.upper()} {path} {action} {json.dumps(fields, separators=(',', ':'))}"
+
+def host_path(url: str) -> str:
+    """/<host><path>?<query>, the path a URL is served under by ReplayServer."""
+    parts = urlsplit(url)
+    return f"/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+def rewrite_origins(text: str, hosts: Iterable[str], base_url: str) -> str:
+    # https only: the registers serve over https, and http://<host>/ URIs are XML namespaces
+    for host in hosts:
+        text = text.replace(f"https://{host}", f"{base_url}/{host}")
+    return text
+
+def replay_env(base_url: str) -> Dict[str, str]:
+    """Environment for main.py and the scrapers to use a ReplayServer at base_url, without politeness delays."""
+    env = {name: rewrite_origins(url, [urlsplit(url).hostname], base_url) for name, url in REGISTER_URLS.items()}
+    env.update({
+        "NSW_PAGE_DELAY": "0",
+        "ABR_LOOKUP_DELAY": "0",
+        "PRIVATE_ABN_SEARCH_GUID": os.getenv("PRIVATE_ABN_SEARCH_GUID") or "00000000-0000-0000-0000-000000000000",
+    })
+    return env
+
+class ExchangeWriter:
+    """Appends request/response pairs to a recording's exchanges.jsonl."""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.file = open(os.path.join(directory, EXCHANGES), "a", encoding="utf-8")
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def add(self, method: str, url: str, headers, body, status: int, content_type: str, content: bytes):
+        entry = {"key": request_key(method, host_path(url), headers, body), "url": url,
+                 "status": status, "content_type": content_type}
+        try:
+            entry["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_base64"] = base64.b64encode(content).decode("ascii")
+        with self.lock:
+            self.file.write(json.dumps(entry) + "\n")
+            self.count += 1
+
+    def close(self):
+        self.file.close()
+
+class Recorder(ExchangeWriter):
+    """While active, records the final response of every request made through a RetryingSession."""
+
+    def __enter__(self):
+        from web_worker.http_transport import RetryingSession
+
+        self._original = original = RetryingSession.request
+        recorder = self
+
+        def request(session, method, url, *args, **kwargs):
+            response = original(session, method, url, *args, **kwargs)
+            sent = response.request
+            recorder.add(sent.method, sent.url, sent.headers, sent.body, response.status_code,
+                         response.headers.get("Content-Type", ""), response.content)
+            return response
+
+        RetryingSession.request = request
+        return self
+
+    def __exit__(self, *exc):
+        from web_worker.http_transport import RetryingSession
+
+        RetryingSession.request = self._original
+        self.close()
+
+class Recording:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.exchanges: Dict[str, List[Dict]] = defaultdict(list)
+        self.hosts = set()
+        with open(os.path.join(directory, EXCHANGES), encoding="utf-8") as file:
+            for line in file:
+                entry = json.loads(line)
+                self.exchanges[entry["key"]].append(entry)
+                self.hosts.add(urlsplit(entry["url"]).hostname)
+
+    @property
+    def regions_file(self) -> str:
+        return os.path.join(self.directory, REGIONS)
+
+    def entries(self) -> Iterable[Dict]:
+        for entries in self.exchanges.values():
+            yield from entries
+
+    @staticmethod
+    def content(entry: Dict) -> bytes:
+        if "body_base64" in entry:
+            return base64.b64decode(entry["body_base64"])
+        return entry["body"].encode("utf-8")
+
+class ReplayServer:
+    """
+    Serves a recording over HTTP/1.1 keep-alive. Each response waits latency seconds
+    plus up to jitter more. Repeated requests get the recorded responses in turn; a
+    request with no recording gets a 404 and is counted in `missed`.
+    """
+
+    def __init__(self, recording: Recording, latency: float = 0.0, jitter: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.recording = recording
+        self.latency = latency
+        self.jitter = jitter
+        self.served = 0
+        self.missed: List[str] = []
+        self._turns: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, method: str, path: str, headers, body: bytes) -> Tuple[int, str, bytes]:
+        key = request_key(method, path, headers, body)
+        with self._lock:
+            entries = self.recording.exchanges.get(key)
+            if not entries:
+                self.missed.append(key)
+                return 404, "text/plain", b"not recorded"
+            entry = entries[self._turns[key] % len(entries)]
+            self._turns[key] += 1
+            self.served += 1
+        content = self.recording.content(entry)
+        if "body" in entry:
+            content = rewrite_origins(entry["body"], self.recording.hosts, self.url).encode("utf-8")
+        return entry["status"], entry["content_type"], content
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle on, each response stalls on a delayed ACK
+            disable_nagle_algorithm = True
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, content_type, content = server.respond(self.command, self.path, dict(self.headers), body)
+                delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type or "application/octet-stream")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = _serve
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def write_regions(path: str, definitions):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["suburb", "state", "postcode"])
+        writer.writerows((d.suburb, d.state, d.postcode) for d in definitions)
+
+def record(directory: str, selectors: List[str]):
+    """Runs every register query main.py would make for the selected regions, recording the responses."""
+    from config_data.regions import select_regions
+    from config_data.work_units import plan_postcode_units
+    from web_worker.search_abn_register import query_abn_register
+    from web_worker.search_anc_register import query_acnc_charities
+    from web_worker.search_nsw_assoc_register import NSWAssociationScraper
+
+    definitions = select_regions(*selectors)
+    os.makedirs(directory, exist_ok=True)
+    write_regions(os.path.join(directory, REGIONS), definitions)
+    with Recorder(directory) as recorder:
+        scraper = NSWAssociationScraper()
+        for unit in plan_postcode_units(definitions):
+            logger.info(f"Recording postcode {unit.postcode}")
+            scraper.search_all(postcode=unit.postcode, delay=4)
+            query_acnc_charities(state=unit.state, postcode=unit.postcode)
+            query_abn_register(state=unit.state, postcode=unit.postcode)
+    logger.info(f"Recorded {recorder.count} exchanges in {directory}")
+
+def _soap(fields: Dict[str, str]) -> str:
+    return "<Envelope><Body>" + "".join(f"<{k}>{v}</{k}>" for k, v in fields.items()) + "</Body></Envelope>"
+
+def synthesize(directory: str, nsw_per_postcode: int = 25, page_size: int = 10) -> int:
+    """
+    Writes a recording built from data/raw: for every postcode the ABR rows are located
+    in, NSW result pages, an ACNC datastore page and the ABR charity search and ABN
+    details. Returns the number of postcodes.
+    """
+    from config_data.regions import load_regions
+
+    abr_rows = fixtures.read_rows("abn_register_results_*.csv")
+    nsw_rows = fixtures.read_rows("fair_trading_incorporation_register_results_*.csv")
+    regions = load_regions()
+    by_postcode = defaultdict(list)
+    for row in abr_rows:
+        by_postcode[fixtures.abr_postcode(row)].append(row)
+    units = {}
+    for postcode in sorted(by_postcode):
+        definitions = regions.select(postcode) if postcode.isdigit() else []
+        if definitions:
+            units[postcode] = definitions
+
+    os.makedirs(directory, exist_ok=True)
+    open(os.path.join(directory, EXCHANGES), "w").close()
+    write_regions(os.path.join(directory, REGIONS), [d for definitions in units.values() for d in definitions])
+    writer = ExchangeWriter(directory)
+    nsw_url = REGISTER_URLS["NSW_REGISTER_URL"] + "/RegistrationSearch.aspx"
+    ckan_url = REGISTER_URLS["ACNC_CKAN_URL"] + "api/action/datastore_search"
+    form, xml, json_type = "application/x-www-form-urlencoded", "text/xml; charset=utf-8", "application/json"
+    html = "text/html; charset=utf-8"
+
+    writer.add("GET", nsw_url, {}, None, 200, html, fixtures.nsw_form("search"))
+    writer.add("GET", REGISTER_URLS["ABR_WSDL_URL"], {}, None, 200, xml, fixtures.abr_wsdl())
+    serial = 0
+    for postcode, definitions in units.items():
+        state, suburbs = definitions[0].state, [d.suburb for d in definitions]
+
+        # NSW: the search post, then one post per further page
+        rows = []
+        for i in range(nsw_per_postcode):
+            serial += 1
+            row = dict(nsw_rows[serial % len(nsw_rows)])
+            row.update(organisation_number=f"INC{serial:07d}", organisation_id=str(900000 + serial),
+                       registered_office_address=f"{suburbs[i % len(suburbs)]} {state} {postcode}")
+            rows.append(row)
+        pages = [rows[i:i + page_size] for i in range(0, len(rows), page_size)] or [[]]
+        view_state, target = "search", "ctl00$MainArea$AdvancedSearchSection$AdvancedSearchButton"
+        for number, page in enumerate(pages, 1):
+            fields = {"__VIEWSTATE": view_state, "__EVENTTARGET": target, f"{fixtures.NSW_FIELD}Postcode": postcode}
+            view_state, target = f"{postcode}-{number}", fixtures.NSW_NEXT
+            writer.add("POST", nsw_url, {"Content-Type": form}, urlencode(fields), 200, html,
+                       fixtures.nsw_form(view_state, postcode, page, has_next=number < len(pages)))
+
+        # ACNC: a page for the state code; the spelled-out state name finds nothing
+        charities = [r for r in by_postcode[postcode] if r.get("acnc_status") == "Registered"]
+        for state_filter, records in ((state, charities), ("New South Wales" if state == "NSW" else None, [])):
+            if state_filter is None:
+                continue
+            params = {"resource_id": "eb1e6be4-5b13-4feb-b28e-388bf7c26f93", "limit": 1000, "offset": 0,
+                      "filters": {"State": state_filter, "Postcode": postcode}}
+            result = [fixtures.acnc_record(row, suburbs[i % len(suburbs)], state, postcode, i + 1)
+                      for i, row in enumerate(records)]
+            response = {"success": True, "result": {"records": result, "total": len(result), "limit": 1000, "offset": 0}}
+            writer.add("POST", ckan_url, {"Content-Type": json_type}, json.dumps(params), 200, json_type,
+                       json.dumps(response).encode("utf-8"))
+
+        # ABR: the charity search, then one details lookup per ABN
+        action = f"{fixtures.ABR_NAMESPACE}SearchByCharity"
+        writer.add("POST", fixtures.ABR_SERVICE_URL, {"Content-Type": xml, "SOAPAction": action},
+                   _soap({"postcode": postcode}), 200, xml,
+                   fixtures.abr_charity_search_xml([row["abn"] for row in by_postcode[postcode]]))
+        action = f"{fixtures.ABR_NAMESPACE}SearchByABNv201408"
+        for row in by_postcode[postcode]:
+            writer.add("POST", fixtures.ABR_SERVICE_URL, {"Content-Type": xml, "SOAPAction": action},
+                       _soap({"searchString": row["abn"], "includeHistoricalDetails": "N"}), 200, xml,
+                       fixtures.abr_details_xml(row))
+    writer.close()
+    logger.info(f"Synthesised {writer.count} exchanges for {len(units)} postcodes in {directory}")
+    return len(units)
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Record and replay register traffic")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rec = commands.add_parser("record", help="record live responses for the selected regions")
+    rec.add_argument("directory")
+    rec.add_argument("selectors", nargs="+", help="region selectors, e.g. NSW:2730 or 2700-2730")
+    syn = commands.add_parser("synthesize", help="build a recording from data/raw")
+    syn.add_argument("directory")
+    syn.add_argument("--nsw-per-postcode", type=int, default=25)
+    serve = commands.add_parser("serve", help="serve a recording until interrupted")
+    serve.add_argument("directory")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.directory, args.selectors)
+    elif args.command == "synthesize":
+        synthesize(args.directory, args.nsw_per_postcode)
+    else:
+        recording = Recording(args.directory)
+        with ReplayServer(recording, args.latency, args.jitter, port=args.port) as server:
+            for name, value in {**replay_env(server.url), "REGIONS_FILE": recording.regions_file}.items():
+                print(f"export {name}='{value}'")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+        print(f"Served {server.served} responses, {len(server.missed)} not recorded")
+
+if __name__ == "__main__":
+    main()
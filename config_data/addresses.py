@@ -0,0 +1,174 @@
+"""
+Suburb, state and postcode from the registers' address fields, in one comparable form.
+
+    NSW Fair Trading   registered_office_address   "12 High St, Adaminaby N.S.W. 2629"
+    ACNC               Town_City, State, Postcode  "Adaminaby", "New South Wales", "2629"
+    ABR                mainBusinessPhysicalAddress {"stateCode": "NSW", "postcode": "2629"}
+
+Suburbs are upper-cased, stripped of punctuation and repeated spaces, and have their
+common abbreviations spelled out ("MT" -> "MOUNT", a leading "ST" -> "SAINT"); states
+become the codes in regions.STATES and postcodes four digits. suburb_key() is applied to
+both sides of every comparison, so "Mt. Keira" and "MOUNT KEIRA" are the same suburb.
+
+RegionMatcher then checks an address against the region index, filling in what the
+index can tell unambiguously (the suburb of a single-suburb postcode, the postcode of a
+suburb found once in its state) and returning the index's own spelling.
+
+Everything here is plain Python and cached per distinct value; data.processing.address_columns
+runs it over whole register files, where the same few thousand localities repeat.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from config_data.regions import STATE_CODES, STATES, RegionIndex
+
+# Full names and the spellings seen in the registers -> state code
+STATE_NAMES = {
+    "NEW SOUTH WALES": "NSW",
+    "VICTORIA": "VIC",
+    "QUEENSLAND": "QLD",
+    "SOUTH AUSTRALIA": "SA",
+    "WESTERN AUSTRALIA": "WA",
+    "TASMANIA": "TAS",
+    "NORTHERN TERRITORY": "NT",
+    "AUSTRALIAN CAPITAL TERRITORY": "ACT",
+    **{state: state for state in STATES},
+}
+
+# Whole-word abbreviations in suburb names; "ST" is only "SAINT" as the first word
+ABBREVIATIONS = {
+    "MT": "MOUNT",
+    "PT": "PORT",
+    "NTH": "NORTH",
+    "STH": "SOUTH",
+    "UPR": "UPPER",
+    "LWR": "LOWER",
+    "CK": "CREEK",
+    "HTS": "HEIGHTS",
+}
+
+# Dropped outright (N.S.W. -> NSW, O'CONNOR -> OCONNOR); other punctuation separates words
+_DROPPED = re.compile(r"[.'’`]")
+_SEPARATORS = re.compile(r"[^A-Z0-9,]+")
+_COMMAS = re.compile(r"\s*,[\s,]*")
+# A trailing country, but not the end of "SOUTH AUSTRALIA" or "WESTERN AUSTRALIA"
+_COUNTRY = re.compile(r"(?<!SOUTH)(?<!WESTERN)[\s,]+AUSTRALIA$")
+_STATE_PATTERN = "|".join(sorted(map(re.escape, STATE_NAMES), key=len, reverse=True))
+# State and postcode at the end of an address, either or both of them
+_TAIL = re.compile(rf"(?:^|[\s,])(?:(?P<state>{_STATE_PATTERN})(?=$|[\s,\d])[\s,]*)?(?P<postcode>\d{{3,4}})?$")
+
+EXACT, INFERRED, UNMATCHED = "exact", "inferred", "unmatched"
+
+class Address(NamedTuple):
+    suburb: Optional[str] = None
+    state: Optional[str] = None
+    postcode: Optional[str] = None
+
+class Match(NamedTuple):
+    address: Address
+    status: str  # EXACT, INFERRED (suburb or postcode filled from the index) or UNMATCHED
+    row: Optional[int] = None  # region index row
+
+def _clean(text: str) -> str:
+    text = _SEPARATORS.sub(" ", _DROPPED.sub("", text.upper()))
+    return _COMMAS.sub(",", " ".join(text.split())).strip(" ,")
+
+@lru_cache(maxsize=65536)
+def suburb_key(name: Optional[str]) -> Optional[str]:
+    """The comparable form of a suburb name, or None if it is blank."""
+    words = _clean(name or "").replace(",", " ").split()
+    if not words:
+        return None
+    if words[0] == "ST" and len(words) > 1:
+        words[0] = "SAINT"
+    return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+@lru_cache(maxsize=1024)
+def state_code(state: Optional[str]) -> Optional[str]:
+    """"New South Wales", "N.S.W." or "nsw" -> "NSW"; None if it is not an Australian state."""
+    return STATE_NAMES.get(_clean(state or "").replace(",", " "))
+
+def normalise_postcode(postcode) -> Optional[str]:
+    """Four-digit postcode ("800" -> "0800"), or None if it is not 3-4 digits."""
+    postcode = str(postcode).strip() if postcode is not None else ""
+    if postcode.isdigit() and 3 <= len(postcode) <= 4:
+        return postcode.zfill(4)
+    return None
+
+@lru_cache(maxsize=65536)
+def parse_address(text: Optional[str]) -> Address:
+    """
+    Suburb, state and postcode from a one-line address such as "ADAMINABY NSW 2629".
+
+    The state and postcode come off the end; the suburb is what is left of the last
+    comma-separated part. Without a comma a street ("1 MAIN ST ADAMINABY") stays on
+    the front of the suburb, which RegionMatcher trims against the suburbs it knows.
+    """
+    text = _COUNTRY.sub("", _clean(text or ""))
+    if not text:
+        return Address()
+    tail = _TAIL.search(text)
+    if tail is None:
+        return Address(suburb_key(text.rpartition(",")[2]))
+    state, postcode = tail.group("state"), tail.group("postcode")
+    suburb = text[:tail.start()].rpartition(",")[2]
+    return Address(suburb_key(suburb), STATE_NAMES[state] if state else None, normalise_postcode(postcode))
+
+def fields_address(suburb: Optional[str], state: Optional[str], postcode) -> Address:
+    """An address from separate suburb, state and postcode fields (ACNC, ABR)."""
+    return Address(suburb_key(suburb), state_code(state), normalise_postcode(postcode))
+
+class RegionMatcher:
+    """Looks addresses up in a RegionIndex by suburb key, state and postcode."""
+
+    def __init__(self, index: RegionIndex):
+        self.index = index
+        self._exact: Dict[Tuple[str, int, int], int] = {}
+        self._by_place: Dict[Tuple[str, int], List[int]] = {}
+        self._by_postcode: Dict[Tuple[int, int], List[int]] = {}
+        for i, (suburb, state, postcode) in enumerate(zip(index.suburbs, index.states, index.postcodes)):
+            key = suburb_key(suburb)
+            self._exact.setdefault((key, state, postcode), i)
+            self._by_place.setdefault((key, state), []).append(i)
+            self._by_postcode.setdefault((postcode, state), []).append(i)
+        self._cache: Dict[Address, Match] = {}
+
+    def _address(self, row: int) -> Address:
+        index = self.index
+        return Address(index.suburbs[row], STATES[index.states[row]], f"{index.postcodes[row]:04d}")
+
+    def _lookup(self, address: Address) -> Match:
+        suburb, state, postcode = address
+        code = STATE_CODES.get(state)
+        number = int(postcode) if postcode else None
+        if code is None:
+            # No state: the one state whose index has this suburb and postcode, if there is one
+            rows = [self._exact[key] for key in ((suburb, c, number) for c in STATE_CODES.values()) if key in self._exact]
+            if len(rows) == 1:
+                return Match(self._address(rows[0]), INFERRED, rows[0])
+            return Match(address, UNMATCHED)
+        if suburb and number is not None:
+            row = self._exact.get((suburb, code, number))
+            if row is not None:
+                return Match(self._address(row), EXACT, row)
+            # A street left on the front of the suburb: the longest known suburb it ends with
+            for row in sorted(self._by_postcode.get((number, code), ()), key=lambda i: -len(self.index.suburbs[i])):
+                if suburb.endswith(" " + suburb_key(self.index.suburbs[row])):
+                    return Match(self._address(row), EXACT, row)
+        if suburb:
+            rows = self._by_place.get((suburb, code), ())
+            if len(rows) == 1 and number is None:
+                return Match(self._address(rows[0]), INFERRED, rows[0])
+        elif number is not None:
+            rows = self._by_postcode.get((number, code), ())
+            if len(rows) == 1:
+                return Match(self._address(rows[0]), INFERRED, rows[0])
+        return Match(address, UNMATCHED)
+
+    def match(self, address: Address) -> Match:
+        """The index's spelling of address and how it was found; UNMATCHED keeps address as given."""
+        match = self._cache.get(address)
+        if match is None:
+            match = self._cache[address] = self._lookup(address)
+        return match
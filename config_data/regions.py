@@ -0,0 +1,139 @@
+import csv
+import os
+import re
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from config_data.suburb_definitons import SuburbDefinition
+
+DEFAULT_REGIONS_FILE = os.path.join(os.path.dirname(__file__), "regions.csv")
+
+STATES = ("NSW", "VIC", "QLD", "SA", "WA", "TAS", "NT", "ACT", "OT")
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+POSTCODE_RANGE = re.compile(r"^(\d{3,4})\s*-\s*(\d{3,4})$")
+
+class RegionIndex:
+    """
+    Column-oriented table of (suburb, state, postcode) rows loaded from a regions CSV.
+
+    Suburbs are interned strings, states are one-byte codes into STATES and postcodes
+    are stored as integers, so a national file costs a few bytes per row. Lookup indexes
+    by postcode, state and suburb are built on first use. SuburbDefinition objects are
+    only created for the rows a selection returns.
+    """
+    __slots__ = ("path", "suburbs", "states", "postcodes", "_by_postcode", "_by_state", "_by_suburb")
+
+    def __init__(self, path: str = DEFAULT_REGIONS_FILE):
+        self.path = path
+        self.suburbs: List[str] = []
+        self.states = array("B")
+        self.postcodes = array("H")
+        self._by_postcode: Optional[Dict[int, array]] = None
+        self._by_state: Optional[Dict[int, array]] = None
+        self._by_suburb: Optional[Dict[str, array]] = None
+        self._load()
+
+    def _load(self):
+        intern = sys.intern
+        with open(self.path, newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            suburb_i, state_i, postcode_i = (header.index(c) for c in ("suburb", "state", "postcode"))
+            for row in reader:
+                if not row:
+                    continue
+                state = row[state_i].strip().upper()
+                if state not in STATE_CODES:
+                    raise ValueError(f"Unknown state {state!r} in {self.path}")
+                self.suburbs.append(intern(row[suburb_i].strip().upper()))
+                self.states.append(STATE_CODES[state])
+                self.postcodes.append(int(row[postcode_i]))
+
+    def __len__(self) -> int:
+        return len(self.suburbs)
+
+    @staticmethod
+    def _build(keys: Iterable) -> Dict:
+        index: Dict = {}
+        for i, key in enumerate(keys):
+            rows = index.get(key)
+            if rows is None:
+                rows = index[key] = array("I")
+            rows.append(i)
+        return index
+
+    @property
+    def by_postcode(self) -> Dict[int, array]:
+        if self._by_postcode is None:
+            self._by_postcode = self._build(self.postcodes)
+        return self._by_postcode
+
+    @property
+    def by_state(self) -> Dict[int, array]:
+        if self._by_state is None:
+            self._by_state = self._build(self.states)
+        return self._by_state
+
+    @property
+    def by_suburb(self) -> Dict[str, array]:
+        if self._by_suburb is None:
+            self._by_suburb = self._build(self.suburbs)
+        return self._by_suburb
+
+    def definition(self, i: int) -> SuburbDefinition:
+        return SuburbDefinition(self.suburbs[i], STATES[self.states[i]], f"{self.postcodes[i]:04d}")
+
+    def rows_for(self, selector: str) -> List[int]:
+        """
+        Row numbers matching one selector:
+        "NSW" (state), "2629" (postcode), "2700-2730" (postcode range, inclusive),
+        "NSW:2700-2730" (state and postcode range) or "BATLOW" (suburb name).
+        """
+        selector = selector.strip().upper()
+        state, _, rest = selector.partition(":")
+        if rest and state in STATE_CODES:
+            state_rows = set(self.by_state.get(STATE_CODES[state], ()))
+            return [i for i in self.rows_for(rest) if i in state_rows]
+        if selector in STATE_CODES:
+            return list(self.by_state.get(STATE_CODES[selector], ()))
+        if selector.isdigit():
+            return list(self.by_postcode.get(int(selector), ()))
+        match = POSTCODE_RANGE.match(selector)
+        if match:
+            low, high = int(match.group(1)), int(match.group(2))
+            rows: List[int] = []
+            for postcode in sorted(pc for pc in self.by_postcode if low <= pc <= high):
+                rows.extend(self.by_postcode[postcode])
+            return rows
+        return list(self.by_suburb.get(selector, ()))
+
+    def select(self, *selectors: str) -> List[SuburbDefinition]:
+        """Union of the given selectors in file order; no selectors selects every row."""
+        if not selectors:
+            return [self.definition(i) for i in range(len(self))]
+        rows = set()
+        for selector in selectors:
+            rows.update(self.rows_for(selector))
+        return [self.definition(i) for i in sorted(rows)]
+
+    def unmatched(self, *selectors: str) -> List[str]:
+        """The selectors that match no row, e.g. a misspelt suburb or a postcode outside the file."""
+        return [selector for selector in selectors if not self.rows_for(selector)]
+
+    def __iter__(self) -> Iterator[SuburbDefinition]:
+        return (self.definition(i) for i in range(len(self)))
+
+_indexes: Dict[str, RegionIndex] = {}
+
+def load_regions(path: Optional[str] = None) -> RegionIndex:
+    """Loads (once per path) the region file given, $REGIONS_FILE, or the bundled regions.csv."""
+    path = os.path.abspath(path or os.getenv("REGIONS_FILE") or DEFAULT_REGIONS_FILE)
+    index = _indexes.get(path)
+    if index is None:
+        index = _indexes[path] = RegionIndex(path)
+    return index
+
+def select_regions(*selectors: str, path: Optional[str] = None) -> List[SuburbDefinition]:
+    return load_regions(path).select(*selectors)
@@ -0,0 +1,83 @@
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config_data.addresses import parse_address, suburb_key
+from config_data.suburb_definitons import SuburbDefinition
+
+@dataclass
+class PostcodeWorkUnit:
+    """All suburb definitions that share one (postcode, state) and can be queried together."""
+    postcode: str
+    state: str
+    suburbs: List[str] = field(default_factory=list)
+
+    def suburb_info(self, suburb: str = "") -> dict:
+        return {"suburb": suburb, "state": self.state, "postcode": self.postcode}
+
+def plan_postcode_units(definitions: Iterable[SuburbDefinition]) -> List[PostcodeWorkUnit]:
+    """
+    Groups suburb definitions into one work unit per (postcode, state), keeping the order
+    in which postcodes first appear.
+    """
+    units: Dict[Tuple[str, str], PostcodeWorkUnit] = {}
+    for definition in definitions:
+        key = (definition.postcode, definition.state.upper())
+        unit = units.get(key)
+        if unit is None:
+            unit = units[key] = PostcodeWorkUnit(definition.postcode, definition.state.upper())
+        suburb = definition.suburb.upper()
+        if suburb not in unit.suburbs:
+            unit.suburbs.append(suburb)
+    return list(units.values())
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """"i/n" -> (i, n), with shards numbered 1..n."""
+    index, _, count = value.partition("/")
+    if not (index.isdigit() and count.isdigit()) or not 1 <= int(index) <= int(count):
+        raise ValueError(f"Shard must be i/n with 1 <= i <= n, got {value!r}")
+    return int(index), int(count)
+
+def shard_of(unit: PostcodeWorkUnit, count: int) -> int:
+    """The shard (1..count) a unit belongs to; crc32 of the postcode, so the same on every host and run."""
+    return zlib.crc32(unit.postcode.encode("ascii")) % count + 1
+
+def shard_units(units: Iterable[PostcodeWorkUnit], index: int, count: int) -> List[PostcodeWorkUnit]:
+    """The units of shard index of count; the shards of a plan are disjoint and together cover it."""
+    return [unit for unit in units if shard_of(unit, count) == index]
+
+def nsw_locality(row: dict) -> Optional[str]:
+    """Suburb key from a Fair Trading registered_office_address, or None if there is no address."""
+    return parse_address(row.get("registered_office_address")).suburb
+
+def acnc_locality(row: dict) -> Optional[str]:
+    """Suburb key from an ACNC register record, or None if Town_City is blank."""
+    return suburb_key(row.get("Town_City"))
+
+def split_by_suburb(unit: PostcodeWorkUnit, rows: Iterable[dict],
+                    locality: Callable[[dict], Optional[str]]) -> Tuple[Dict[str, List[dict]], List[dict], int]:
+    """
+    Splits postcode-level results back onto the unit's suburbs.
+
+    Returns (rows per suburb, rows without a locality, count of rows dropped because their
+    locality is not one of the unit's suburbs). Localities are suburb keys, compared with
+    the keys of the unit's suburbs; one with a street still on the front is placed in the
+    longest suburb it ends with. Rows without a locality cannot be placed but could belong
+    to any suburb in the unit, so they are kept once rather than dropped.
+    """
+    wanted = {suburb_key(suburb): suburb for suburb in unit.suburbs}
+    longest_first = sorted(wanted, key=len, reverse=True)
+    by_suburb: Dict[str, List[dict]] = {suburb: [] for suburb in unit.suburbs}
+    unplaced: List[dict] = []
+    dropped = 0
+    for row in rows:
+        key = locality(row)
+        if key is None:
+            unplaced.append(row)
+            continue
+        suburb = wanted.get(key) or next((wanted[k] for k in longest_first if key.endswith(" " + k)), None)
+        if suburb is None:
+            dropped += 1
+        else:
+            by_suburb[suburb].append(row)
+    return by_suburb, unplaced, dropped
@@ -0,0 +1,73 @@
+"""
+Structured address columns for whole register files.
+
+    frame = address_columns(chunk, "nsw")  # address_suburb, address_state, address_postcode, address_match
+
+Each register gives its address differently (see config_data.addresses); address_columns
+reads the source's columns, normalises each distinct address once and matches it against
+the region index, then spreads the results back over the rows with one take per column.
+A register file has hundreds of thousands of rows but only as many distinct addresses as
+there are localities (or ABR address texts), so the per-row cost is a factorize and a take.
+
+address_match is exact, inferred (suburb or postcode filled in from the index) or
+unmatched (the parsed address, as it was given); rows without any address are null.
+"""
+import json
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config_data.addresses import Address, RegionMatcher, fields_address, parse_address
+from config_data.regions import load_regions
+
+COLUMNS = ("address_suburb", "address_state", "address_postcode", "address_match")
+
+def _abr_address(text: str) -> Address:
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return Address()
+    if not isinstance(value, dict):
+        return Address()
+    return fields_address(None, value.get("stateCode"), value.get("postcode"))
+
+def _acnc_address(text: str) -> Address:
+    return fields_address(*text.split("\x1f"))
+
+def _joined(frame: pd.DataFrame, columns) -> pd.Series:
+    # The fields as one value, so the distinct localities are found in one factorize
+    fields = [frame[c].fillna("").astype(str) for c in columns]
+    return fields[0].str.cat(fields[1:], sep="\x1f") if len(fields) > 1 else fields[0]
+
+# Source -> (the raw columns holding its address, parsing one row's joined values)
+SOURCES: Dict[str, Tuple[Tuple[str, ...], Callable[[str], Address]]] = {
+    "nsw": (("registered_office_address",), parse_address),
+    "acnc": (("Town_City", "State", "Postcode"), _acnc_address),
+    "abr": (("main_business_physical_address",), _abr_address),
+}
+
+_matchers: Dict[int, RegionMatcher] = {}
+
+def region_matcher(regions_file: Optional[str] = None) -> RegionMatcher:
+    """One RegionMatcher per loaded region index, so its cache lasts across chunks and files."""
+    index = load_regions(regions_file)
+    matcher = _matchers.get(id(index))
+    if matcher is None:
+        matcher = _matchers[id(index)] = RegionMatcher(index)
+    return matcher
+
+def address_columns(frame: pd.DataFrame, source: str, matcher: Optional[RegionMatcher] = None) -> pd.DataFrame:
+    """The COLUMNS for every row of frame, indexed like it."""
+    columns, parse = SOURCES[source]
+    matcher = matcher or region_matcher()
+    values = _joined(frame, columns)
+    codes, uniques = pd.factorize(values.mask(values.eq("")), use_na_sentinel=True)
+    # One extra slot at the end for rows without an address (code -1)
+    found = np.empty((len(uniques) + 1, len(COLUMNS)), dtype=object)
+    for i, value in enumerate(uniques):
+        address, status, _ = matcher.match(parse(value))
+        found[i] = (*address, status) if any(address) else (None, None, None, None)
+    found[-1] = None
+    rows = found[codes]
+    return pd.DataFrame({name: rows[:, i] for i, name in enumerate(COLUMNS)}, index=frame.index)
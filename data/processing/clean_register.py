@@ -0,0 +1,262 @@
+"""
+Streaming clean stage for the register files written by main.py.
+
+    python -m data.processing.clean_register abn_register_results
+    python -m data.processing.clean_register acnc_register_results --input a.csv --format jsonl
+    python -m data.processing.clean_register abn_register_results --chunk-rows 20000 --drop-duplicates
+
+The input is read --chunk-rows rows at a time with every column as str, so memory
+stays at one chunk plus the key set, however large the register is. For each chunk:
+- empty cells and the ABR "no date" sentinel become nulls;
+- JSON columns are decoded once, with nested sentinels and empty objects also nulled;
+- columns are renamed to snake_case;
+- suburb, state and postcode are added as address_* columns (see address_columns), except
+  to the ABR output unless --addresses is given, as abn_data has no columns for them.
+
+Keys from earlier chunks are kept as a sorted int64 array at 8 bytes a key, so a key
+repeated anywhere in the file is reported. --drop-duplicates keeps only its first row.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.processing.address_columns import SOURCES as ADDRESS_SOURCES, address_columns
+from data.processing.snapshot_diff import PROCESSED_DIR, RAW_DIR, SNAPSHOT_KEYS
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = 50_000
+FORMATS = ("csv", "jsonl")
+# ABR uses 0001-01-01 for "no date"
+NO_DATE = "0001-01-01"
+
+@dataclass(frozen=True)
+class RegisterSpec:
+    output_prefix: str
+    rename: Dict[str, str] = field(default_factory=dict)
+    date_columns: Tuple[str, ...] = ()  # raw names whose NO_DATE values become null
+    json_columns: Tuple[str, ...] = ()  # raw names holding JSON text
+    address_source: Optional[str] = None  # adds address_columns() for this source (nsw, acnc, abr)
+    addresses_by_default: bool = True  # whether they are added without --addresses
+
+# Register file prefix (as written by main.py) -> how to clean it; keys come from SNAPSHOT_KEYS
+REGISTERS = {
+    "abn_register_results": RegisterSpec(
+        output_prefix="cleaned_register_results",
+        rename={
+            "isCurrent": "is_current",
+            "replacedFrom": "replaced_from",
+            "entityStatus": "entity_status",
+            "effectiveFrom": "effective_from",
+            "effectiveTo": "effective_to",
+            "entityTypeCode": "entity_type_code",
+            "entityDescription": "entity_description",
+        },
+        date_columns=("replacedFrom", "effectiveFrom", "effectiveTo",
+                      "acnc_status_from", "acnc_status_to", "record_last_updated"),
+        json_columns=("gst", "dgr", "main_trading_names", "other_trading_names",
+                      "main_business_physical_address", "tax_concession_endorsements"),
+        address_source="abr",
+        # Off unless asked for: copy_cleaned_abn_csv.sql loads this file into abn_data column for column
+        addresses_by_default=False,
+    ),
+    "acnc_register_results": RegisterSpec(output_prefix="cleaned_acnc_register_results", address_source="acnc"),
+    "fair_trading_incorporation_register_results": RegisterSpec(
+        output_prefix="cleaned_fair_trading_incorporation_register_results", address_source="nsw"),
+}
+
+@dataclass
+class CleanStats:
+    rows: int = 0
+    written: int = 0
+    chunks: int = 0
+    missing_keys: int = 0
+    invalid_json: int = 0
+    duplicate_rows: int = 0
+    # Repeated key -> times it occurs in the file
+    duplicates: Dict[str, int] = field(default_factory=dict)
+
+def key_int(key: str) -> int:
+    """A key as int64: ABNs and other all-digit keys exactly, anything else as a 64-bit hash."""
+    if key.isdigit() and len(key) <= 18:
+        return int(key)
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+class KeySet:
+    """The keys seen so far, as a sorted int64 array: 8 bytes a key against ~70 in a set of str."""
+
+    def __init__(self):
+        self._keys = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, keys: np.ndarray) -> np.ndarray:
+        """Adds one chunk's keys; returns a mask of those seen before, in this chunk or an earlier one."""
+        unique, first = np.unique(keys, return_index=True)
+        repeated = np.ones(len(keys), dtype=bool)
+        repeated[first] = False
+        if len(self._keys):
+            position = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+            repeated |= self._keys[position] == keys
+            position = np.minimum(np.searchsorted(self._keys, unique), len(self._keys) - 1)
+            unique = unique[self._keys[position] != unique]
+        # Two sorted runs: the stable (merge) sort joins them in linear time
+        self._keys = np.sort(np.concatenate([self._keys, unique]), kind="stable")
+        return repeated
+
+def _no_sentinels(obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # json.loads object_hook: runs once per decoded object, innermost first, so no second walk
+    for name, value in obj.items():
+        if value == NO_DATE or value == "":
+            obj[name] = None
+    return obj if any(value is not None for value in obj.values()) else None
+
+class RegisterCleaner:
+    """Cleans one register file chunk by chunk; stats are filled in as clean() is consumed."""
+
+    def __init__(self, spec: RegisterSpec, key: str, chunk_rows: int = CHUNK_ROWS, drop_duplicates: bool = False,
+                 addresses: Optional[bool] = None):
+        self.spec = spec
+        if addresses is None:
+            addresses = spec.addresses_by_default
+        self.address_source = spec.address_source if addresses else None
+        self.key = key
+        self.chunk_rows = chunk_rows
+        self.drop_duplicates = drop_duplicates
+        self.keys = KeySet()
+        self.stats = CleanStats()
+
+    def _parse_json(self, text: Any) -> Any:
+        if not isinstance(text, str) or not text:
+            return None
+        try:
+            value = json.loads(text, object_hook=_no_sentinels)
+        except ValueError:
+            self.stats.invalid_json += 1
+            return text
+        if isinstance(value, list):
+            value = [item for item in value if item is not None]
+        return value or None
+
+    def _check_columns(self, path: str, columns):
+        expected = [self.key, *self.spec.rename, *self.spec.date_columns, *self.spec.json_columns]
+        if self.address_source:
+            expected.extend(ADDRESS_SOURCES[self.address_source][0])
+        missing = [column for column in dict.fromkeys(expected) if column not in columns]
+        if missing:
+            raise ValueError(f"Missing columns in {path}: {missing}")
+
+    def read_chunks(self, path: str) -> Iterator[pd.DataFrame]:
+        if path.endswith(".jsonl"):
+            for chunk in pd.read_json(path, lines=True, chunksize=self.chunk_rows, dtype=str, convert_dates=False):
+                yield chunk.fillna("")
+        else:
+            yield from pd.read_csv(path, chunksize=self.chunk_rows, dtype=str, keep_default_na=False, na_filter=False)
+
+    def clean_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        self.stats.chunks += 1
+        self.stats.rows += len(chunk)
+        keys = chunk[self.key].str.replace(r"\s+", "", regex=True)
+        present = keys.ne("").to_numpy()
+        self.stats.missing_keys += int((~present).sum())
+
+        repeated = np.zeros(len(chunk), dtype=bool)
+        repeated[present] = self.keys.add(np.fromiter(map(key_int, keys[present]), dtype=np.int64))
+        if repeated.any():
+            self.stats.duplicate_rows += int(repeated.sum())
+            for key in keys[repeated]:
+                # A key's first occurrence is not in the mask, so count it when the key first repeats
+                self.stats.duplicates[key] = self.stats.duplicates.get(key, 1) + 1
+            if self.drop_duplicates:
+                chunk, keys = chunk[~repeated], keys[~repeated]
+
+        # From the raw text, before the JSON columns are decoded
+        addresses = address_columns(chunk, self.address_source) if self.address_source else None
+        chunk = chunk.mask(chunk.eq(""))
+        chunk[self.key] = keys.mask(keys.eq(""))
+        if self.spec.date_columns:
+            dates = list(self.spec.date_columns)
+            chunk[dates] = chunk[dates].mask(chunk[dates].eq(NO_DATE))
+        for column in self.spec.json_columns:
+            chunk[column] = chunk[column].map(self._parse_json).astype(object)
+        chunk = chunk.rename(columns=self.spec.rename)
+        return chunk if addresses is None else pd.concat([chunk, addresses], axis=1)
+
+    def clean(self, path: str) -> Iterator[pd.DataFrame]:
+        """Yields the cleaned chunks of path."""
+        self.stats = CleanStats()
+        self.keys = KeySet()
+        for chunk in self.read_chunks(path):
+            if self.stats.chunks == 0:
+                self._check_columns(path, chunk.columns)
+            chunk = self.clean_chunk(chunk)
+            self.stats.written += len(chunk)
+            yield chunk
+
+    def write(self, path: str, output: str, fmt: str = "csv") -> CleanStats:
+        """Cleans path into output as CSV (JSON columns re-encoded as text) or JSON lines (kept nested)."""
+        json_columns = [self.spec.rename.get(c, c) for c in self.spec.json_columns]
+        with open(output, "w", newline="", encoding="utf-8") as file:
+            for chunk in self.clean(path):
+                if fmt == "jsonl":
+                    chunk.to_json(file, orient="records", lines=True, force_ascii=False)
+                    continue
+                for column in json_columns:
+                    chunk[column] = chunk[column].map(lambda v: v if v is None or isinstance(v, str) else json.dumps(v))
+                chunk.to_csv(file, header=self.stats.chunks == 1, index=False)
+        return self.stats
+
+def latest_raw(prefix: str, raw_dir: str = RAW_DIR) -> str:
+    """The most recent unsharded <prefix>_<timestamp>.csv or .jsonl."""
+    files = sorted(path for ext in FORMATS for path in glob.glob(os.path.join(raw_dir, f"{prefix}_*.{ext}"))
+                   if ".shard-" not in os.path.basename(path))
+    if not files:
+        raise FileNotFoundError(f"No {prefix} files in {raw_dir}")
+    return files[-1]
+
+def log_duplicates(stats: CleanStats, key: str):
+    logger.info(f"Found {len(stats.duplicates)} duplicate {key} values ({stats.duplicate_rows} extra rows)")
+    if stats.duplicates:
+        logger.info(", ".join(f"{value}: {count}" for value, count in stats.duplicates.items()))
+
+def clean_register(prefix: str, input_path: Optional[str] = None, output: Optional[str] = None, fmt: str = "csv",
+                   chunk_rows: int = CHUNK_ROWS, drop_duplicates: bool = False,
+                   addresses: Optional[bool] = None) -> CleanStats:
+    spec, key = REGISTERS[prefix], SNAPSHOT_KEYS[prefix]
+    input_path = input_path or latest_raw(prefix)
+    stamp = os.path.splitext(os.path.basename(input_path))[0][len(prefix) + 1:]
+    output = output or os.path.join(PROCESSED_DIR, f"{spec.output_prefix}_{stamp}.{fmt}")
+    cleaner = RegisterCleaner(spec, key, chunk_rows, drop_duplicates, addresses)
+    stats = cleaner.write(input_path, output, fmt)
+    logger.info(f"Cleaned {stats.rows} rows in {stats.chunks} chunks from {input_path}; {stats.written} written to {output}")
+    if stats.missing_keys or stats.invalid_json:
+        logger.warning(f"{stats.missing_keys} rows without a {key}, {stats.invalid_json} JSON values left as text")
+    log_duplicates(stats, key)
+    return stats
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Clean a register file in fixed-size chunks")
+    parser.add_argument("prefix", choices=sorted(REGISTERS))
+    parser.add_argument("--input", help="register CSV or JSON lines file (default: most recent in data/raw)")
+    parser.add_argument("--output", help="default: data/processed/<cleaned prefix>_<input timestamp>.<format>")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--drop-duplicates", action="store_true", help="keep only the first row for each key")
+    parser.add_argument("--addresses", action=argparse.BooleanOptionalAction, default=None,
+                        help="add the address_* columns (default: on, except for abn_register_results)")
+    args = parser.parse_args()
+    clean_register(args.prefix, args.input, args.output, args.format, args.chunk_rows, args.drop_duplicates,
+                   args.addresses)
+
+if __name__ == "__main__":
+    main()
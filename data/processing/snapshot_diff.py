@@ -0,0 +1,216 @@
+"""
+Change-data-capture between two register snapshots written by main.py.
+
+    python -m data.processing.snapshot_diff abn_register_results
+    python -m data.processing.snapshot_diff fair_trading_incorporation_register_results --old a.csv --new b.jsonl
+
+Only the older snapshot is indexed, as key -> 64-bit row fingerprint; the newer one is
+streamed against that index. Rows whose fingerprint changed are re-read from the older
+snapshot in a second pass to name the changed columns, so neither file is held in memory.
+Snapshots are CSV or JSON lines (main.py --format); nested JSON values are compared as
+their JSON text, as they appear in the CSV.
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RAW_DIR = os.path.join(ROOT, "data", "raw")
+PROCESSED_DIR = os.path.join(ROOT, "data", "processed")
+
+# Snapshot file prefix (as written by main.py) -> key column
+SNAPSHOT_KEYS = {
+    "abn_register_results": "abn",
+    "acnc_register_results": "ABN",
+    "fair_trading_incorporation_register_results": "organisation_number",
+}
+
+INSERT, UPDATE, REMOVE = "insert", "update", "remove"
+
+class Change(NamedTuple):
+    kind: str
+    key: str
+    row: Optional[Dict[str, str]]  # the new row; None for removals
+    changed: Tuple[str, ...] = ()  # columns whose value differs, for updates
+
+@dataclass
+class DiffStats:
+    inserted: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    duplicate_keys: int = 0
+    missing_keys: int = 0
+    columns_changed: Dict[str, int] = field(default_factory=dict)
+
+def _normalise_key(value: Optional[str]) -> str:
+    return "".join((value or "").split())
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else json.dumps(value)
+
+def _header(path: str) -> List[str]:
+    if path.endswith(".jsonl"):
+        return list(next(snapshot_rows(path), {}))
+    with open(path, newline="", encoding="utf-8") as file:
+        return next(csv.reader(file), [])
+
+def snapshot_rows(path: str) -> Iterator[Dict[str, str]]:
+    """The rows of a CSV or JSON lines snapshot, every value as text."""
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.endswith(".jsonl"):
+            for line in file:
+                if line.strip():
+                    yield {name: _text(value) for name, value in json.loads(line).items()}
+        else:
+            yield from csv.DictReader(file)
+
+def fingerprint(row: Dict[str, str], columns: Sequence[str]) -> int:
+    digest = hashlib.blake2b(digest_size=8)
+    for column in columns:
+        digest.update((row.get(column) or "").strip().encode("utf-8"))
+        digest.update(b"\x1f")
+    return int.from_bytes(digest.digest(), "big")
+
+class SnapshotDiff:
+    """
+    Inserts, updates (with the changed columns) and removals between two snapshots of
+    the same register, matched on key. Rows are compared over the union of both headers,
+    so a column added to the newer snapshot only counts as a change where it has a value.
+    Only the first row for a repeated key is used, in both snapshots.
+    """
+
+    def __init__(self, old_path: str, new_path: str, key: str, ignore: Sequence[str] = ()):
+        self.old_path = old_path
+        self.new_path = new_path
+        self.key = key
+        old_columns, new_columns = _header(old_path), _header(new_path)
+        for path, columns in ((old_path, old_columns), (new_path, new_columns)):
+            if key not in columns:
+                raise ValueError(f"Key column {key!r} not found in {path}")
+        self.columns = sorted((set(old_columns) | set(new_columns)) - set(ignore) - {key})
+        self.stats = DiffStats()
+
+    def _index(self) -> Dict[str, int]:
+        index: Dict[str, int] = {}
+        for row in snapshot_rows(self.old_path):
+            key = _normalise_key(row.get(self.key))
+            if key and key not in index:
+                index[key] = fingerprint(row, self.columns)
+        return index
+
+    def _changed_columns(self, updated: Dict[str, Dict[str, str]]) -> Iterator[Change]:
+        for old in snapshot_rows(self.old_path):
+            key = _normalise_key(old.get(self.key))
+            new = updated.pop(key, None)
+            if new is None:
+                continue
+            changed = tuple(c for c in self.columns if (old.get(c) or "").strip() != (new.get(c) or "").strip())
+            for column in changed:
+                self.stats.columns_changed[column] = self.stats.columns_changed.get(column, 0) + 1
+            yield Change(UPDATE, key, new, changed)
+            if not updated:
+                break
+
+    def changes(self) -> Iterator[Change]:
+        """Yields inserts as the newer snapshot is read, then updates, then removals."""
+        self.stats = DiffStats()
+        index = self._index()
+        seen = set()
+        updated: Dict[str, Dict[str, str]] = {}
+        for row in snapshot_rows(self.new_path):
+            key = _normalise_key(row.get(self.key))
+            if not key:
+                self.stats.missing_keys += 1
+                continue
+            if key in seen:
+                self.stats.duplicate_keys += 1
+                continue
+            seen.add(key)
+            previous = index.pop(key, None)
+            if previous is None:
+                self.stats.inserted += 1
+                yield Change(INSERT, key, row)
+            elif previous != fingerprint(row, self.columns):
+                updated[key] = row
+            else:
+                self.stats.unchanged += 1
+        self.stats.updated = len(updated)
+        if updated:
+            yield from self._changed_columns(updated)
+        # Whatever is left in the index was not in the newer snapshot
+        self.stats.removed = len(index)
+        for key in index:
+            yield Change(REMOVE, key, None)
+        logger.info(f"{os.path.basename(self.old_path)} -> {os.path.basename(self.new_path)}: "
+                    f"{self.stats.inserted} inserted, {self.stats.updated} updated, {self.stats.removed} removed, "
+                    f"{self.stats.unchanged} unchanged")
+
+def latest_snapshots(prefix: str, raw_dir: str = RAW_DIR) -> Tuple[str, str]:
+    """
+    The two most recent <prefix>_<timestamp>.csv or .jsonl files, oldest first. Shard
+    outputs (.shard-i-of-n) are parts of one run, not snapshots; merge them first.
+    """
+    files = sorted((path for ext in ("csv", "jsonl") for path in glob.glob(os.path.join(raw_dir, f"{prefix}_*.{ext}"))
+                    if ".shard-" not in os.path.basename(path)), key=os.path.basename)
+    if len(files) < 2:
+        raise FileNotFoundError(f"Need two {prefix} snapshots in {raw_dir}, found {len(files)}")
+    return files[-2], files[-1]
+
+def delta_rows(changes: Iterator[Change]) -> Iterator[Dict[str, str]]:
+    """The new rows for inserts and updates, i.e. what the ETL load needs to see."""
+    for change in changes:
+        if change.kind != REMOVE:
+            yield change.row
+
+def write_delta(diff: SnapshotDiff, path: str) -> DiffStats:
+    """
+    Writes the delta as a CSV with the newer snapshot's columns plus change and
+    changed_columns. Removals carry only the key.
+    """
+    columns = _header(diff.new_path)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=["change", "changed_columns"] + columns, extrasaction="ignore")
+        writer.writeheader()
+        for change in diff.changes():
+            row = dict(change.row) if change.row is not None else {diff.key: change.key}
+            row["change"] = change.kind
+            row["changed_columns"] = ";".join(change.changed)
+            writer.writerow(row)
+    return diff.stats
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Diff two register snapshots")
+    parser.add_argument("prefix", choices=sorted(SNAPSHOT_KEYS))
+    parser.add_argument("--old", help="older snapshot (default: second most recent in data/raw)")
+    parser.add_argument("--new", help="newer snapshot (default: most recent in data/raw)")
+    parser.add_argument("--key", help="key column (default depends on the register)")
+    parser.add_argument("--output", help="delta CSV (default: data/processed/<prefix>_delta_<new timestamp>.csv)")
+    args = parser.parse_args()
+
+    if args.old and args.new:
+        old_path, new_path = args.old, args.new
+    else:
+        old_path, new_path = latest_snapshots(args.prefix)
+        old_path, new_path = args.old or old_path, args.new or new_path
+    diff = SnapshotDiff(old_path, new_path, args.key or SNAPSHOT_KEYS[args.prefix])
+    stamp = os.path.splitext(os.path.basename(new_path))[0][len(args.prefix) + 1:]
+    output = args.output or os.path.join(PROCESSED_DIR, f"{args.prefix}_delta_{stamp}.csv")
+    stats = write_delta(diff, output)
+    logger.info(f"Delta written to {output}")
+    if stats.columns_changed:
+        logger.info("Changed columns: " + ", ".join(f"{c}={n}" for c, n in sorted(stats.columns_changed.items())))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Loads ABR results (ABNRecords, or rows of abn_register_results_*.csv) into
+legal_details and dgr_endorsement.
+
+    python -m database.production.abr_loader data/raw/abn_register_results_20250907_1219.csv --org-ids abn_orgs.csv
+
+Each batch is three statements: one multi-row upsert into legal_details ON CONFLICT (abn)
+that only overwrites rows whose record_last_updated has advanced, one upsert of the DGR
+endorsements of the rows it actually wrote, and one delete of endorsements those rows no
+longer have. Loading the same results twice changes nothing.
+
+The conflict targets are the unique constraints added by
+database/queries/create_legal_details_abn_unique.sql and create_dgr_endorsement_legal_id_unique.sql.
+
+New rows are linked to their organisation through org_id, taken from the record
+(organisation_id or org_id) or from the ABN -> org_id mapping the caller passes; an
+existing row keeps its link unless a new one is given. The postcode and suburb summaries
+of the organisations whose rows were written are refreshed at the end of the load.
+"""
+import argparse
+import csv
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from sqlalchemy import and_, delete, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import insert
+
+from database.production.models import DGREndorsement, LegalDetails
+from database.production.summaries import postcodes_for_orgs, refresh_summaries
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+# ABR uses 0001-01-01 for "no date"
+NO_DATE = "0001-01-01"
+
+legal_details = LegalDetails.__table__
+dgr_endorsement = DGREndorsement.__table__
+
+@dataclass
+class LoadStats:
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    dgr_upserted: int = 0
+    dgr_removed: int = 0
+    unlinked: int = 0  # rows inserted without an organisation
+
+def _abn(value: Optional[str]) -> str:
+    return "".join((value or "").split())
+
+def _date(value: Optional[str]) -> Optional[date]:
+    if not value or value == NO_DATE:
+        return None
+    return date.fromisoformat(value[:10])
+
+def _nested(value: Any) -> List[Dict]:
+    """A nested ABR field (JSON text or already parsed) as a list of dicts."""
+    if isinstance(value, str):
+        value = json.loads(value) if value else None
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def _current(entries: List[Dict], end_key: str) -> List[Dict]:
+    today = date.today()
+    return [e for e in entries if _date(e.get(end_key)) is None or _date(e.get(end_key)) >= today]
+
+def current_dgr(record: Mapping) -> Optional[Dict]:
+    """The current DGR endorsement, else the most recent one, else None."""
+    entries = _nested(record.get("dgr"))
+    if not entries:
+        return None
+    current = [e for e in entries if e.get("isCurrentIndicator") == "Y"] or _current(entries, "endorsedTo")
+    return max(current or entries, key=lambda e: e.get("endorsedFrom") or "")
+
+def legal_details_row(record: Mapping) -> Dict:
+    """legal_details columns for one ABR record."""
+    concessions = _current(_nested(record.get("tax_concession_endorsements")), "effectiveTo")
+    concession_dates = [d for d in (_date(e.get("effectiveFrom")) for e in concessions) if d]
+    gst = [e for e in concessions if e.get("endorsementType") == "GST Concession"]
+    registered = record.get("acnc_status") == "Registered"
+    dgr = current_dgr(record)
+    return {
+        "abn": _abn(record.get("abn")),
+        "entity_type": record.get("entityDescription"),
+        "abn_status": record.get("entityStatus") == "Active",
+        "abn_activated": _date(record.get("effectiveFrom")),
+        "abn_last_updated": _date(record.get("record_last_updated")),
+        "acnc_status": registered,
+        "acnc_registered": registered,
+        "acnc_registered_date": _date(record.get("acnc_status_from")) if registered else None,
+        "tax_concession_endorsement": min(concession_dates) if concession_dates else None,
+        "gst_concession_endorsement_date": gst[0].get("effectiveFrom") if gst else None,
+        "dgr_endorsement": bool(dgr) and bool(_current([dgr], "endorsedTo")),
+    }
+
+def dgr_row(record: Mapping) -> Optional[Dict]:
+    """dgr_endorsement columns (without legal_id) for one ABR record, or None."""
+    dgr = current_dgr(record)
+    if dgr is None:
+        return None
+    funds = [f.get("dgrFundName", {}).get("organisationName") if isinstance(f.get("dgrFundName"), dict)
+             else f.get("dgrFundName") for f in _nested(dgr.get("dgrFund"))]
+    return {
+        "endorsement_start_date": _date(dgr.get("endorsedFrom")),
+        "endorsement_end_date": _date(dgr.get("endorsedTo")),
+        "dgr_items": dgr.get("itemNumber"),
+        "dgr_funds": "; ".join(f for f in funds if f) or None,
+    }
+
+LEGAL_COLUMNS = list(legal_details_row({}).keys())
+
+def upsert_legal_details(rows: List[Dict]):
+    """One multi-row INSERT ... ON CONFLICT (abn) for a batch of legal_details rows."""
+    statement = insert(legal_details).values(rows)
+    excluded = statement.excluded
+    return (
+        statement.on_conflict_do_update(
+            index_elements=[legal_details.c.abn],
+            set_={**{c: excluded[c] for c in LEGAL_COLUMNS if c != "abn"},
+                  "org_id": func.coalesce(excluded.org_id, legal_details.c.org_id),
+                  "last_edited_at": func.current_timestamp()},
+            # Leave rows alone unless the register says they changed since the last load,
+            # or the row gets the organisation link it did not have
+            where=or_(legal_details.c.abn_last_updated.is_(None),
+                      excluded.abn_last_updated > legal_details.c.abn_last_updated,
+                      and_(legal_details.c.org_id.is_(None), excluded.org_id.is_not(None))),
+        )
+        # Skipped rows return nothing; xmax is 0 only for freshly inserted rows
+        .returning(legal_details.c.legal_id, legal_details.c.abn, legal_details.c.org_id,
+                   literal_column("(xmax = 0)").label("inserted"))
+    )
+
+def upsert_dgr(rows: List[Dict]):
+    statement = insert(dgr_endorsement).values(rows)
+    excluded = statement.excluded
+    columns = ("endorsement_start_date", "endorsement_end_date", "dgr_items", "dgr_funds")
+    return statement.on_conflict_do_update(
+        index_elements=[dgr_endorsement.c.legal_id],
+        set_={**{c: excluded[c] for c in columns}, "last_edited_at": func.current_timestamp()},
+    )
+
+def _batches(records: Iterable[Mapping], size: int) -> Iterator[List[Mapping]]:
+    batch: List[Mapping] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _latest_per_abn(batch: List[Mapping]) -> Dict[str, Mapping]:
+    # ON CONFLICT cannot touch one row twice in a statement, so keep one record per ABN
+    latest: Dict[str, Mapping] = {}
+    for record in batch:
+        abn = _abn(record.get("abn"))
+        if not abn:
+            continue
+        previous = latest.get(abn)
+        if previous is None or (record.get("record_last_updated") or "") > (previous.get("record_last_updated") or ""):
+            latest[abn] = record
+    return latest
+
+def _org_id(record: Mapping, abn: str, org_ids: Mapping) -> Any:
+    return record.get("organisation_id") or record.get("org_id") or org_ids.get(abn) or None
+
+def load_batch(connection, batch: List[Mapping], stats: LoadStats, org_ids: Optional[Mapping] = None) -> List:
+    """Loads one batch; returns the org_ids of the legal_details rows it wrote."""
+    records = _latest_per_abn(batch)
+    if not records:
+        return []
+    org_ids = org_ids or {}
+    rows = [{**legal_details_row(record), "org_id": _org_id(record, abn, org_ids)} for abn, record in records.items()]
+    written = connection.execute(upsert_legal_details(rows)).all()
+    # Only deduplicated records with an ABN were sent; the ones not returned were unchanged
+    stats.skipped += len(records) - len(written)
+    stats.inserted += sum(1 for row in written if row.inserted)
+    stats.updated += sum(1 for row in written if not row.inserted)
+    stats.unlinked += sum(1 for row in written if row.inserted and row.org_id is None)
+    if not written:
+        return []
+
+    endorsements, without = [], []
+    for row in written:
+        dgr = dgr_row(records[row.abn])
+        if dgr is None:
+            without.append(row.legal_id)
+        else:
+            endorsements.append({"legal_id": row.legal_id, **dgr})
+    if endorsements:
+        connection.execute(upsert_dgr(endorsements))
+        stats.dgr_upserted += len(endorsements)
+    if without:
+        removed = connection.execute(delete(dgr_endorsement).where(dgr_endorsement.c.legal_id.in_(without)))
+        stats.dgr_removed += removed.rowcount
+    return [row.org_id for row in written if row.org_id is not None]
+
+def load_abn_records(connection, records: Iterable[Mapping], batch_size: int = BATCH_SIZE,
+                     org_ids: Optional[Mapping] = None) -> LoadStats:
+    """
+    Upserts ABR records (ABNRecords or CSV rows) into legal_details and dgr_endorsement
+    in batches, and refreshes the summaries they affect, all in the caller's transaction.
+    org_ids maps ABNs to the organisations new rows belong to.
+    """
+    stats = LoadStats()
+    written = set()
+    for batch in _batches(records, batch_size):
+        written.update(load_batch(connection, batch, stats, org_ids))
+    refresh_summaries(connection, postcodes_for_orgs(connection, written))
+    logger.info(f"legal_details: {stats.inserted} inserted, {stats.updated} updated, {stats.skipped} unchanged; "
+                f"dgr_endorsement: {stats.dgr_upserted} upserted, {stats.dgr_removed} removed")
+    if stats.unlinked:
+        logger.warning(f"{stats.unlinked} new legal_details rows have no organisation (no org_id for their ABN)")
+    return stats
+
+def read_org_ids(path: str) -> Dict[str, str]:
+    """ABN -> org_id from a CSV with abn and organisation_id (or org_id) columns."""
+    with open(path, newline="", encoding="utf-8") as file:
+        return {_abn(row["abn"]): row.get("organisation_id") or row.get("org_id")
+                for row in csv.DictReader(file) if _abn(row.get("abn"))}
+
+def main():
+    from database.connections import get_engine
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Load ABR results into legal_details and dgr_endorsement")
+    parser.add_argument("paths", nargs="+", help="abn_register_results_*.csv files, oldest first")
+    parser.add_argument("--database", default="production")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--org-ids", help="CSV of abn,organisation_id linking new ABNs to their organisations")
+    args = parser.parse_args()
+
+    org_ids = read_org_ids(args.org_ids) if args.org_ids else None
+    with get_engine(args.database).begin() as connection:
+        for path in args.paths:
+            with open(path, newline="", encoding="utf-8") as file:
+                load_abn_records(connection, csv.DictReader(file), args.batch_size, org_ids)
+
+if __name__ == "__main__":
+    main()
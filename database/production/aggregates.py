@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from database.production.models import (
+    Alias, ContactInfo, DGREndorsement, LegalDetails, Organisations,
+)
+
+@dataclass(frozen=True)
+class OrganisationAggregate:
+    """An organisation with its aliases, contact details and legal details (each with its DGR endorsements)."""
+    organisation: Organisations
+    aliases: Tuple[Alias, ...]
+    contact_info: Tuple[ContactInfo, ...]
+    legal_details: Tuple[LegalDetails, ...]
+
+    @property
+    def org_id(self):
+        return self.organisation.org_id
+
+    @property
+    def slug(self) -> str:
+        return self.organisation.slug
+
+    @property
+    def dgr_endorsements(self) -> Tuple[DGREndorsement, ...]:
+        return tuple(endorsement for legal in self.legal_details for endorsement in legal.dgr_endorsements)
+
+# One SELECT per relationship for the whole batch (IN over the parent keys), instead of
+# one per relationship per organisation
+AGGREGATE_OPTIONS = (
+    selectinload(Organisations.aliases),
+    selectinload(Organisations.contact_info),
+    selectinload(Organisations.legal_details).selectinload(LegalDetails.dgr_endorsements),
+)
+
+def _aggregate(org: Organisations) -> OrganisationAggregate:
+    return OrganisationAggregate(org, tuple(org.aliases), tuple(org.contact_info), tuple(org.legal_details))
+
+def load_aggregates(session: Session, org_ids: Optional[Iterable] = None, slugs: Optional[Iterable[str]] = None,
+                    limit: Optional[int] = None) -> List[OrganisationAggregate]:
+    """
+    Loads organisations by org_id or slug (or the first `limit` by slug when neither is
+    given) with every part of the aggregate, in five queries however many organisations
+    are read (SQLAlchemy splits each IN list into chunks of 500).
+    """
+    statement = select(Organisations).options(*AGGREGATE_OPTIONS).order_by(Organisations.slug)
+    if org_ids is not None:
+        statement = statement.where(Organisations.org_id.in_(list(org_ids)))
+    if slugs is not None:
+        statement = statement.where(Organisations.slug.in_(list(slugs)))
+    if limit is not None:
+        statement = statement.limit(limit)
+    return [_aggregate(org) for org in session.scalars(statement)]
+
+def load_aggregate(session: Session, slug: str) -> Optional[OrganisationAggregate]:
+    aggregates = load_aggregates(session, slugs=[slug])
+    return aggregates[0] if aggregates else None
+
+def aggregates_for_postcodes(session: Session, postcodes: Sequence[str]) -> List[OrganisationAggregate]:
+    """Every organisation with a contact address in one of the postcodes."""
+    org_ids = select(ContactInfo.org_id).where(ContactInfo.postcode.in_(list(postcodes)))
+    statement = (select(Organisations).options(*AGGREGATE_OPTIONS)
+                 .where(Organisations.org_id.in_(org_ids)).order_by(Organisations.slug))
+    return [_aggregate(org) for org in session.scalars(statement)]
@@ -0,0 +1,231 @@
+"""
+Streams community_orgs tables out to files for analysis.
+
+    python -m database.production.export --output-dir data/exports
+    python -m database.production.export --format parquet --tables organisations,legal_details --workers 4
+
+Both formats read with COPY ... TO STDOUT, so the server formats the rows and the client
+only moves bytes; no result set is ever materialised in Python. CSV goes straight into
+the file. Parquet (needs pyarrow) parses the stream in blocks of --chunk-bytes and
+writes one row group per block. Memory stays bounded by one block per worker, whatever
+the table size. The pooled connections' statement_timeout is lifted for the export's
+transaction only, since a large table can take longer than any sensible query limit.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from sqlalchemy import text
+
+from database.connections import get_engine
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "community_orgs"
+CHUNK_BYTES = 16 << 20
+
+# Ordinary and partitioned tables, but not the partitions themselves (exported via their parent)
+LIST_TABLES = text("""
+    SELECT c.relname
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = :schema AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+    ORDER BY c.relname
+""")
+
+LIST_COLUMNS = text("""
+    SELECT column_name, data_type FROM information_schema.columns
+    WHERE table_schema = :schema AND table_name = :table
+    ORDER BY ordinal_position
+""")
+
+@dataclass
+class ExportResult:
+    table: str
+    path: str
+    rows: int
+    bytes: int
+    seconds: float
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / 1_000_000 / self.seconds if self.seconds else 0.0
+
+def list_tables(engine, schema: str = SCHEMA) -> List[str]:
+    with engine.connect() as conn:
+        return [row.relname for row in conn.execute(LIST_TABLES, {"schema": schema})]
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def _without_statement_timeout(conn):
+    # SET LOCAL lasts until the rollback that ends the export, so the pool gets its timeout back
+    conn.execute(text("SET LOCAL statement_timeout = 0"))
+
+def _copy_to(dbapi_connection, sql: str, file) -> int:
+    """COPY TO STDOUT into file for whichever driver the engine uses; returns the row count."""
+    cursor = dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, file)
+        elif hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(sql) as copy:
+                for data in copy:
+                    file.write(data)
+        else:  # pg8000
+            cursor.execute(sql, stream=file)
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+def export_csv(engine, table: str, path: str, schema: str = SCHEMA) -> int:
+    # COPY (SELECT ...) rather than COPY table, which partitioned tables do not support
+    sql = f"COPY (SELECT * FROM {_quote(schema)}.{_quote(table)}) TO STDOUT WITH (FORMAT csv, HEADER true)"
+    with engine.connect() as conn, open(path, "wb") as file:
+        _without_statement_timeout(conn)
+        rows = _copy_to(conn.connection.dbapi_connection, sql, file)
+        conn.rollback()
+    return rows
+
+# Postgres type -> (select expression template, type pyarrow reads from the CSV, final type name).
+# Dates and timestamps travel as integers (days / microseconds since the epoch) so pyarrow
+# never parses date strings; everything else without an exact match goes out as text.
+ARROW_TYPES = {
+    "boolean": ("{}", "bool_", None),
+    "smallint": ("{}", "int16", None),
+    "integer": ("{}", "int32", None),
+    "bigint": ("{}", "int64", None),
+    "real": ("{}", "float32", None),
+    "double precision": ("{}", "float64", None),
+    "date": ("({} - DATE '1970-01-01')", "int32", "date32"),
+    "timestamp with time zone": ("(extract(epoch FROM {}) * 1000000)::bigint", "int64", "timestamp_utc"),
+    "timestamp without time zone": ("(extract(epoch FROM {}) * 1000000)::bigint", "int64", "timestamp"),
+}
+
+def _arrow_columns(conn, table: str, schema: str):
+    """Select expressions, the column types to read the COPY output with, and the Parquet schema."""
+    import pyarrow as pa
+
+    final_types = {"date32": pa.date32(), "timestamp_utc": pa.timestamp("us", tz="UTC"), "timestamp": pa.timestamp("us")}
+    expressions, read_types, fields = [], {}, []
+    for column, data_type in conn.execute(LIST_COLUMNS, {"schema": schema, "table": table}):
+        template, read_type, final_type = ARROW_TYPES.get(data_type, ("{}::text", "string", None))
+        expressions.append(f"{template.format(_quote(column))} AS {_quote(column)}")
+        read_types[column] = getattr(pa, read_type)()
+        fields.append(pa.field(column, final_types[final_type] if final_type else read_types[column]))
+    return expressions, read_types, pa.schema(fields)
+
+def export_parquet(engine, table: str, path: str, schema: str = SCHEMA, chunk_bytes: int = CHUNK_BYTES) -> int:
+    """
+    COPY ... TO STDOUT in CSV into a pipe that pyarrow parses in blocks of chunk_bytes,
+    each written as one Parquet row group. The COPY runs in a helper thread, so reading
+    from the server and encoding Parquet overlap.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from e
+
+    rows = 0
+    with engine.connect() as conn:
+        _without_statement_timeout(conn)
+        expressions, read_types, arrow_schema = _arrow_columns(conn, table, schema)
+        sql = (f"COPY (SELECT {', '.join(expressions)} FROM {_quote(schema)}.{_quote(table)}) "
+               f"TO STDOUT WITH (FORMAT csv, HEADER true)")
+        read_fd, write_fd = os.pipe()
+        source, sink = os.fdopen(read_fd, "rb"), os.fdopen(write_fd, "wb", buffering=1 << 20)
+
+        def copy_out():
+            try:
+                return _copy_to(conn.connection.dbapi_connection, sql, sink)
+            finally:
+                sink.close()
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"copy-{table}") as pool:
+            copied = pool.submit(copy_out)
+            try:
+                batches = pa_csv.open_csv(
+                    source,
+                    read_options=pa_csv.ReadOptions(block_size=chunk_bytes),
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types=read_types, true_values=["t"], false_values=["f"],
+                        # COPY writes NULL unquoted and '' quoted, so the two stay distinct
+                        strings_can_be_null=True, quoted_strings_can_be_null=False,
+                    ),
+                )
+                with pq.ParquetWriter(path, arrow_schema, compression="zstd") as writer:
+                    for batch in batches:
+                        writer.write_table(pa.Table.from_batches([batch]).cast(arrow_schema))
+                        rows += batch.num_rows
+                    if rows == 0:
+                        writer.write_table(arrow_schema.empty_table())
+            finally:
+                # Unblocks the COPY thread if parsing stopped early
+                source.close()
+            copied.result()
+        conn.rollback()
+    return rows
+
+def export_table(engine, table: str, output_dir: str, fmt: str = "csv", schema: str = SCHEMA,
+                 chunk_bytes: int = CHUNK_BYTES) -> ExportResult:
+    path = os.path.join(output_dir, f"{table}.{fmt}")
+    partial = path + ".partial"
+    started = time.perf_counter()
+    try:
+        if fmt == "csv":
+            rows = export_csv(engine, table, partial, schema)
+        else:
+            rows = export_parquet(engine, table, partial, schema, chunk_bytes)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    result = ExportResult(table, path, rows, os.path.getsize(path), time.perf_counter() - started)
+    logger.info(f"{schema}.{table}: {result.rows} rows, {result.bytes / 1_000_000:.1f} MB "
+                f"in {result.seconds:.2f}s ({result.mb_per_second:.1f} MB/s)")
+    return result
+
+def export_schema(output_dir: str, fmt: str = "csv", tables: Optional[Sequence[str]] = None,
+                  database: str = "production", schema: str = SCHEMA, workers: int = 4,
+                  chunk_bytes: int = CHUNK_BYTES) -> List[ExportResult]:
+    """
+    Exports the given tables (default: every table in schema) with up to `workers`
+    tables in flight, each on its own pooled connection. Files are written as
+    <table>.<fmt>.partial and renamed once complete.
+    """
+    engine = get_engine(database)
+    tables = list(tables) if tables else list_tables(engine, schema)
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as pool:
+        results = list(pool.map(lambda table: export_table(engine, table, output_dir, fmt, schema, chunk_bytes), tables))
+    seconds = time.perf_counter() - started
+    total_bytes = sum(r.bytes for r in results)
+    logger.info(f"Exported {len(results)} tables, {sum(r.rows for r in results)} rows, "
+                f"{total_bytes / 1_000_000:.1f} MB in {seconds:.2f}s ({total_bytes / 1_000_000 / seconds:.1f} MB/s)")
+    return results
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Export community_orgs tables to CSV or Parquet")
+    parser.add_argument("--output-dir", default=os.path.join("data", "exports"))
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    parser.add_argument("--tables", help="comma-separated table names (default: all)")
+    parser.add_argument("--database", default="production")
+    parser.add_argument("--schema", default=SCHEMA)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-bytes", type=int, default=CHUNK_BYTES, help="Parquet row group input size")
+    args = parser.parse_args()
+
+    results = export_schema(args.output_dir, args.format, args.tables.split(",") if args.tables else None,
+                            args.database, args.schema, args.workers, args.chunk_bytes)
+    print(json.dumps([r.__dict__ for r in results], indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 from datetime import date
 import uuid, json, logging
 
+from config_data.addresses import normalise_postcode, suburb_key
+from database.production.slugs import slugify_name
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -12,7 +15,7 @@ MAPPINGS = {
             'established_date': {'target': 'date_established', 'transform': lambda x: date.fromisoformat(x) if x else None},
             'description_text': {'target': 'description', 'transform': lambda x: x.strip() if x else None},
             'public_status': {'target': 'is_public', 'transform': lambda x: bool(x) if x is not None else True},
-            'slug_value': {'target': 'slug', 'transform': lambda x: x.strip().lower().replace(' ', '-') if x else None},
+            'slug_value': {'target': 'slug', 'transform': lambda x: slugify_name(x) if x else None},
             'inserted_by_id': {'target': 'inserted_by', 'transform': lambda x: uuid.UUID(x) if x else None},
             'last_edited_by_id': {'target': 'last_edited_by', 'transform': lambda x: uuid.UUID(x) if x else None},
         },
@@ -58,6 +61,8 @@ MAPPINGS = {
             'source_fields': {
                 'physical_addr': {'target': 'physical_address', 'transform': lambda x: x.strip() if x else None},
                 'postal_addr': {'target': 'postal_address', 'transform': lambda x: x.strip() if x else None},
+                'postcode': {'target': 'postcode', 'transform': lambda x: normalise_postcode(x) if x else None},
+                'suburb': {'target': 'suburb', 'transform': lambda x: suburb_key(x) if x else None},
                 'phone_number': {'target': 'phone', 'transform': lambda x: x.strip()[:50] if x else None},
                 'email_address': {'target': 'email', 'transform': lambda x: x.strip()[:255].lower() if x else None},
                 'website_url': {'target': 'website', 'transform': lambda x: x.strip()[:255] if x else None},
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Boolean, String, Integer, Numeric, ForeignKey, Index, CheckConstraint
+from sqlalchemy import Column, Boolean, String, Integer, Numeric, ForeignKey, Index, CheckConstraint, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP, DATE, JSONB, ENUM, ARRAY
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.declarative import DeferredReflection, declarative_base
 from sqlalchemy.orm import  relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import logging
 from datetime import datetime
 import uuid
@@ -15,6 +15,14 @@ logger = logging.getLogger(__name__)
 # SQLAlchemy setup
 Base = declarative_base()
 
+class User(Base):
+    # Supabase auth.users, owned by Supabase Auth; mapped only as the target of the
+    # inserted_by / last_edited_by / user_id foreign keys
+    __tablename__ = 'users'
+    __table_args__ = {'schema': 'auth'}
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    email = Column(String, nullable=True)
+
 # Define SQLAlchemy models for production tables
 # Schema 'community_orgs'
 # Define the enumerations
@@ -23,17 +31,12 @@ alias_type_enum = ENUM('trading_name', 'abbreviation', 'former_name', name='alia
 class Organisations(Base):
     __tablename__ = 'organisations'
     __table_args__ = (
-        {'schema': 'community_orgs',
-         'indexes': [
-             Index('idx_org_date', 'date_established'),
-             Index('idx_org_legal_name', 'entity_name'),
-             Index('idx_organisations_public', 'is_public', postgresql_where='is_public = TRUE')
-         ],
-         'postgresql': {
-             'constraint_organisations_pkey': {'org_id': 'primary'},
-             'constraint_organisations_slug_key': {'slug': 'unique'}
-         }
-        }
+        Index('idx_org_date', 'date_established'),
+        Index('idx_org_legal_name', 'entity_name'),
+        Index('idx_organisations_public', 'is_public', postgresql_where=text('is_public = TRUE')),
+        # Trigram index for "name like X" searches (ILIKE '%x%' and similarity(); needs pg_trgm)
+        Index('idx_org_entity_name_trgm', 'entity_name', postgresql_using='gin', postgresql_ops={'entity_name': 'gin_trgm_ops'}),
+        {'schema': 'community_orgs'}
     )
     org_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     entity_name = Column(String, nullable=False)
@@ -48,10 +51,30 @@ class Organisations(Base):
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
- 
+    # Child collections load lazily one query per organisation; read whole aggregates
+    # through database.production.aggregates, which batches them with selectinload
+    aliases = relationship('Alias', back_populates='organisation')
+    contact_info = relationship('ContactInfo', back_populates='organisation')
+    legal_details = relationship('LegalDetails', back_populates='organisation')
+    relationships = relationship('Relationship', back_populates='organisation')
+    programs_services = relationship('ProgramService', back_populates='organisation')
+    resources_assets = relationship('ResourcesAssets', back_populates='organisation')
+    accreditations = relationship('Accreditation', back_populates='organisation')
+    financial_info = relationship('FinancialInfo', back_populates='organisation')
+    historical_info = relationship('HistoricalInfo', back_populates='organisation')
+    governance = relationship('Governance', back_populates='organisation')
+    operational_details = relationship('OperationalDetails', back_populates='organisation')
+    performance_metrics = relationship('PerformanceMetrics', back_populates='organisation')
+    org_members = relationship('OrgMembers', back_populates='organisation')
+    org_visibility = relationship('OrgVisibility', back_populates='organisation')
+
 class Alias(Base):
     __tablename__ = 'aliases'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_aliases_org_id', 'org_id'),
+        Index('idx_aliases_alias_trgm', 'alias', postgresql_using='gin', postgresql_ops={'alias': 'gin_trgm_ops'}),
+        {'schema': 'community_orgs'}
+    )
     alias_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     alias_type = Column(alias_type_enum, nullable=True)
@@ -59,17 +82,24 @@ class Alias(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='aliases')
+    organisation = relationship('Organisations', back_populates='aliases')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class ContactInfo(Base):
     __tablename__ = 'contact_info'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_contact_info_org_id', 'org_id'),
+        # "near postcode Y" lookups; org_id second so the join back to organisations is index-only
+        Index('idx_contact_info_postcode_org_id', 'postcode', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     contact_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     physical_address = Column(String, nullable=True)
     postal_address = Column(String, nullable=True)
+    postcode = Column(String(4), nullable=True)
+    suburb = Column(String, nullable=True)
     phone = Column(String(50), nullable=True)
     email = Column(String(255), nullable=True)
     website = Column(String(255), nullable=True)
@@ -78,19 +108,42 @@ class ContactInfo(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='contact_info')
+    organisation = relationship('Organisations', back_populates='contact_info')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
+class PostcodeSummary(Base):
+    """Organisation counts per postcode, maintained by database.production.summaries."""
+    __tablename__ = 'postcode_summary'
+    __table_args__ = {'schema': 'community_orgs'}
+    postcode = Column(String(4), primary_key=True)
+    org_count = Column(Integer, nullable=False, server_default='0')
+    public_count = Column(Integer, nullable=False, server_default='0')
+    acnc_registered_count = Column(Integer, nullable=False, server_default='0')
+    dgr_endorsed_count = Column(Integer, nullable=False, server_default='0')
+    incorporated_count = Column(Integer, nullable=False, server_default='0')
+    refreshed_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.current_timestamp())
+
+class SuburbSummary(Base):
+    """Organisation counts per (postcode, suburb); suburb is '' where the address has none."""
+    __tablename__ = 'suburb_summary'
+    __table_args__ = {'schema': 'community_orgs'}
+    postcode = Column(String(4), primary_key=True)
+    suburb = Column(String, primary_key=True)
+    org_count = Column(Integer, nullable=False, server_default='0')
+    public_count = Column(Integer, nullable=False, server_default='0')
+    acnc_registered_count = Column(Integer, nullable=False, server_default='0')
+    dgr_endorsed_count = Column(Integer, nullable=False, server_default='0')
+    incorporated_count = Column(Integer, nullable=False, server_default='0')
+    refreshed_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.current_timestamp())
+
 class LegalDetails(Base):
     __tablename__ = 'legal_details'
     __table_args__ = (
-        {
-            'schema': 'community_orgs',
-            'indexes': [
-                Index('idx_org_abn', 'abn')
-            ]
-        }
+        # Unique so ABR loads can upsert ON CONFLICT (abn)
+        Index('idx_org_abn', 'abn', unique=True),
+        Index('idx_legal_details_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
     )
     legal_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
@@ -115,20 +168,14 @@ class LegalDetails(Base):
     acnc_registered_date = Column(DATE, nullable=True)
     gst_concession_endorsement_date = Column(String, nullable=True)
     dgr_endorsement = Column(Boolean, nullable=True)
-    organisation = relationship('Organisation', backref='legal_details')
+    organisation = relationship('Organisations', back_populates='legal_details')
+    dgr_endorsements = relationship('DGREndorsement', back_populates='legal_details')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class DGREndorsement(Base):
     __tablename__ = 'dgr_endorsement'
-    __table_args__ = (
-        {
-            'schema': 'community_orgs',
-            'postgresql': {
-                'constraint_dgr_endorsement_legal_id_key': {'legal_id': 'unique'}
-            }
-        }
-    )
+    __table_args__ = {'schema': 'community_orgs'}
     endorsement_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     legal_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.legal_details.legal_id'), nullable=True, unique=True)
     endorsement_start_date = Column(DATE, nullable=True)
@@ -138,13 +185,16 @@ class DGREndorsement(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    legal_details = relationship('LegalDetails', backref='dgr_endorsements')
+    legal_details = relationship('LegalDetails', back_populates='dgr_endorsements')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class Relationship(Base):
     __tablename__ = 'relationships'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_relationships_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     relationship_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     partner_org = Column(String(255), nullable=True)
@@ -155,13 +205,16 @@ class Relationship(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='relationships')
+    organisation = relationship('Organisations', back_populates='relationships')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class ProgramService(Base):
     __tablename__ = 'programs_services'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_programs_services_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     program_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     program_name = Column(String(255), nullable=True)
@@ -172,13 +225,16 @@ class ProgramService(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='programs_services')
+    organisation = relationship('Organisations', back_populates='programs_services')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class ResourcesAssets(Base):
     __tablename__ = 'resources_assets'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_resources_assets_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     asset_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     asset_type = Column(String, nullable=True)
@@ -189,13 +245,16 @@ class ResourcesAssets(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='resources_assets')
+    organisation = relationship('Organisations', back_populates='resources_assets')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class Accreditation(Base):
     __tablename__ = 'accreditation'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_accreditation_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     accreditation_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     certification_type = Column(String(255), nullable=True)
@@ -206,13 +265,16 @@ class Accreditation(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='accreditations')
+    organisation = relationship('Organisations', back_populates='accreditations')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class FinancialInfo(Base):
     __tablename__ = 'financial_info'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_financial_info_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     finance_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     funding_sources = Column(ARRAY(String), nullable=True)
@@ -223,13 +285,16 @@ class FinancialInfo(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='financial_info')
+    organisation = relationship('Organisations', back_populates='financial_info')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class HistoricalInfo(Base):
     __tablename__ = 'historical_info'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_historical_info_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     history_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     founding_members = Column(ARRAY(String), nullable=True)
@@ -240,13 +305,33 @@ class HistoricalInfo(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='historical_info')
+    organisation = relationship('Organisations', back_populates='historical_info')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
+class RegisterPayloads(Base):
+    # Each distinct register record once, keyed by its content hash (see observations.py)
+    __tablename__ = 'register_payloads'
+    __table_args__ = {'schema': 'community_orgs'}
+    content_hash = Column(LargeBinary, primary_key=True)
+    payload = Column(JSONB, nullable=False)
+
+class RegisterObservations(Base):
+    # One row per (source, entity, run); monthly partitions are created by observations.ensure_partitions()
+    __tablename__ = 'register_observations'
+    __table_args__ = {'schema': 'community_orgs', 'postgresql_partition_by': 'RANGE (captured_on)'}
+    source = Column(String, primary_key=True)
+    entity_key = Column(String, primary_key=True)
+    captured_on = Column(DATE, primary_key=True)
+    run_id = Column(String, primary_key=True)
+    content_hash = Column(LargeBinary, nullable=False)
+
 class Governance(Base):
     __tablename__ = 'governance'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_governance_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     governance_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     board_structure = Column(JSONB, nullable=True)
@@ -256,13 +341,16 @@ class Governance(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='governance')
+    organisation = relationship('Organisations', back_populates='governance')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class OperationalDetails(Base):
     __tablename__ = 'operational_details'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_operational_details_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     op_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     service_area = Column(String, nullable=True)
@@ -276,13 +364,16 @@ class OperationalDetails(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='operational_details')
+    organisation = relationship('Organisations', back_populates='operational_details')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class PerformanceMetrics(Base):
     __tablename__ = 'performance_metrics'
-    __table_args__ = {'schema': 'community_orgs'}
+    __table_args__ = (
+        Index('idx_performance_metrics_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
+    )
     metric_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
     metric_type = Column(String, nullable=True)
@@ -293,15 +384,16 @@ class PerformanceMetrics(Base):
     last_edited_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='performance_metrics')
+    organisation = relationship('Organisations', back_populates='performance_metrics')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
 class OrgMembers(Base):
     __tablename__ = 'org_members'
     __table_args__ = (
-        {'schema': 'community_orgs'},
-        CheckConstraint("role IN ('admin', 'member', 'viewer')", name='org_members_role_check')
+        CheckConstraint("role IN ('admin', 'member', 'viewer')", name='org_members_role_check'),
+        Index('idx_org_members_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
     )
     member_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
@@ -312,7 +404,7 @@ class OrgMembers(Base):
     last_edited_at = Column(TIMESTAMP(timezone=False), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='org_members')
+    organisation = relationship('Organisations', back_populates='org_members')
     user = relationship('User', foreign_keys=[user_id])
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
@@ -320,8 +412,9 @@ class OrgMembers(Base):
 class OrgVisibility(Base):
     __tablename__ = 'org_visibility'
     __table_args__ = (
-        {'schema': 'community_orgs'},
-        CheckConstraint("visibility_type IN ('public', 'limited', 'restricted')", name='org_visibility_visibility_type_check')
+        CheckConstraint("visibility_type IN ('public', 'limited', 'restricted')", name='org_visibility_visibility_type_check'),
+        Index('idx_org_visibility_org_id', 'org_id'),
+        {'schema': 'community_orgs'}
     )
     visibility_id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     org_id = Column(UUID(as_uuid=True), ForeignKey('community_orgs.organisations.org_id'), nullable=True)
@@ -332,26 +425,37 @@ class OrgVisibility(Base):
     last_edited_at = Column(TIMESTAMP(timezone=False), nullable=True, server_default=func.current_timestamp())
     inserted_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
     last_edited_by = Column(UUID(as_uuid=True), ForeignKey('auth.users.id'), nullable=True)
-    organisation = relationship('Organisation', backref='org_visibility')
+    organisation = relationship('Organisations', back_populates='org_visibility')
     inserted_by_user = relationship('User', foreign_keys=[inserted_by])
     last_edited_by_user = relationship('User', foreign_keys=[last_edited_by])
 
-class Roles(Base):
+class Reflected(DeferredReflection):
+    # Role tables are managed in Supabase and nothing here reads their columns; they are
+    # mapped from the live database by reflect_role_tables(engine) when needed
+    __abstract__ = True
+
+class Roles(Reflected, Base):
     __tablename__ = 'roles'
     __table_args__ = {'schema': 'community_orgs'}
 
-class UserOrganisationRoles(Base):
+class UserOrganisationRoles(Reflected, Base):
     __tablename__ = 'user_organisation_roles'
     __table_args__ = {'schema': 'community_orgs'}
 
-class RoleRequests(Base):
+class RoleRequests(Reflected, Base):
     __tablename__ = 'role_requests'
     __table_args__ = {'schema': 'community_orgs'}
 
-class RoleAuditLog(Base):
+class RoleAuditLog(Reflected, Base):
     __tablename__ = 'role_audit_log'
     __table_args__ = {'schema': 'community_orgs'}
 
+def reflect_role_tables(engine):
+    """Maps Roles, UserOrganisationRoles, RoleRequests and RoleAuditLog from the tables in engine's database."""
+    Reflected.prepare(engine)
+
 class ReservedSlugs(Base):
     __tablename__ = 'reserved_slugs'
     __table_args__ = {'schema': 'community_orgs'}
+    slug = Column(String, primary_key=True)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.current_timestamp())
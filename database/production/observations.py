@@ -0,0 +1,212 @@
+"""
+Partitioned, append-only observation store for register snapshots.
+
+    python -m database.production.observations record data/raw/abn_register_results_20250907_1219.csv
+    python -m database.production.observations as-of abn_register_results 47916808753 2025-09-30
+
+register_observations holds one row per (source, entity, run): the capture date, the
+run id and a 16-byte content hash, range-partitioned by month of capture. Payloads are
+stored once per distinct content in register_payloads, so an entity that does not
+change between runs costs one narrow row per run.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import String
+
+from data.processing.snapshot_diff import SNAPSHOT_KEYS, snapshot_rows
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "community_orgs"
+TABLE = "register_observations"
+BATCH_SIZE = 5000
+# Default lower bound for as-of lookups; keeps partition pruning on both ends
+DEFAULT_LOOKBACK = timedelta(days=366)
+
+# <prefix>_<run>[.shard-i-of-n].<csv|jsonl>, as main.py names its outputs
+RUN_STAMP = re.compile(r"_(\d{8}_\d{4})(?:\.shard-\d+-of-\d+)?\.(?:csv|jsonl)$")
+
+class Observation(NamedTuple):
+    source: str
+    entity_key: str
+    captured_on: date
+    run_id: str
+    payload: Dict
+
+INSERT_PAYLOADS = text(f"""
+    INSERT INTO {SCHEMA}.register_payloads (content_hash, payload)
+    SELECT decode(h, 'hex'), CAST(p AS jsonb) FROM unnest(:hashes, :payloads) AS t(h, p)
+    ON CONFLICT (content_hash) DO NOTHING
+""").bindparams(bindparam("hashes", type_=ARRAY(String)), bindparam("payloads", type_=ARRAY(String)))
+
+INSERT_OBSERVATIONS = text(f"""
+    INSERT INTO {SCHEMA}.{TABLE} (captured_on, source, entity_key, run_id, content_hash)
+    SELECT CAST(:captured_on AS date), :source, k, :run_id, decode(h, 'hex') FROM unnest(:keys, :hashes) AS t(k, h)
+    ON CONFLICT DO NOTHING
+""").bindparams(bindparam("keys", type_=ARRAY(String)), bindparam("hashes", type_=ARRAY(String)))
+
+AS_OF = text(f"""
+    SELECT o.captured_on, o.run_id, p.payload
+    FROM {SCHEMA}.{TABLE} o
+    JOIN {SCHEMA}.register_payloads p ON p.content_hash = o.content_hash
+    WHERE o.source = :source AND o.entity_key = :entity_key
+      AND o.captured_on <= :as_of AND o.captured_on > :since
+    ORDER BY o.captured_on DESC, o.run_id DESC
+    LIMIT 1
+""")
+
+STATE_AS_OF = text(f"""
+    SELECT DISTINCT ON (o.entity_key) o.entity_key, o.captured_on, o.run_id, p.payload
+    FROM {SCHEMA}.{TABLE} o
+    JOIN {SCHEMA}.register_payloads p ON p.content_hash = o.content_hash
+    WHERE o.source = :source AND o.captured_on <= :as_of AND o.captured_on > :since
+    ORDER BY o.entity_key, o.captured_on DESC, o.run_id DESC
+""")
+
+HISTORY = text(f"""
+    SELECT captured_on, run_id, encode(content_hash, 'hex') AS content_hash
+    FROM {SCHEMA}.{TABLE}
+    WHERE source = :source AND entity_key = :entity_key AND captured_on BETWEEN :since AND :until
+    ORDER BY captured_on, run_id
+""")
+
+def content_hash(payload: Dict) -> str:
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def _next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+def ensure_partitions(connection, start: date, end: Optional[date] = None):
+    """Creates the monthly partitions covering start..end (inclusive) if they do not exist."""
+    month = _month_start(start)
+    end = end or start
+    while month <= end:
+        upper = _next_month(month)
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA}.{TABLE}_y{month.year}m{month.month:02d} "
+            f"PARTITION OF {SCHEMA}.{TABLE} FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+        month = upper
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def record_observations(connection, source: str, run_id: str, captured_on: date,
+                        rows: Iterable[Tuple[str, Dict]], batch_size: int = BATCH_SIZE) -> int:
+    """
+    Appends one observation per (entity_key, payload) for a run, in batches of two
+    set-based INSERTs each (payloads, then observations). Re-recording the same run
+    is a no-op. Returns the number of rows passed in.
+    """
+    ensure_partitions(connection, captured_on)
+    total = 0
+    for batch in _batches(rows, batch_size):
+        keys, hashes, payloads = [], [], []
+        for entity_key, payload in batch:
+            keys.append(entity_key)
+            hashes.append(content_hash(payload))
+            payloads.append(json.dumps(payload, sort_keys=True, default=str))
+        connection.execute(INSERT_PAYLOADS, {"hashes": hashes, "payloads": payloads})
+        connection.execute(INSERT_OBSERVATIONS, {"captured_on": captured_on, "source": source, "run_id": run_id,
+                                                  "keys": keys, "hashes": hashes})
+        total += len(batch)
+    logger.info(f"Recorded {total} {source} observations for run {run_id}")
+    return total
+
+def snapshot_run(path: str) -> Tuple[str, str, date]:
+    """(source, run_id, captured_on) from a main.py snapshot name such as abn_register_results_20250907_1219.csv."""
+    name = os.path.basename(path)
+    match = RUN_STAMP.search(name)
+    if not match:
+        raise ValueError(f"No run timestamp in {name}")
+    run_id = match.group(1)
+    return name[:match.start()], run_id, datetime.strptime(run_id, "%Y%m%d_%H%M").date()
+
+def record_snapshot(connection, path: str, batch_size: int = BATCH_SIZE) -> int:
+    """Records every row of a register snapshot (CSV or JSON lines), keyed as in snapshot_diff.SNAPSHOT_KEYS."""
+    source, run_id, captured_on = snapshot_run(path)
+    key = SNAPSHOT_KEYS[source]
+
+    def rows():
+        seen = set()
+        for row in snapshot_rows(path):
+            entity_key = "".join((row.get(key) or "").split())
+            if entity_key and entity_key not in seen:
+                seen.add(entity_key)
+                yield entity_key, row
+
+    return record_observations(connection, source, run_id, captured_on, rows(), batch_size)
+
+def as_of(connection, source: str, entity_key: str, when: date,
+          lookback: timedelta = DEFAULT_LOOKBACK) -> Optional[Observation]:
+    """What source said about entity_key on the latest run on or before when (within lookback)."""
+    row = connection.execute(AS_OF, {"source": source, "entity_key": entity_key,
+                                     "as_of": when, "since": when - lookback}).first()
+    if row is None:
+        return None
+    return Observation(source, entity_key, row.captured_on, row.run_id, row.payload)
+
+def state_as_of(connection, source: str, when: date, lookback: timedelta = DEFAULT_LOOKBACK) -> Iterator[Observation]:
+    """The latest observation of every entity of a source as of when (within lookback)."""
+    for row in connection.execute(STATE_AS_OF, {"source": source, "as_of": when, "since": when - lookback}):
+        yield Observation(source, row.entity_key, row.captured_on, row.run_id, row.payload)
+
+def history(connection, source: str, entity_key: str, since: date = date.min, until: date = date.max,
+            changes_only: bool = True) -> List[Dict]:
+    """The runs that observed entity_key, oldest first; only those where its content changed by default."""
+    rows = connection.execute(HISTORY, {"source": source, "entity_key": entity_key, "since": since, "until": until})
+    result, previous = [], None
+    for row in rows:
+        if changes_only and row.content_hash == previous:
+            continue
+        previous = row.content_hash
+        result.append(dict(row._mapping))
+    return result
+
+def main():
+    from database.connections import get_engine
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Register observation store")
+    parser.add_argument("--database", default="production")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="record register snapshots (CSV or JSON lines)")
+    record.add_argument("paths", nargs="+")
+    lookup = commands.add_parser("as-of", help="what a register said about an entity on a date")
+    lookup.add_argument("source", choices=sorted(SNAPSHOT_KEYS))
+    lookup.add_argument("entity_key")
+    lookup.add_argument("date", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    engine = get_engine(args.database)
+    if args.command == "record":
+        with engine.begin() as connection:
+            for path in args.paths:
+                record_snapshot(connection, path)
+    else:
+        with engine.connect() as connection:
+            observation = as_of(connection, args.source, args.entity_key, args.date)
+        print(json.dumps(observation._asdict() if observation else None, default=str, indent=2))
+
+if __name__ == "__main__":
+    main()
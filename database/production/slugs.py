@@ -0,0 +1,113 @@
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from slugify import slugify
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import String
+
+logger = logging.getLogger(__name__)
+
+SLUG_MAX_LENGTH = 80
+FALLBACK_SLUG = "organisation"
+
+# Extra suffixes looked up per base beyond what the batch itself needs
+SUFFIX_WINDOW = 8
+
+# One round trip covers both sources; `source` tells organisation slugs from reserved ones
+TAKEN_SLUGS = text("""
+    SELECT slug, 'organisations' AS source FROM community_orgs.organisations WHERE slug = ANY(:candidates)
+    UNION ALL
+    SELECT slug, 'reserved_slugs' AS source FROM community_orgs.reserved_slugs WHERE slug = ANY(:candidates)
+""").bindparams(bindparam("candidates", type_=ARRAY(String)))
+
+def slugify_name(value: Optional[str]) -> str:
+    """URL slug for an organisation name or requested slug, e.g. 'St. John's P & C' -> 'st-john-s-p-c'."""
+    slug = slugify(value or "", max_length=SLUG_MAX_LENGTH, word_boundary=True)
+    return slug or FALLBACK_SLUG
+
+def _with_suffix(base: str, n: int) -> str:
+    if n == 1:
+        return base
+    suffix = f"-{n}"
+    return base[:SLUG_MAX_LENGTH - len(suffix)].rstrip("-") + suffix
+
+def _taken(connection, candidates: Set[str]) -> Tuple[Set[str], Set[str]]:
+    organisations, reserved = set(), set()
+    for slug, source in connection.execute(TAKEN_SLUGS, {"candidates": sorted(candidates)}):
+        (organisations if source == "organisations" else reserved).add(slug)
+    return organisations, reserved
+
+def allocate_slugs(connection, wanted: Sequence[Optional[str]], keep_existing: bool = False) -> List[str]:
+    """
+    Allocates a unique slug for every entry of wanted (names or requested slugs) and
+    returns them in the same order.
+
+    Every base is slugified, then the bases and the suffixed forms the batch could need
+    (base, base-2, base-3, ...) are checked against organisations and reserved_slugs in
+    one query. Each entry gets the first free form, in input order, so the same batch
+    against the same table always gets the same slugs. Another query is only needed when
+    a base has more than SUFFIX_WINDOW extra forms already taken, and each one looks twice
+    as far ahead.
+
+    With keep_existing, forms that already belong to organisations are handed out first,
+    in suffix order: the k-th entry with a base gets the k-th existing form (base, base-2,
+    ...), so the caller updates those organisations and reloading a batch with repeated
+    names allocates nothing new. Reserved slugs are never returned. The unique constraint on organisations.slug still guards against a
+    concurrent loader taking the same slug.
+    """
+    bases = [slugify_name(value) for value in wanted]
+    needed = Counter(bases)
+    # base -> first suffix number not yet looked up
+    next_n: Dict[str, int] = {base: 1 for base in needed}
+    organisations: Set[str] = set()
+    reserved: Set[str] = set()
+    unavailable: Set[str] = set()
+    used: Set[str] = set()
+    slugs: List[Optional[str]] = [None] * len(bases)
+    queries = 0
+    pending = list(range(len(bases)))
+    while pending:
+        candidates = set()
+        for base in {bases[i] for i in pending}:
+            start = next_n[base]
+            stop = start + needed[base] + SUFFIX_WINDOW
+            candidates.update(_with_suffix(base, n) for n in range(start, stop))
+            next_n[base] = stop
+        found_organisations, found_reserved = _taken(connection, candidates)
+        queries += 1
+        organisations |= found_organisations
+        reserved |= found_reserved
+        unavailable |= found_organisations | found_reserved
+
+        unresolved = []
+        for i in pending:
+            base = bases[i]
+            if keep_existing:
+                # The k-th occurrence of a base reuses the k-th form organisations already has
+                existing = next((slug for slug in (_with_suffix(base, n) for n in range(1, next_n[base]))
+                                 if slug in organisations and slug not in reserved and slug not in used), None)
+                if existing is not None:
+                    slugs[i] = existing
+                    used.add(existing)
+                    continue
+            for n in range(1, next_n[base]):
+                slug = _with_suffix(base, n)
+                if slug not in unavailable and slug not in used:
+                    slugs[i] = slug
+                    used.add(slug)
+                    break
+            else:
+                unresolved.append(i)
+        # Bases with long runs of taken suffixes look up twice as far next time
+        for i in unresolved:
+            needed[bases[i]] = next_n[bases[i]]
+        pending = unresolved
+    logger.info(f"Allocated {len(slugs)} slugs ({len(needed)} bases) in {queries} queries")
+    return slugs
+
+def slug_mapping(connection, names: Sequence[str]) -> Dict[str, str]:
+    """name -> allocated slug for a batch of distinct new organisation names."""
+    names = list(dict.fromkeys(names))
+    return dict(zip(names, allocate_slugs(connection, names)))
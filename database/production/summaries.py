@@ -0,0 +1,115 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.types import String
+
+logger = logging.getLogger(__name__)
+
+COUNT_COLUMNS = ("org_count", "public_count", "acnc_registered_count", "dgr_endorsed_count", "incorporated_count")
+
+# One row per (postcode, suburb, organisation) with its status flags. An organisation
+# counts as DGR endorsed if legal_details says so or it has a current dgr_endorsement.
+ORG_FLAGS = """
+    SELECT c.postcode, coalesce(c.suburb, '') AS suburb, o.org_id, o.is_public,
+           coalesce(bool_or(ld.acnc_registered), false) AS acnc_registered,
+           coalesce(bool_or(ld.dgr_endorsement
+                            OR (d.endorsement_id IS NOT NULL
+                                AND (d.endorsement_end_date IS NULL OR d.endorsement_end_date >= current_date))),
+                    false) AS dgr_endorsed,
+           coalesce(bool_or(ld.incorporation_status), false) AS incorporated
+    FROM community_orgs.contact_info c
+    JOIN community_orgs.organisations o ON o.org_id = c.org_id
+    LEFT JOIN community_orgs.legal_details ld ON ld.org_id = o.org_id
+    LEFT JOIN community_orgs.dgr_endorsement d ON d.legal_id = ld.legal_id
+    WHERE c.postcode IS NOT NULL AND (CAST(:rebuild AS boolean) OR c.postcode = ANY(:postcodes))
+    GROUP BY c.postcode, coalesce(c.suburb, ''), o.org_id, o.is_public
+"""
+
+# An organisation with several addresses in one postcode is counted once for that postcode
+COUNTS = """
+    count(DISTINCT org_id) AS org_count,
+    count(DISTINCT org_id) FILTER (WHERE is_public) AS public_count,
+    count(DISTINCT org_id) FILTER (WHERE acnc_registered) AS acnc_registered_count,
+    count(DISTINCT org_id) FILTER (WHERE dgr_endorsed) AS dgr_endorsed_count,
+    count(DISTINCT org_id) FILTER (WHERE incorporated) AS incorporated_count
+"""
+
+def _refresh_statements(table: str, keys: str) -> List[text]:
+    # Rows for the refreshed postcodes are replaced, so postcodes that lost every
+    # organisation disappear from the summary instead of keeping stale counts
+    delete = text(f"""
+        DELETE FROM community_orgs.{table}
+        WHERE CAST(:rebuild AS boolean) OR postcode = ANY(:postcodes)
+    """)
+    insert = text(f"""
+        WITH org_flags AS ({ORG_FLAGS})
+        INSERT INTO community_orgs.{table} ({keys}, {", ".join(COUNT_COLUMNS)}, refreshed_at)
+        SELECT {keys}, {COUNTS}, current_timestamp
+        FROM org_flags
+        GROUP BY {keys}
+    """)
+    return [statement.bindparams(bindparam("postcodes", type_=ARRAY(String))) for statement in (delete, insert)]
+
+REFRESH = {
+    "postcode_summary": _refresh_statements("postcode_summary", "postcode"),
+    "suburb_summary": _refresh_statements("suburb_summary", "postcode, suburb"),
+}
+
+POSTCODES_FOR_ORGS = text("""
+    SELECT DISTINCT postcode FROM community_orgs.contact_info
+    WHERE org_id = ANY(:org_ids) AND postcode IS NOT NULL
+""").bindparams(bindparam("org_ids", type_=ARRAY(UUID(as_uuid=True))))
+
+def postcodes_for_orgs(connection, org_ids: Iterable) -> List[str]:
+    """Postcodes whose summaries change when these organisations change."""
+    org_ids = list(org_ids)
+    if not org_ids:
+        return []
+    return [row.postcode for row in connection.execute(POSTCODES_FOR_ORGS, {"org_ids": org_ids})]
+
+def refresh_summaries(connection, postcodes: Optional[Iterable[str]] = None) -> int:
+    """
+    Recomputes postcode_summary and suburb_summary for the given postcodes, or rebuilds
+    both when postcodes is None. Runs in the caller's transaction, so readers see either
+    the old or the new counts. Returns the number of postcodes refreshed (0 for nothing
+    to do, -1 for a full rebuild).
+    """
+    rebuild = postcodes is None
+    postcodes = [] if rebuild else sorted(set(postcodes))
+    if not rebuild and not postcodes:
+        return 0
+    for statements in REFRESH.values():
+        for statement in statements:
+            connection.execute(statement, {"rebuild": rebuild, "postcodes": postcodes})
+    logger.info(f"Refreshed summaries for {'all postcodes' if rebuild else f'{len(postcodes)} postcodes'}")
+    return -1 if rebuild else len(postcodes)
+
+def _counts(row) -> Dict:
+    return dict(row._mapping) if row is not None else None
+
+def postcode_summary(connection, postcode: str) -> Optional[Dict]:
+    """Counts for one postcode, or None if it has no organisations."""
+    row = connection.execute(
+        text("SELECT * FROM community_orgs.postcode_summary WHERE postcode = :postcode"), {"postcode": postcode}
+    ).first()
+    return _counts(row)
+
+def postcode_summaries(connection, postcodes: Sequence[str]) -> Dict[str, Dict]:
+    """postcode -> counts for several postcodes; postcodes without organisations are left out."""
+    rows = connection.execute(
+        text("SELECT * FROM community_orgs.postcode_summary WHERE postcode = ANY(:postcodes)")
+        .bindparams(bindparam("postcodes", type_=ARRAY(String))),
+        {"postcodes": list(postcodes)},
+    )
+    return {row.postcode: _counts(row) for row in rows}
+
+def suburb_summaries(connection, postcode: str) -> List[Dict]:
+    """Counts for every suburb of a postcode, largest first."""
+    rows = connection.execute(
+        text("SELECT * FROM community_orgs.suburb_summary WHERE postcode = :postcode "
+             "ORDER BY org_count DESC, suburb"),
+        {"postcode": postcode},
+    )
+    return [_counts(row) for row in rows]
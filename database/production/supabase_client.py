@@ -1,17 +1,35 @@
-from supabase import create_client, Client
+from typing import Optional
+
 from dotenv import dotenv_values
 
-# Load values directly from the .env file
-config = dotenv_values()
+_client = None
+
+def supabase_settings() -> tuple:
+    """Returns (url, key) from the .env file."""
+    config = dotenv_values()
+    return str(config.get("PUBLIC_SUPABASE_URL")), str(config.get("PUBLIC_SUPABASE_ANON_KEY"))
+
+def get_client(url: Optional[str] = None, key: Optional[str] = None):
+    """
+    Returns a supabase Client, created on first use. Importing this module does not
+    read .env, import supabase or make any request.
+    """
+    global _client
+    if url is not None or key is not None:
+        from supabase import create_client
+        default_url, default_key = supabase_settings()
+        return create_client(url or default_url, key or default_key)
+    if _client is None:
+        from supabase import create_client
+        _client = create_client(*supabase_settings())
+    return _client
 
-url: str = str(config.get("PUBLIC_SUPABASE_URL"))
-key: str = str(config.get("PUBLIC_SUPABASE_ANON_KEY"))
-supabase: Client = create_client(url, key)
-response = (
-    supabase.schema('community_orgs')
-    .table("roles")
-    .select("*")
-    .execute()
-)
-print(response)  # Print the response data for debugging
-print(response.data)  # Print the response data for debugging
\ No newline at end of file
+if __name__ == "__main__":
+    response = (
+        get_client().schema('community_orgs')
+        .table("roles")
+        .select("*")
+        .execute()
+    )
+    print(response)  # Print the response data for debugging
+    print(response.data)  # Print the response data for debugging
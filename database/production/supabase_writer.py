@@ -0,0 +1,156 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
+
+from requests.exceptions import RequestException
+
+from database.production.supabase_client import supabase_settings
+from web_worker.http_transport import new_session
+
+logger = logging.getLogger(__name__)
+
+# Conflict target used by upsert() when none is given; each needs a unique constraint or
+# index, which PostgREST requires for on_conflict (database/queries/create_*_unique.sql)
+ON_CONFLICT = {
+    "organisations": "slug",
+    "legal_details": "abn",
+    "dgr_endorsement": "legal_id",
+    "reserved_slugs": "slug",
+}
+
+@dataclass
+class BatchResult:
+    table: str
+    batch: int
+    rows: int
+    bytes: int
+    attempts: int
+    seconds: float
+    status: Optional[int]
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class SupabaseWriter:
+    """
+    Upserts rows into community_orgs tables through the PostgREST bulk endpoint
+    (POST /rest/v1/<table>?on_conflict=... with Prefer: resolution=merge-duplicates).
+
+    Rows are grouped into batches bounded by both row count and encoded size. Up to
+    `concurrency` batches are in flight at once; the row iterator is only read as
+    slots free up, so a large generator is never materialised. Failed batches are
+    retried with backoff and every batch is reported as a BatchResult.
+
+    url and key default to PUBLIC_SUPABASE_URL / PUBLIC_SUPABASE_ANON_KEY from .env;
+    pass a local PostgREST (or stand-in) URL to test without Supabase.
+    """
+
+    def __init__(self, url: Optional[str] = None, key: Optional[str] = None, schema: str = "community_orgs",
+                 batch_rows: int = 500, batch_bytes: int = 1_000_000, concurrency: int = 4,
+                 max_attempts: int = 3, backoff: float = 1.0, rest_path: str = "/rest/v1"):
+        if url is None or key is None:
+            default_url, default_key = supabase_settings()
+            url = url or default_url
+            key = key or default_key
+        self.base_url = url.rstrip("/") + rest_path
+        self.schema = schema
+        self.batch_rows = batch_rows
+        self.batch_bytes = batch_bytes
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        # Batches are retried in _send only: session retries would multiply max_attempts
+        self.session = new_session(self.base_url, max_retries=0, pool_size=concurrency)
+        self.session.headers.update({
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+            "Content-Profile": schema,
+            "Prefer": "resolution=merge-duplicates,return=minimal",
+        })
+
+    def _batches(self, rows: Iterable[Mapping]) -> Iterator[List[bytes]]:
+        batch: List[bytes] = []
+        size = 0
+        for row in rows:
+            encoded = json.dumps(dict(row), default=str, separators=(",", ":")).encode("utf-8")
+            if batch and (len(batch) >= self.batch_rows or size + len(encoded) > self.batch_bytes):
+                yield batch
+                batch, size = [], 0
+            batch.append(encoded)
+            size += len(encoded) + 1
+        if batch:
+            yield batch
+
+    def _send(self, table: str, index: int, batch: List[bytes], columns: str, on_conflict: str) -> BatchResult:
+        body = b"[" + b",".join(batch) + b"]"
+        params = {"on_conflict": on_conflict}
+        if columns:
+            params["columns"] = columns
+        started = time.perf_counter()
+        status, error = None, None
+        attempt = 0
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = self.session.post(f"{self.base_url}/{table}", params=params, data=body)
+                status = response.status_code
+                if response.ok:
+                    error = None
+                    break
+                error = f"HTTP {status}: {response.text[:500]}"
+                # 4xx (other than 408/429) means the batch itself is bad; retrying will not help
+                if 400 <= status < 500 and status not in (408, 429):
+                    break
+            except RequestException as e:
+                error = f"{e.__class__.__name__}: {e}"
+            if attempt < self.max_attempts:
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+        result = BatchResult(table, index, len(batch), len(body), attempt, time.perf_counter() - started, status, error)
+        if result.ok:
+            logger.info(f"{table} batch {index}: {result.rows} rows, {result.bytes} bytes in {result.seconds:.2f}s")
+        else:
+            logger.error(f"{table} batch {index} failed after {attempt} attempts: {error}")
+        return result
+
+    def upsert(self, table: str, rows: Iterable[Mapping], on_conflict: Optional[str] = None,
+               columns: Optional[List[str]] = None) -> List[BatchResult]:
+        """
+        Upserts rows into table and returns one BatchResult per batch, in batch order.
+        Pass columns when rows do not all have the same keys.
+        """
+        on_conflict = on_conflict or ON_CONFLICT.get(table)
+        if not on_conflict:
+            raise ValueError(f"No on_conflict column known for {table}")
+        column_list = ",".join(columns) if columns else ""
+        slots = threading.BoundedSemaphore(self.concurrency)
+        futures: List[Future] = []
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"upsert-{table}") as pool:
+            for index, batch in enumerate(self._batches(rows)):
+                # Backpressure: wait for a free slot before encoding more rows
+                slots.acquire()
+                future = pool.submit(self._send, table, index, batch, column_list, on_conflict)
+                future.add_done_callback(lambda _: slots.release())
+                futures.append(future)
+        results = [future.result() for future in futures]
+        failed = [r for r in results if not r.ok]
+        total_rows = sum(r.rows for r in results)
+        total_seconds = sum(r.seconds for r in results)
+        logger.info(f"{table}: upserted {total_rows - sum(r.rows for r in failed)}/{total_rows} rows "
+                    f"in {len(results)} batches ({total_seconds:.2f}s batch time, {len(failed)} failed)")
+        return results
+
+    def upsert_organisations(self, rows: Iterable[Mapping]) -> List[BatchResult]:
+        return self.upsert("organisations", rows)
+
+    def upsert_related(self, tables: Mapping[str, Iterable[Mapping]]) -> Dict[str, List[BatchResult]]:
+        """Upserts several tables in the given order (parents before children)."""
+        return {table: self.upsert(table, rows) for table, rows in tables.items()}
+
+    def close(self):
+        self.session.close()
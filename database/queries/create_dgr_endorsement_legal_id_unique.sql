@@ -0,0 +1,29 @@
+-- Adds the unique constraint on dgr_endorsement.legal_id declared in
+-- database/production/models.py (unique=True), so SupabaseWriter and
+-- database.production.abr_loader can upsert dgr_endorsement ON CONFLICT (legal_id):
+-- one endorsement row per legal entity. Run with psql outside a transaction block.
+
+-- Duplicate endorsements must be resolved first; this lists them (keep the latest)
+SELECT legal_id, count(*) AS copies,
+       array_agg(endorsement_id ORDER BY last_edited_at DESC NULLS LAST) AS endorsement_ids
+FROM community_orgs.dgr_endorsement
+WHERE legal_id IS NOT NULL
+GROUP BY legal_id
+HAVING count(*) > 1;
+
+-- Built without blocking writes, then attached as the constraint SQLAlchemy would have created
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS dgr_endorsement_legal_id_key
+    ON community_orgs.dgr_endorsement (legal_id);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'dgr_endorsement_legal_id_key'
+          AND conrelid = 'community_orgs.dgr_endorsement'::regclass
+    ) THEN
+        ALTER TABLE community_orgs.dgr_endorsement
+            ADD CONSTRAINT dgr_endorsement_legal_id_key UNIQUE USING INDEX dgr_endorsement_legal_id_key;
+    END IF;
+END
+$$;
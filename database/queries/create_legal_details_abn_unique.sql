@@ -0,0 +1,14 @@
+-- Makes idx_org_abn unique so database.production.abr_loader can upsert legal_details
+-- ON CONFLICT (abn). Run with psql outside a transaction block. The unique index is
+-- built alongside the old one and swapped in, so lookups by ABN keep an index throughout.
+
+-- Duplicate ABNs must be resolved first; this lists them (keep the most recently updated)
+SELECT abn, count(*) AS copies, array_agg(legal_id ORDER BY abn_last_updated DESC NULLS LAST) AS legal_ids
+FROM community_orgs.legal_details
+WHERE abn IS NOT NULL
+GROUP BY abn
+HAVING count(*) > 1;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_org_abn_unique ON community_orgs.legal_details (abn);
+DROP INDEX CONCURRENTLY IF EXISTS community_orgs.idx_org_abn;
+ALTER INDEX community_orgs.idx_org_abn_unique RENAME TO idx_org_abn;
@@ -0,0 +1,38 @@
+-- Per-postcode and per-suburb organisation summaries, matching PostcodeSummary and
+-- SuburbSummary in database/production/models.py. The ETL refreshes the postcodes it
+-- touched through database.production.summaries.refresh_summaries(); run that with no
+-- postcodes for a full rebuild after deletes or address moves.
+
+-- Suburb for the per-suburb summary, backfilled from addresses ending in
+-- "SUBURB STATE POSTCODE" (registered office addresses are in exactly that form).
+ALTER TABLE community_orgs.contact_info
+    ADD COLUMN IF NOT EXISTS suburb VARCHAR;
+
+UPDATE community_orgs.contact_info
+SET
+    suburb = upper(trim(substring(physical_address FROM '(?:^|,\s*)([^0-9,]+?)\s+(?:NSW|VIC|QLD|SA|WA|TAS|NT|ACT)\s+\d{4}\s*$')))
+WHERE
+    suburb IS NULL
+    AND physical_address ~ '(NSW|VIC|QLD|SA|WA|TAS|NT|ACT)\s+\d{4}\s*$';
+
+CREATE TABLE IF NOT EXISTS community_orgs.postcode_summary (
+    postcode VARCHAR(4) PRIMARY KEY,
+    org_count INTEGER NOT NULL DEFAULT 0,
+    public_count INTEGER NOT NULL DEFAULT 0,
+    acnc_registered_count INTEGER NOT NULL DEFAULT 0,
+    dgr_endorsed_count INTEGER NOT NULL DEFAULT 0,
+    incorporated_count INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS community_orgs.suburb_summary (
+    postcode VARCHAR(4) NOT NULL,
+    suburb VARCHAR NOT NULL,
+    org_count INTEGER NOT NULL DEFAULT 0,
+    public_count INTEGER NOT NULL DEFAULT 0,
+    acnc_registered_count INTEGER NOT NULL DEFAULT 0,
+    dgr_endorsed_count INTEGER NOT NULL DEFAULT 0,
+    incorporated_count INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (postcode, suburb)
+);
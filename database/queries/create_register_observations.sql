@@ -0,0 +1,25 @@
+-- Append-only history of what each register said about an entity, matching
+-- RegisterObservations and RegisterPayloads in database/production/models.py.
+-- One small row per (source, entity, run) in register_observations, range-partitioned
+-- by capture date; each distinct register record is stored once in register_payloads,
+-- keyed by its content hash. Monthly partitions are created on demand by
+-- database.production.observations.ensure_partitions().
+
+CREATE TABLE IF NOT EXISTS community_orgs.register_payloads (
+    content_hash BYTEA PRIMARY KEY,
+    payload JSONB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS community_orgs.register_observations (
+    captured_on DATE NOT NULL,
+    source TEXT NOT NULL,
+    entity_key TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    content_hash BYTEA NOT NULL,
+    PRIMARY KEY (source, entity_key, captured_on, run_id)
+) PARTITION BY RANGE (captured_on);
+
+-- Example partition; ensure_partitions() creates these as runs need them
+CREATE TABLE IF NOT EXISTS community_orgs.register_observations_y2025m09
+    PARTITION OF community_orgs.register_observations
+    FOR VALUES FROM ('2025-09-01') TO ('2025-10-01');
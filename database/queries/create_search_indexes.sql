@@ -0,0 +1,43 @@
+-- Search index set for community_orgs, matching the Index() declarations in
+-- database/production/models.py. Run with psql outside a transaction block
+-- (CREATE INDEX CONCURRENTLY does not lock the tables against writes).
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Structured postcode for "near postcode Y" lookups, backfilled from the
+-- trailing four digits of the physical address ("ADAMINABY NSW 2629").
+ALTER TABLE community_orgs.contact_info
+    ADD COLUMN IF NOT EXISTS postcode VARCHAR(4);
+
+UPDATE community_orgs.contact_info
+SET
+    postcode = substring(physical_address FROM '(\d{4})\s*$')
+WHERE
+    postcode IS NULL
+    AND physical_address ~ '\d{4}\s*$';
+
+-- Trigram name search (ILIKE '%x%', similarity(), %)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_org_entity_name_trgm ON community_orgs.organisations USING gin (entity_name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_aliases_alias_trgm ON community_orgs.aliases USING gin (alias gin_trgm_ops);
+
+-- Postcode lookups joined back to organisations
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_contact_info_postcode_org_id ON community_orgs.contact_info (postcode, org_id);
+
+-- Foreign keys to organisations (Postgres does not index these automatically)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_aliases_org_id ON community_orgs.aliases (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_contact_info_org_id ON community_orgs.contact_info (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_legal_details_org_id ON community_orgs.legal_details (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_relationships_org_id ON community_orgs.relationships (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_programs_services_org_id ON community_orgs.programs_services (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_resources_assets_org_id ON community_orgs.resources_assets (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_accreditation_org_id ON community_orgs.accreditation (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_financial_info_org_id ON community_orgs.financial_info (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_historical_info_org_id ON community_orgs.historical_info (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_governance_org_id ON community_orgs.governance (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_operational_details_org_id ON community_orgs.operational_details (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_performance_metrics_org_id ON community_orgs.performance_metrics (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_org_members_org_id ON community_orgs.org_members (org_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_org_visibility_org_id ON community_orgs.org_visibility (org_id);
+
+ANALYZE community_orgs.organisations;
+ANALYZE community_orgs.aliases;
+ANALYZE community_orgs.contact_info;
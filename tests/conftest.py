@@ -0,0 +1,72 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+# Tests import the packages from the repository root, as the entry points do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _server_engine():
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import InterfaceError, OperationalError
+
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(url, isolation_level="AUTOCOMMIT")
+    try:
+        with engine.connect():
+            pass
+    except (OperationalError, InterfaceError) as e:
+        pytest.skip(f"No database at TEST_DATABASE_URL: {e}")
+    return engine
+
+@pytest.fixture(scope="session")
+def production_engine():
+    """
+    An engine on a throwaway database (created next to TEST_DATABASE_URL's, dropped
+    afterwards) holding the community_orgs tables from models.py, for code whose SQL
+    names community_orgs directly. Tests empty the tables they use.
+    """
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.schema import CreateTable
+
+    from database.production.models import Base, LegalDetails
+
+    server = _server_engine()
+    name = f"test_{uuid.uuid4().hex[:12]}"
+    with server.connect() as conn:
+        conn.execute(text(f"CREATE DATABASE {name}"))
+    engine = create_engine(make_url(os.environ["TEST_DATABASE_URL"]).set(database=name))
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE SCHEMA community_orgs"))
+            conn.execute(text("CREATE SCHEMA auth"))
+            # uuid_generate_v4() without depending on the uuid-ossp extension being installed
+            conn.execute(text("CREATE FUNCTION uuid_generate_v4() RETURNS uuid AS 'SELECT gen_random_uuid()' LANGUAGE sql"))
+            conn.execute(text("CREATE TYPE community_orgs.alias_type_enum AS ENUM ('trading_name', 'abbreviation', 'former_name')"))
+            # Tables only (the role tables are reflected, so have no columns to create); the
+            # search indexes need pg_trgm, but the ON CONFLICT (abn) target is needed
+            for table in Base.metadata.sorted_tables:
+                if len(table.columns):
+                    conn.execute(CreateTable(table))
+            for index in LegalDetails.__table__.indexes:
+                index.create(conn)
+        yield engine
+    finally:
+        engine.dispose()
+        with server.connect() as conn:
+            conn.execute(text(f"DROP DATABASE IF EXISTS {name}"))
+        server.dispose()
+
+@pytest.fixture
+def production_db(production_engine):
+    """production_engine with every community_orgs table emptied first."""
+    from sqlalchemy import text
+
+    with production_engine.begin() as conn:
+        tables = conn.execute(text("SELECT tablename FROM pg_tables WHERE schemaname = 'community_orgs'")).scalars().all()
+        conn.execute(text(f"TRUNCATE {', '.join(f'community_orgs.{t}' for t in tables)} CASCADE"))
+    return production_engine
@@ -0,0 +1,33 @@
+import pytest
+
+from web_worker.abr_extract import parse_entity
+
+RESPONSE = (
+    '<soap:Envelope xmlns:soap="{soap}"><soap:Body>'
+    '<SearchByABNv201408Response xmlns="http://abr.business.gov.au/ABRXMLSearch/">'
+    '<ABRPayloadSearchResults><response><businessEntity201408>'
+    '<recordLastUpdatedDate>2024-05-01</recordLastUpdatedDate>'
+    '<ABN><identifierValue>11000000001</identifierValue><isCurrentIndicator>Y</isCurrentIndicator></ABN>'
+    '<entityStatus><entityStatusCode>Active</entityStatusCode><effectiveFrom>2001-01-01</effectiveFrom></entityStatus>'
+    '<dgrEndorsement><endorsedFrom>2005-01-01</endorsedFrom></dgrEndorsement>'
+    '<dgrEndorsement><endorsedFrom>2010-01-01</endorsedFrom></dgrEndorsement>'
+    '<mainBusinessPhysicalAddress><stateCode>NSW</stateCode><postcode>2629</postcode></mainBusinessPhysicalAddress>'
+    '</businessEntity201408></response></ABRPayloadSearchResults>'
+    '</SearchByABNv201408Response></soap:Body></soap:Envelope>'
+)
+
+@pytest.mark.parametrize("soap", ["http://schemas.xmlsoap.org/soap/envelope/", "http://www.w3.org/2003/05/soap-envelope"])
+def test_parse_entity_for_either_soap_version(soap):
+    record = parse_entity(RESPONSE.format(soap=soap).encode())
+
+    assert record["abn"] == "11000000001"
+    assert record["isCurrent"] == "Y"
+    assert record["entityStatus"] == "Active"
+    assert record["record_last_updated"] == "2024-05-01"
+    assert record.raw("dgr") == [{"endorsedFrom": "2005-01-01"}, {"endorsedFrom": "2010-01-01"}]
+    assert record.raw("main_business_physical_address") == {"stateCode": "NSW", "postcode": "2629"}
+
+def test_parse_entity_without_business_entity():
+    empty = RESPONSE.format(soap="http://schemas.xmlsoap.org/soap/envelope/")
+    empty = empty[:empty.index("<businessEntity201408>")] + empty[empty.index("</response>"):]
+    assert parse_entity(empty.encode()) is None
@@ -0,0 +1,69 @@
+import json
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from sqlalchemy import text
+
+from database.production.abr_loader import LoadStats, legal_details_row, load_abn_records, load_batch
+
+def dgr_record(endorsed_to=None):
+    dgr = {"endorsedFrom": "2000-01-01", "itemNumber": "1"}
+    if endorsed_to:
+        dgr["endorsedTo"] = endorsed_to
+    return {"abn": "11 000 000 001", "dgr": json.dumps(dgr)}
+
+@pytest.mark.parametrize("endorsed_to, current", [
+    (None, True),
+    ("0001-01-01", True),
+    ((date.today() + timedelta(days=30)).isoformat(), True),
+    (date.today().isoformat(), True),
+    ((date.today() - timedelta(days=1)).isoformat(), False),
+])
+def test_dgr_endorsement_is_current_until_its_end_date(endorsed_to, current):
+    assert legal_details_row(dgr_record(endorsed_to))["dgr_endorsement"] is current
+
+def test_no_dgr_endorsement():
+    assert legal_details_row({"abn": "11000000001"})["dgr_endorsement"] is False
+
+class Connection:
+    """Returns the legal_details upsert's RETURNING rows for the ABNs in `changed`."""
+
+    def __init__(self, changed):
+        self.changed = changed
+
+    def execute(self, statement):
+        rows = [SimpleNamespace(legal_id=i, abn=abn, org_id=None, inserted=True) for i, abn in enumerate(self.changed)]
+        return SimpleNamespace(all=lambda: rows, rowcount=0)
+
+def test_skipped_counts_unchanged_records_only():
+    batch = [
+        {"abn": "11000000001", "record_last_updated": "2024-01-01"},
+        {"abn": "11 000 000 001", "record_last_updated": "2024-02-01"},  # same ABN, later record
+        {"abn": "22000000002", "record_last_updated": "2024-01-01"},
+        {"abn": "", "record_last_updated": "2024-01-01"},
+        {"record_last_updated": "2024-01-01"},
+    ]
+    stats = LoadStats()
+    load_batch(Connection(["11000000001"]), batch, stats)
+
+    assert (stats.inserted, stats.updated, stats.skipped) == (1, 0, 1)
+
+def test_loaded_rows_are_linked_and_summarised(production_db):
+    with production_db.begin() as conn:
+        org_id = conn.execute(text("INSERT INTO community_orgs.organisations (entity_name, slug) "
+                                   "VALUES ('Foo Club', 'foo-club') RETURNING org_id")).scalar()
+        conn.execute(text("INSERT INTO community_orgs.contact_info (org_id, postcode, suburb) "
+                          "VALUES (:org_id, '2000', 'Sydney')"), {"org_id": org_id})
+        record = {"abn": "11 000 000 001", "record_last_updated": "2024-01-01",
+                  "acnc_status": "Registered", "dgr": json.dumps({"endorsedFrom": "2000-01-01"})}
+        stats = load_abn_records(conn, [record], org_ids={"11000000001": str(org_id)})
+
+    with production_db.connect() as conn:
+        linked = conn.execute(text("SELECT org_id FROM community_orgs.legal_details WHERE abn = '11000000001'")).scalar()
+        summary = conn.execute(text("SELECT org_count, acnc_registered_count, dgr_endorsed_count "
+                                    "FROM community_orgs.postcode_summary WHERE postcode = '2000'")).one()
+    assert (stats.inserted, stats.unlinked) == (1, 0)
+    assert linked == org_id
+    assert tuple(summary) == (1, 1, 1)
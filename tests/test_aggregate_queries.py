@@ -0,0 +1,68 @@
+"""
+Statement counts for reading organisation aggregates, against a scratch schema in the
+PostgreSQL at TEST_DATABASE_URL (skipped when it is unset or unreachable):
+
+    TEST_DATABASE_URL=postgresql+pg8000://postgres@127.0.0.1:5432/postgres python -m pytest -q tests
+"""
+import os
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.orm import Session
+
+from benchmarks.bench_aggregate_queries import drop, lazy_read, scratch_engine, setup
+from database.production.aggregates import load_aggregate, load_aggregates
+
+ORGS = 60
+
+@pytest.fixture(scope="module")
+def engine():
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = scratch_engine(url)
+    try:
+        with engine.connect():
+            pass
+    except (OperationalError, InterfaceError) as e:
+        pytest.skip(f"No database at TEST_DATABASE_URL: {e}")
+    setup(engine, ORGS)
+    yield engine
+    drop(engine)
+    engine.dispose()
+
+@pytest.fixture
+def statements(engine):
+    seen = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield seen
+    event.remove(engine, "before_cursor_execute", count)
+
+@pytest.mark.parametrize("n", [1, 10, ORGS])
+def test_load_aggregates_uses_five_queries_for_any_batch(engine, statements, n):
+    with Session(engine) as session:
+        aggregates = load_aggregates(session, limit=n)
+        assert len(aggregates) == n
+        # Reading every part of every aggregate must not issue more statements
+        parts = sum(len(a.aliases) + len(a.contact_info) + len(a.legal_details) + len(a.dgr_endorsements)
+                    for a in aggregates)
+    assert parts == 5 * n
+    assert len(statements) == 5
+
+def test_load_aggregate_by_slug(engine, statements):
+    with Session(engine) as session:
+        aggregate = load_aggregate(session, "org-000007")
+        assert aggregate.slug == "org-000007"
+        assert [a.alias for a in aggregate.aliases] != []
+        assert len(aggregate.dgr_endorsements) == 1
+    assert len(statements) == 5
+
+def test_lazy_relationships_issue_a_query_per_organisation(engine, statements):
+    with Session(engine) as session:
+        lazy_read(session, 10)
+    assert len(statements) == 1 + 4 * 10
@@ -0,0 +1,41 @@
+import os
+import re
+
+import pandas as pd
+import pytest
+
+from data.processing.address_columns import COLUMNS as ADDRESS_COLUMNS
+from data.processing.clean_register import clean_register
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW = os.path.join(ROOT, "data", "raw")
+
+def abn_data_columns():
+    """The columns of abn_data, in order, from create_abn_table.sql."""
+    with open(os.path.join(ROOT, "database", "queries", "create_abn_table.sql"), encoding="utf-8") as file:
+        ddl = file.read()
+    body = ddl[ddl.index("(") + 1:ddl.index(");")]
+    return [re.match(r"\s*(\w+)", line).group(1) for line in body.splitlines() if re.match(r"\s*\w+\s+\w", line)]
+
+def test_cleaned_abn_file_matches_abn_data(tmp_path):
+    output = tmp_path / "cleaned.csv"
+    clean_register("abn_register_results", os.path.join(RAW, "abn_register_results_20250907_1219.csv"), str(output))
+
+    assert list(pd.read_csv(output, nrows=0).columns) == abn_data_columns()
+
+def test_address_columns_for_abn_on_request(tmp_path):
+    output = tmp_path / "cleaned.csv"
+    clean_register("abn_register_results", os.path.join(RAW, "abn_register_results_20250907_1219.csv"), str(output),
+                   addresses=True)
+
+    assert list(pd.read_csv(output, nrows=0).columns) == abn_data_columns() + list(ADDRESS_COLUMNS)
+
+@pytest.mark.parametrize("addresses, expected", [(None, True), (False, False)])
+def test_nsw_address_columns_by_default(tmp_path, addresses, expected):
+    output = tmp_path / "cleaned.csv"
+    clean_register("fair_trading_incorporation_register_results",
+                   os.path.join(RAW, "fair_trading_incorporation_register_results_20250907_1219.csv"), str(output),
+                   addresses=addresses)
+
+    columns = list(pd.read_csv(output, nrows=0).columns)
+    assert set(ADDRESS_COLUMNS) <= set(columns) if expected else not set(ADDRESS_COLUMNS) & set(columns)
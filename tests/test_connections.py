@@ -0,0 +1,15 @@
+import pytest
+
+from database.connections import database_url
+
+@pytest.mark.parametrize("driver, scheme", [
+    ("pg8000", "postgresql+pg8000"),
+    ("psycopg2", "postgresql+psycopg2"),
+    ("psycopg", "postgresql+psycopg"),
+])
+def test_driver_names_match_their_packages(driver, scheme):
+    assert database_url("pg17", driver).startswith(f"{scheme}://")
+
+def test_unknown_driver():
+    with pytest.raises(ValueError):
+        database_url("pg17", "psycopg3")
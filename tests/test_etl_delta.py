@@ -0,0 +1,34 @@
+import csv
+
+import pytest
+from sqlalchemy import text
+
+from database.production import etl
+
+ABR_COLUMNS = ["abn", "entityDescription", "entityStatus", "record_last_updated"]
+
+def write_snapshot(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=ABR_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+def test_abr_delta_loads_legal_details(production_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(etl, "get_engine", lambda name: production_db)
+    unchanged = {"abn": "11000000001", "entityDescription": "Other Incorporated Entity",
+                 "entityStatus": "Active", "record_last_updated": "2024-01-01"}
+    old = write_snapshot(tmp_path / "old.csv", [unchanged])
+    new = write_snapshot(tmp_path / "new.csv", [unchanged, {**unchanged, "abn": "22000000002"}])
+
+    etl.load_delta("abn_register_results", old, new)
+
+    with production_db.connect() as conn:
+        abns = conn.execute(text("SELECT abn FROM community_orgs.legal_details")).scalars().all()
+        organisations = conn.execute(text("SELECT count(*) FROM community_orgs.organisations")).scalar()
+    assert abns == ["22000000002"]
+    assert organisations == 0
+
+def test_deltas_without_a_loader_are_refused(tmp_path):
+    with pytest.raises(ValueError, match="acnc_register_results"):
+        etl.load_delta("acnc_register_results", str(tmp_path / "old.csv"), str(tmp_path / "new.csv"))
@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from database.connections import _set_statement_timeout
+from database.production import export
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_export_runs_without_statement_timeout(production_engine, monkeypatch, tmp_path, fmt):
+    engine = create_engine(production_engine.url)
+    _set_statement_timeout(engine, 300000)
+    timeouts = []
+
+    def copy_to(dbapi_connection, sql, file):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("SHOW statement_timeout")
+        timeouts.append(cursor.fetchone()[0])
+        cursor.close()
+        return copy(dbapi_connection, sql, file)
+
+    copy = export._copy_to
+    monkeypatch.setattr(export, "_copy_to", copy_to)
+    try:
+        export.export_table(engine, "organisations", str(tmp_path), fmt)
+        with engine.connect() as conn:
+            after = conn.execute(text("SHOW statement_timeout")).scalar()
+    finally:
+        engine.dispose()
+    assert timeouts == ["0"]
+    # Only the export's transaction runs without the timeout
+    assert after == "5min"
@@ -0,0 +1,27 @@
+from utility.metrics import MetricsRegistry
+
+def test_prometheus_counters_are_summed_over_units():
+    metrics = MetricsRegistry()
+    with metrics.labels(source="nsw"):
+        for unit in ("2629", "2630", "2631"):
+            with metrics.labels(unit=unit):
+                metrics.inc("requests_total", host="example")
+                metrics.observe("request_seconds", 0.2)
+    with metrics.labels(source="abr", unit="2629"):
+        metrics.inc("requests_total", 2, host="example")
+
+    text = metrics.prometheus_text("t_")
+    assert 'unit="' not in text
+    assert 't_requests_total{host="example",source="nsw"} 3' in text.splitlines()
+    assert 't_requests_total{host="example",source="abr"} 2' in text.splitlines()
+    assert 't_request_seconds_count{source="nsw"} 3' in text.splitlines()
+
+def test_summary_keeps_counters_per_unit():
+    metrics = MetricsRegistry()
+    for unit in ("2629", "2630"):
+        with metrics.labels(source="nsw", unit=unit):
+            metrics.inc("pages_total")
+
+    series = metrics.snapshot()["counters"]["pages_total"]
+    assert [s["labels"]["unit"] for s in series] == ["2629", "2630"]
+    assert metrics.counter("pages_total", source="nsw") == 2
@@ -0,0 +1,58 @@
+"""NSWAssociationScraper.search_all against canned register pages (no network)."""
+from types import SimpleNamespace
+
+from web_worker.search_nsw_assoc_register import NSWAssociationScraper
+
+ROW = (
+    '<div class="row"><div class="col-md-10"><a href="PublicRegisterDetails.aspx?Organisationid={n}">ORG {n}</a>'
+    '<div class="row text-secondary"><div>Organisation Number: INC{n}</div></div></div>'
+    '<div class="col-md-2"><figcaption><span>Registered</span></figcaption></div></div>'
+)
+NEXT = '<a id="ctl00_MainArea_PageNextLink" href="javascript:__doPostBack(\'ctl00$MainArea$PageNextLink\',\'\')">Next</a>'
+
+def page(rows, next_link=True, state="page"):
+    return (
+        '<html><body><input name="outside" value="x">'
+        '<form id="aspnetForm">'
+        f'<input name="__VIEWSTATE" value="{state}"><select name="ctl00$MainArea$Sort"><option value="name">Name</option></select>'
+        f'<span id="ctl00_MainArea_ResultDataList">{"".join(ROW.format(n=n) for n in rows)}</span>'
+        f'{NEXT if next_link else ""}</form></body></html>'
+    )
+
+class Register:
+    """Answers the search GET with the form, then each POST with the next page."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.posts = []
+
+    def get(self, url):
+        return SimpleNamespace(text=page([], next_link=False, state="search"), raise_for_status=lambda: None)
+
+    def post(self, url, data):
+        self.posts.append(dict(data))
+        return SimpleNamespace(text=self.pages.pop(0), raise_for_status=lambda: None)
+
+def scraper(pages):
+    scraper = NSWAssociationScraper()
+    scraper.session = Register(pages)
+    return scraper
+
+def test_pages_are_followed_until_the_last_one():
+    s = scraper([page([1, 2], state="p1"), page([3], state="p2"), page([4], next_link=False, state="p3")])
+    results = s.search_all(postcode="2629", delay=0, strict=True)
+
+    assert [r["organisation_number"] for r in results] == ["INC1", "INC2", "INC3", "INC4"]
+    assert len(s.session.posts) == 3
+    # Postbacks carry the aspnetForm fields of the page before, and nothing from outside the form
+    assert [p["__VIEWSTATE"] for p in s.session.posts] == ["search", "p1", "p2"]
+    assert all("outside" not in p for p in s.session.posts)
+    assert s.session.posts[1]["__EVENTTARGET"] == "ctl00$MainArea$PageNextLink"
+    assert s.session.posts[1]["ctl00$MainArea$Sort"] == "name"
+
+def test_search_stops_at_the_first_empty_page():
+    s = scraper([page([1]), page([]), page([2])])
+    results = s.search_all(postcode="2629", delay=0, strict=True)
+
+    assert [r["organisation_number"] for r in results] == ["INC1"]
+    assert len(s.session.posts) == 2
@@ -0,0 +1,20 @@
+import pytest
+
+import main
+
+@pytest.fixture
+def regions_file(tmp_path):
+    path = tmp_path / "regions.csv"
+    path.write_text("suburb,state,postcode\nBATLOW,NSW,2730\nTUMUT,NSW,2720\n", encoding="utf-8")
+    return str(path)
+
+def test_selectors_that_match_rows_are_accepted(regions_file):
+    args = main.parse_args(["--regions-file", regions_file, "--regions", "NSW:2700-2730", "batlow"])
+    assert args.regions == ["NSW:2700-2730", "batlow"]
+
+@pytest.mark.parametrize("selector", ["BATLOWW", "3000", "VIC", "2600-2700"])
+def test_selectors_that_match_nothing_are_a_usage_error(regions_file, selector, capsys):
+    with pytest.raises(SystemExit) as exit:
+        main.parse_args(["--regions-file", regions_file, "--regions", "TUMUT", selector])
+    assert exit.value.code == 2
+    assert selector in capsys.readouterr().err
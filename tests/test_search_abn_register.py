@@ -0,0 +1,38 @@
+import logging
+
+import pytest
+
+from web_worker import search_abn_register
+from web_worker.abn_details import ABNDetailStore
+from web_worker.search_abn_register import ABRClient
+
+def parse(content):
+    if content == "bad":
+        raise ValueError("not XML")
+    return None
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    store = ABNDetailStore(str(tmp_path / "abn_details.sqlite"))
+    monkeypatch.setattr(search_abn_register, "abn_details", lambda: store)
+    monkeypatch.setattr(search_abn_register, "parse_entity", parse)
+    monkeypatch.setattr(search_abn_register, "LOOKUP_DELAY", 0)
+    # No zeep client or maintenance check; the search and lookups are stubbed below
+    client = ABRClient.__new__(ABRClient)
+    client.guid, client.logger = "guid", logging.getLogger(__name__)
+    client._call_search_by_charity = lambda params, limit: ["11000000001", "22000000002"]
+    client._fetch_abn_details = lambda abn: "bad" if abn == "22000000002" else "good"
+    yield client, store
+    store.close()
+
+def test_parse_failure_drops_only_that_abn(client):
+    client, store = client
+    assert client.search_charities("2000", "NSW") == []
+    assert store.get("11000000001") is not None
+    assert store.get("22000000002") is None
+
+def test_parse_failure_is_raised_when_strict(client):
+    client, store = client
+    with pytest.raises(ValueError, match="not XML"):
+        client.search_charities("2000", "NSW", strict=True)
+    assert store.get("11000000001") is not None
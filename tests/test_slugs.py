@@ -0,0 +1,28 @@
+from sqlalchemy import text
+
+from database.production import etl
+from database.production.slugs import allocate_slugs
+
+def org_slugs(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT slug FROM community_orgs.organisations ORDER BY slug")).scalars().all()
+
+def test_reloading_repeated_names_adds_no_organisations(production_db, monkeypatch):
+    monkeypatch.setattr(etl, "get_engine", lambda name: production_db)
+    batch = [{"entity_name": "Foo Club", "is_public": True}, {"entity_name": "Foo Club", "is_public": True},
+             {"entity_name": "Bar Club", "is_public": True}]
+
+    etl.load_data(batch)
+    assert org_slugs(production_db) == ["bar-club", "foo-club", "foo-club-2"]
+    etl.load_data(batch)
+    assert org_slugs(production_db) == ["bar-club", "foo-club", "foo-club-2"]
+
+def test_existing_forms_are_reused_in_suffix_order(production_db):
+    with production_db.begin() as conn:
+        conn.execute(text("INSERT INTO community_orgs.organisations (entity_name, slug) "
+                          "VALUES ('Foo Club', 'foo-club'), ('Foo Club', 'foo-club-3')"))
+        conn.execute(text("INSERT INTO community_orgs.reserved_slugs (slug) VALUES ('foo-club-2')"))
+        slugs = allocate_slugs(conn, ["Foo Club"] * 3, keep_existing=True)
+        new = allocate_slugs(conn, ["Foo Club"])
+    assert slugs == ["foo-club", "foo-club-3", "foo-club-4"]
+    assert new == ["foo-club-4"]
@@ -0,0 +1,100 @@
+"""
+SupabaseWriter against a local PostgREST stand-in: a threaded http.server that records
+each POST and answers with the next queued status (201 once the queue is empty).
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from database.production.supabase_writer import SupabaseWriter
+
+class PostgREST(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        url = urlsplit(self.path)
+        with server.lock:
+            server.requests.append({
+                "path": url.path,
+                "params": {k: v[0] for k, v in parse_qs(url.query).items()},
+                "headers": dict(self.headers),
+                "rows": json.loads(body),
+            })
+            status = server.statuses.pop(0) if server.statuses else 201
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def postgrest():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PostgREST)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.statuses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def writer(server, **kwargs) -> SupabaseWriter:
+    kwargs.setdefault("backoff", 0)
+    return SupabaseWriter(f"http://127.0.0.1:{server.server_port}", "test-key", **kwargs)
+
+def test_upsert_batches_rows_with_conflict_target_and_headers(postgrest):
+    rows = [{"slug": f"org-{i}", "name": f"Org {i}"} for i in range(25)]
+    results = writer(postgrest, batch_rows=10, concurrency=2).upsert_organisations(iter(rows))
+
+    assert [r.rows for r in results] == [10, 10, 5]
+    assert all(r.ok and r.attempts == 1 and r.status == 201 for r in results)
+    requests = sorted(postgrest.requests, key=lambda r: r["rows"][0]["slug"] if r["rows"] else "")
+    assert sorted(row["slug"] for r in requests for row in r["rows"]) == sorted(row["slug"] for row in rows)
+    for request in requests:
+        assert request["path"] == "/rest/v1/organisations"
+        assert request["params"] == {"on_conflict": "slug"}
+        assert request["headers"]["Content-Profile"] == "community_orgs"
+        assert request["headers"]["Prefer"] == "resolution=merge-duplicates,return=minimal"
+        assert request["headers"]["Authorization"] == "Bearer test-key"
+
+def test_upsert_passes_columns_and_bounds_batch_bytes(postgrest):
+    rows = [{"legal_id": f"{i:08d}", "dgr_status_from_date": f"2020-01-0{i + 1}"} for i in range(6)]
+    one_row = len(json.dumps(rows[0], separators=(",", ":")))
+    results = writer(postgrest, batch_bytes=2 * one_row + 2).upsert(
+        "dgr_endorsement", rows, columns=["legal_id", "dgr_status_from_date"])
+
+    assert [r.rows for r in results] == [2, 2, 2]
+    assert {r["params"]["on_conflict"] for r in postgrest.requests} == {"legal_id"}
+    assert {r["params"]["columns"] for r in postgrest.requests} == {"legal_id,dgr_status_from_date"}
+
+def test_server_errors_are_retried_max_attempts_times_only(postgrest):
+    postgrest.statuses = [503] * 10
+    [result] = writer(postgrest, max_attempts=3).upsert_organisations([{"slug": "a"}])
+
+    assert not result.ok
+    assert result.attempts == 3 and result.status == 503
+    # One layer of retries: the session itself must not retry the POST
+    assert len(postgrest.requests) == 3
+
+def test_retry_succeeds_after_transient_error(postgrest):
+    postgrest.statuses = [429]
+    [result] = writer(postgrest).upsert_organisations([{"slug": "a"}])
+
+    assert result.ok and result.attempts == 2
+    assert len(postgrest.requests) == 2
+
+def test_bad_batch_is_not_retried(postgrest):
+    postgrest.statuses = [400]
+    [result] = writer(postgrest, max_attempts=3).upsert_organisations([{"slug": "a"}])
+
+    assert not result.ok and result.status == 400 and result.attempts == 1
+    assert len(postgrest.requests) == 1
+
+def test_unknown_table_needs_on_conflict(postgrest):
+    with pytest.raises(ValueError):
+        writer(postgrest).upsert("unknown", [{"id": 1}])
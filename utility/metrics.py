@@ -0,0 +1,196 @@
+"""
+In-process metrics for collection runs.
+
+Counters and latency histograms keyed by name and labels. main.py tags the work it does
+with labels(source=..., unit=...), so requests made by the scrapers (via RetryingSession)
+and the parse timers inside them are attributed to the register and postcode they ran
+for. At the end of a run the registry is written as run_summary_<timestamp>.json next
+to the CSVs and, when METRICS_TEXTFILE is set, as a Prometheus textfile for the
+node_exporter textfile collector.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+# Upper bounds in seconds; wide enough for 4s page delays and slow ABR lookups
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# A per-unit series would multiply the series by the number of postcodes. Histograms are
+# never kept per unit; counters are (for the JSON summary) but summed over units for Prometheus
+HISTOGRAM_DROPS = ("unit",)
+PROMETHEUS_DROPS = ("unit",)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_context_labels: ContextVar[Dict[str, str]] = ContextVar("metric_labels", default={})
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation (max for the overflow bucket)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return round(min(bound, self.max), 3)
+        return round(self.max, 3)
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "mean": round(self.sum / self.count, 3) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 3),
+        }
+
+def _key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _without(key: LabelKey, drops) -> LabelKey:
+    return tuple((k, v) for k, v in key if k not in drops)
+
+def _prometheus_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms; label values come from the call and the current labels() context."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.started = time.time()
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started = time.time()
+
+    @staticmethod
+    def current_labels() -> Dict[str, str]:
+        return dict(_context_labels.get())
+
+    @contextmanager
+    def labels(self, **labels):
+        """Default labels for every metric recorded in this block (and the threads it starts with copy_context)."""
+        token = _context_labels.set({**_context_labels.get(), **labels})
+        try:
+            yield
+        finally:
+            _context_labels.reset(token)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _key({**_context_labels.get(), **labels})
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        merged = {**_context_labels.get(), **labels}
+        key = _without(_key(merged), HISTOGRAM_DROPS)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observes the wall time of the block into histogram `name` (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter(self, name: str, **labels) -> float:
+        """Sum of counter `name` over every series whose labels include the given ones."""
+        wanted = set(_key(labels))
+        with self._lock:
+            return sum(v for key, v in self._counters.get(name, {}).items() if wanted <= set(key))
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": {name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+                             for name, series in sorted(self._counters.items())},
+                "histograms": {name: [{"labels": dict(key), **histogram.summary()}
+                                      for key, histogram in sorted(series.items())]
+                               for name, series in sorted(self._histograms.items())},
+            }
+
+    def write_summary(self, path: str, extra: Optional[Dict] = None):
+        """Writes the snapshot as JSON, with run timing and any extra fields at the top level."""
+        finished = time.time()
+        data = {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "seconds": round(finished - self.started, 3),
+            **(extra or {}),
+            **self.snapshot(),
+        }
+        _write_atomic(path, json.dumps(data, indent=2, default=str))
+
+    def prometheus_text(self, prefix: str = "orgs_collect_") -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {prefix}{name} counter")
+                totals: Dict[LabelKey, float] = {}
+                for key, value in series.items():
+                    key = _without(key, PROMETHEUS_DROPS)
+                    totals[key] = totals.get(key, 0) + value
+                for key, value in sorted(totals.items()):
+                    lines.append(f"{prefix}{name}{_prometheus_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = 'le="+Inf"' if bound == float("inf") else f'le="{bound:g}"'
+                        lines.append(f"{prefix}{name}_bucket{_prometheus_labels(key, le)} {cumulative}")
+                    lines.append(f"{prefix}{name}_sum{_prometheus_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{prefix}{name}_count{_prometheus_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "orgs_collect_"):
+        # Renamed into place so the textfile collector never reads a half-written file
+        _write_atomic(path, self.prometheus_text(prefix))
+
+def _write_atomic(path: str, content: str):
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.replace(partial, path)
+
+# Process-wide registry used by the HTTP transport, the scrapers and main.py
+METRICS = MetricsRegistry()
@@ -0,0 +1,223 @@
+"""
+SQLite store of what each collection run found, one outcome per (run, source, suburb).
+
+main.py records an outcome for every suburb it queries a register for, as soon as the
+postcode unit finishes, so a run that dies part-way still shows how far it got:
+
+    ok        the register returned rows for the suburb (rows holds how many)
+    empty     the register answered for the postcode with no rows at all
+    no_match  the postcode had rows, none of them in this suburb
+    failed    the query raised; reason is timeout, connection_error, http_<status>, ...
+    skipped   not queried, because the suburb is known to be empty (reason known_empty)
+
+ABR results are not split by suburb, so its outcomes have an empty suburb.
+`python main.py --retry-failed RUN` re-runs just the units that failed in an earlier run.
+
+known_empty is a negative cache keyed by (source, state, postcode, suburb). A suburb that
+comes back empty or no_match n times in a row is not due another query for recheck *
+2 ** (n - 1), at most max_recheck; a query that returns rows for it removes it. collect
+skips a postcode for a register while all of its suburbs are cached and none is due.
+
+    sqlite3 data/runs.sqlite "SELECT source, status, reason, count(*) FROM outcomes
+                              WHERE run_id = '20250907_1219' GROUP BY 1, 2, 3"
+"""
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+DEFAULT_PATH = os.getenv("RUN_DB", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                "data", "runs.sqlite"))
+
+OK, EMPTY, NO_MATCH, FAILED, SKIPPED = "ok", "empty", "no_match", "failed", "skipped"
+KNOWN_EMPTY = "known_empty"
+# Negative cache lookups: every suburb cached and none due, or every suburb cached but some due
+HIT, DUE = "hit", "due"
+
+RECHECK = timedelta(days=7)
+MAX_RECHECK = timedelta(days=180)
+
+# Reason codes for the client libraries' own errors, by class name so neither is imported here
+ERROR_REASONS = {
+    "NotFound": "not_found",  # ckanapi
+    "NotAuthorized": "not_authorized",  # ckanapi
+    "ValidationError": "invalid_request",  # ckanapi
+    "CKANAPIError": "request_error",  # ckanapi
+    "Fault": "soap_fault",  # zeep
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT NOT NULL,
+    shard TEXT NOT NULL DEFAULT '',
+    sources TEXT NOT NULL,
+    started TEXT NOT NULL,
+    finished TEXT,
+    PRIMARY KEY (run_id, shard)
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    run_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    state TEXT NOT NULL,
+    postcode TEXT NOT NULL,
+    suburb TEXT NOT NULL,
+    status TEXT NOT NULL,
+    reason TEXT,
+    detail TEXT,
+    rows INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    recorded TEXT NOT NULL,
+    PRIMARY KEY (run_id, source, state, postcode, suburb)
+);
+CREATE INDEX IF NOT EXISTS outcomes_run_status ON outcomes (run_id, status);
+CREATE INDEX IF NOT EXISTS outcomes_place ON outcomes (source, state, postcode, suburb);
+CREATE TABLE IF NOT EXISTS known_empty (
+    source TEXT NOT NULL,
+    state TEXT NOT NULL,
+    postcode TEXT NOT NULL,
+    suburb TEXT NOT NULL,
+    first_empty TEXT NOT NULL,
+    last_checked TEXT NOT NULL,
+    checks INTEGER NOT NULL DEFAULT 1,
+    next_check TEXT,
+    PRIMARY KEY (source, state, postcode, suburb)
+);
+"""
+
+class Outcome(NamedTuple):
+    source: str
+    state: str
+    postcode: str
+    suburb: str
+    status: str
+    reason: Optional[str] = None
+    detail: Optional[str] = None
+    rows: int = 0
+
+class CacheLookup(NamedTuple):
+    status: str  # HIT or DUE
+    checks: int  # fewest consecutive empty results among the suburbs
+    next_check: str  # the soonest re-check among the suburbs
+
+def failure_reason(error: BaseException) -> str:
+    """Reason code for an exception raised by a register query."""
+    from requests.exceptions import ConnectionError, HTTPError, RequestException, Timeout
+
+    if isinstance(error, Timeout):
+        return "timeout"
+    if isinstance(error, ConnectionError):
+        return "connection_error"
+    if isinstance(error, HTTPError) and error.response is not None:
+        return f"http_{error.response.status_code}"
+    if isinstance(error, RequestException):
+        return "request_error"
+    if type(error).__name__ in ERROR_REASONS:
+        return ERROR_REASONS[type(error).__name__]
+    if "maintenance" in str(error).lower():
+        return "maintenance"
+    return "error"
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+class RunDB:
+    """Outcomes and known-empty suburbs in one SQLite file, shared by the shards of a host (WAL)."""
+
+    def __init__(self, path: Optional[str] = None, recheck: timedelta = RECHECK, max_recheck: timedelta = MAX_RECHECK):
+        self.path = path = path or DEFAULT_PATH
+        self.recheck = recheck
+        self.max_recheck = max_recheck
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        # Databases from before the re-check schedule; a NULL next_check is due at once
+        if "next_check" not in {row[1] for row in self.conn.execute("PRAGMA table_info(known_empty)")}:
+            with self.conn:
+                self.conn.execute("ALTER TABLE known_empty ADD COLUMN next_check TEXT")
+
+    def close(self):
+        self.conn.close()
+
+    def start_run(self, run_id: str, shard: Optional[str], sources: Iterable[str]):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO runs (run_id, shard, sources, started) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (run_id, shard) DO UPDATE SET sources = excluded.sources, finished = NULL",
+                (run_id, shard or "", ",".join(sources), _now()))
+
+    def finish_run(self, run_id: str, shard: Optional[str]):
+        with self.conn:
+            self.conn.execute("UPDATE runs SET finished = ? WHERE run_id = ? AND shard = ?",
+                              (_now(), run_id, shard or ""))
+
+    def record(self, run_id: str, outcomes: Iterable[Outcome]):
+        """Stores one unit's outcomes (a repeat attempt replaces the earlier one) and updates known_empty."""
+        now = _now()
+        outcomes = list(outcomes)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO outcomes (run_id, source, state, postcode, suburb, status, reason, detail, rows, recorded) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (run_id, source, state, postcode, suburb) DO UPDATE SET "
+                "status = excluded.status, reason = excluded.reason, detail = excluded.detail, "
+                "rows = excluded.rows, attempts = outcomes.attempts + 1, recorded = excluded.recorded",
+                [(run_id, *outcome, now) for outcome in outcomes])
+            empty = [tuple(o[:4]) for o in outcomes if o.status in (EMPTY, NO_MATCH)]
+            found = [o[:4] for o in outcomes if o.status == OK]
+            checks = self._empty_checks(empty)
+            rows = []
+            for place in empty:
+                count = checks.get(place, 0) + 1
+                rows.append((*place, now, now, count, self._next_check(count)))
+            self.conn.executemany(
+                "INSERT INTO known_empty (source, state, postcode, suburb, first_empty, last_checked, checks, next_check) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, state, postcode, suburb) DO UPDATE SET "
+                "last_checked = excluded.last_checked, checks = excluded.checks, next_check = excluded.next_check",
+                rows)
+            self.conn.executemany(
+                "DELETE FROM known_empty WHERE source = ? AND state = ? AND postcode = ? AND suburb = ?", found)
+
+    def _empty_checks(self, places: List[Tuple[str, str, str, str]]) -> Dict[Tuple[str, str, str, str], int]:
+        """Consecutive empty results so far for each place, looked up one unit at a time."""
+        checks = {}
+        for unit in {place[:3] for place in places}:
+            for suburb, count in self.conn.execute(
+                    "SELECT suburb, checks FROM known_empty WHERE source = ? AND state = ? AND postcode = ?", unit):
+                checks[(*unit, suburb)] = count
+        return checks
+
+    def _next_check(self, checks: int) -> str:
+        interval = min(self.recheck * 2 ** (checks - 1), self.max_recheck)
+        return (datetime.now() + interval).isoformat(timespec="seconds")
+
+    def negative_cache(self, source: str, state: str, postcode: str, suburbs: List[str]) -> Optional[CacheLookup]:
+        """HIT or DUE if every suburb is in known_empty (None otherwise, or when recheck is 0)."""
+        if not suburbs or self.recheck <= timedelta(0):
+            return None
+        rows = {suburb: (checks, next_check) for suburb, checks, next_check in self.conn.execute(
+            "SELECT suburb, checks, next_check FROM known_empty WHERE source = ? AND state = ? AND postcode = ?",
+            (source, state, postcode))}
+        if not set(suburbs) <= set(rows):
+            return None
+        entries = [rows[suburb] for suburb in suburbs]
+        next_check = min(entry[1] or "" for entry in entries)
+        status = HIT if next_check > _now() else DUE
+        return CacheLookup(status, min(entry[0] for entry in entries), next_check)
+
+    def negative_cache_size(self) -> Dict[str, int]:
+        """Cached (known empty) suburbs per source."""
+        return dict(self.conn.execute("SELECT source, count(*) FROM known_empty GROUP BY source").fetchall())
+
+    def failed_units(self, run_id: str) -> Set[Tuple[str, str, str]]:
+        """(source, state, postcode) of every unit with a failed outcome in the run."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT source, state, postcode FROM outcomes WHERE run_id = ? AND status = ?",
+            (run_id, FAILED)).fetchall()
+        return set(rows)
+
+    def latest_run(self) -> Optional[str]:
+        row = self.conn.execute("SELECT run_id FROM runs ORDER BY started DESC LIMIT 1").fetchone()
+        return row[0] if row else None
@@ -0,0 +1,158 @@
+"""
+ABN details memo: each ABN's SearchByABNv201408 result, kept in the process and on disk.
+
+SearchByCharity for a postcode returns ABNs whose main business address can be in another
+postcode, and neighbouring postcodes keep returning the same ones. search_charities asks
+the memo before looking an ABN up, so within max_age an ABN's details are fetched once,
+whichever postcode (or run, or shard on the same host) asks first.
+
+Every entry stores the postcode and state of the ABN's main business address, so a record
+found out of area is not lost: located() returns it for the postcode it belongs to, and
+the search for that postcode (and main.py, for postcodes already searched) adds it.
+located() only knows the ABNs some search returned since the store was opened (fetched or
+served from the memo), so an ABN that SearchByCharity no longer returns is not routed
+from an earlier run, and routing works the same whatever max_age is.
+
+    sqlite3 data/abn_details.sqlite "SELECT state, postcode, count(*) FROM abn_details GROUP BY 1, 2"
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from config_data.addresses import normalise_postcode, state_code
+from web_worker.records import ABNRecord
+
+DEFAULT_PATH = os.getenv("ABN_DETAILS_DB", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                        "data", "abn_details.sqlite"))
+# Details older than this are looked up again; 0 always looks up (and still stores)
+MAX_AGE = timedelta(days=float(os.getenv("ABN_DETAILS_MAX_AGE_DAYS", "7")))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS abn_details (
+    abn TEXT PRIMARY KEY,
+    record TEXT,
+    state TEXT,
+    postcode TEXT,
+    fetched TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS abn_details_place ON abn_details (state, postcode);
+"""
+
+class Detail(NamedTuple):
+    record: Optional[ABNRecord]  # None when the ABR had no business entity for the ABN
+    fetched: str
+
+def main_location(record: Optional[ABNRecord]) -> Tuple[Optional[str], Optional[str]]:
+    """(postcode, state code) of a record's main business address, normalised as in config_data.addresses."""
+    main_addr = record.raw("main_business_physical_address") if record is not None else None
+    if isinstance(main_addr, list):
+        main_addr = main_addr[0] if main_addr else None
+    if not isinstance(main_addr, dict):
+        return None, None
+    return normalise_postcode(main_addr.get("postcode")), state_code(main_addr.get("stateCode"))
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+class ABNDetailStore:
+    """Write-through memo of ABN details: a dict for this process over a SQLite file shared by runs (WAL)."""
+
+    def __init__(self, path: Optional[str] = None, max_age: timedelta = MAX_AGE):
+        self.path = path = path or DEFAULT_PATH
+        self.max_age = max_age
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Parse results may be stored from another thread than the one that looked them up
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._memo: Dict[str, Detail] = {}
+        # (state, postcode) -> {abn: record} for the ABNs searches have returned since the store opened
+        self._located: Dict[Tuple[Optional[str], Optional[str]], Dict[str, ABNRecord]] = {}
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _cutoff(self) -> str:
+        return (datetime.now() - self.max_age).isoformat(timespec="seconds")
+
+    @staticmethod
+    def _record(text: Optional[str]) -> Optional[ABNRecord]:
+        return ABNRecord(*json.loads(text)) if text else None
+
+    def _locate(self, abn: str, record: Optional[ABNRecord]):
+        if record is not None:
+            postcode, state = main_location(record)
+            self._located.setdefault((state, postcode), {})[abn] = record
+
+    def get(self, abn: str) -> Optional[Detail]:
+        """The ABN's details if they were fetched within max_age, else None."""
+        cutoff = self._cutoff()
+        with self._lock:
+            detail = self._memo.get(abn)
+            if detail is None:
+                row = self.conn.execute("SELECT record, fetched FROM abn_details WHERE abn = ?", (abn,)).fetchone()
+                if row is None:
+                    return None
+                detail = self._memo[abn] = Detail(self._record(row[0]), row[1])
+            if detail.fetched <= cutoff:
+                return None
+            self._locate(abn, detail.record)
+        return detail
+
+    def put(self, abn: str, record: Optional[ABNRecord]) -> Detail:
+        """Stores freshly fetched details (None: the ABR has no entity for the ABN)."""
+        detail = Detail(record, _now())
+        postcode, state = main_location(record)
+        values = json.dumps([record[field] for field in ABNRecord.FIELDS]) if record is not None else None
+        with self._lock:
+            self._memo[abn] = detail
+            self._locate(abn, record)
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO abn_details (abn, record, state, postcode, fetched) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (abn) DO UPDATE SET record = excluded.record, state = excluded.state, "
+                    "postcode = excluded.postcode, fetched = excluded.fetched",
+                    (abn, values, state, postcode, detail.fetched))
+        return detail
+
+    def located(self, state: str, postcode: str) -> List[ABNRecord]:
+        """Records searches have returned since the store opened whose main business address is in postcode."""
+        with self._lock:
+            records = self._located.get((state_code(state), normalise_postcode(postcode)), {})
+            return [records[abn] for abn in sorted(records)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT count(*) FROM abn_details").fetchone()[0]
+
+_store: Optional[ABNDetailStore] = None
+_store_lock = threading.Lock()
+
+def configure_abn_details(path: Optional[str] = None, max_age: timedelta = MAX_AGE) -> ABNDetailStore:
+    """Replaces the process-wide store; main.py calls this once per run with --abn-details-db."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+        _store = ABNDetailStore(path, max_age)
+        return _store
+
+def abn_details() -> ABNDetailStore:
+    """Returns the process-wide ABNDetailStore, opening DEFAULT_PATH on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ABNDetailStore()
+        return _store
+
+def close_abn_details():
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
@@ -0,0 +1,172 @@
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from web_worker.records import ABNRecord
+
+ABR_NS = "http://abr.business.gov.au/ABRXMLSearch/"
+
+# Path from the SOAP envelope to the entity. Body is matched by local name ({*}), so
+# SOAP 1.1 and SOAP 1.2 envelopes both work; the payload is always in the ABR namespace
+ENTITY_PATH = (
+    "{*}Body/"
+    f"{{{ABR_NS}}}SearchByABNv201408Response/"
+    f"{{{ABR_NS}}}ABRPayloadSearchResults/"
+    f"{{{ABR_NS}}}response/"
+    f"{{{ABR_NS}}}businessEntity201408"
+)
+
+# ABNRecord field -> path below businessEntity201408 (the first occurrence is used)
+SCALAR_PATHS: Dict[str, Tuple[str, ...]] = {
+    "abn": ("ABN", "identifierValue"),
+    "isCurrent": ("ABN", "isCurrentIndicator"),
+    "replacedFrom": ("ABN", "replacedFrom"),
+    "entityStatus": ("entityStatus", "entityStatusCode"),
+    "effectiveFrom": ("entityStatus", "effectiveFrom"),
+    "effectiveTo": ("entityStatus", "effectiveTo"),
+    "entityTypeCode": ("entityType", "entityTypeCode"),
+    "entityDescription": ("entityType", "entityDescription"),
+    "acnc_status": ("ACNCRegistration", "status"),
+    "acnc_status_from": ("ACNCRegistration", "effectiveFrom"),
+    "acnc_status_to": ("ACNCRegistration", "effectiveTo"),
+    "record_last_updated": ("recordLastUpdatedDate",),
+}
+
+# ABNRecord field -> repeatable element kept whole (one value, or a list when repeated)
+NESTED_ELEMENTS: Dict[str, str] = {
+    "gst": "goodsAndServicesTax",
+    "dgr": "dgrEndorsement",
+    "main_trading_names": "mainTradingName",
+    "other_trading_names": "otherTradingName",
+    "main_business_physical_address": "mainBusinessPhysicalAddress",
+    "tax_concession_endorsements": "taxConcessionCharityEndorsement",
+}
+
+_local_names: Dict[str, str] = {}
+
+def _local(tag: str) -> str:
+    name = _local_names.get(tag)
+    if name is None:
+        index = tag.find("}")
+        name = _local_names[tag] = tag[index + 1:] if index != -1 else tag
+    return name
+
+def _leaf_value(elem: ET.Element) -> Any:
+    text = elem.text
+    if text:
+        text = text.strip()
+    return text if text else {}
+
+def element_value(elem: ET.Element) -> Any:
+    """
+    Same result as etree_to_dict (benchmarks.bench_abr_extract) for one element, built with an
+    explicit stack instead of recursion. Used only for the small nested elements.
+    """
+    if not len(elem):
+        return _leaf_value(elem)
+    # Each frame: (element, child iterator, dict being filled, parent's dict, tag in parent)
+    root_result: List[Any] = []
+    stack = [(elem, iter(elem), {}, None, None)]
+    while stack:
+        node, children, values, parent_values, parent_tag = stack[-1]
+        child = next(children, None)
+        if child is not None:
+            if len(child):
+                stack.append((child, iter(child), {}, values, _local(child.tag)))
+                continue
+            result: Any = _leaf_value(child)
+            tag = _local(child.tag)
+            parent_values = values
+        else:
+            stack.pop()
+            text = (node.text or "").strip()
+            if text:
+                values["value"] = text
+            result, tag = values, parent_tag
+            if parent_values is None:
+                root_result.append(result)
+                continue
+        if tag in parent_values:
+            existing = parent_values[tag]
+            if isinstance(existing, list):
+                existing.append(result)
+            else:
+                parent_values[tag] = [existing, result]
+        else:
+            parent_values[tag] = result
+    return root_result[0]
+
+class BusinessEntityExtractor:
+    """
+    Pulls the ABNRecord fields out of a SearchByABNv201408 response in one pass over the
+    businessEntity201408 children.
+
+    Paths are compiled once into namespace-qualified tags, so no tag is string-stripped
+    while scanning and no dict tree is built for the SOAP wrappers or for elements the
+    record does not use. Repeated elements such as dgrEndorsement and otherTradingName
+    become lists, matching what etree_to_dict produced.
+    """
+
+    def __init__(self, namespace: str = ABR_NS):
+        qualify = lambda name: f"{{{namespace}}}{name}"
+        self.fields = ABNRecord.FIELDS
+        position = {field: i for i, field in enumerate(self.fields)}
+        # entity child tag -> {grandchild tag: record position} for grouped scalars
+        self.groups: Dict[str, Dict[str, int]] = {}
+        # entity child tag -> record position for direct scalars
+        self.direct: Dict[str, int] = {}
+        for field, path in SCALAR_PATHS.items():
+            if len(path) == 1:
+                self.direct[qualify(path[0])] = position[field]
+            else:
+                self.groups.setdefault(qualify(path[0]), {})[qualify(path[1])] = position[field]
+        self.nested: Dict[str, int] = {qualify(tag): position[field] for field, tag in NESTED_ELEMENTS.items()}
+
+    def find_entity(self, root: ET.Element) -> Optional[ET.Element]:
+        return root.find(ENTITY_PATH)
+
+    def extract(self, entity: ET.Element) -> ABNRecord:
+        values: List[Any] = [None] * len(self.fields)
+        seen_groups = set()
+        repeated = set()
+        for child in entity:
+            tag = child.tag
+            index = self.nested.get(tag)
+            if index is not None:
+                value = element_value(child)
+                if values[index] is None:
+                    values[index] = value
+                elif index in repeated:
+                    values[index].append(value)
+                else:
+                    values[index] = [values[index], value]
+                    repeated.add(index)
+                continue
+            group = self.groups.get(tag)
+            if group is not None:
+                if tag in seen_groups:
+                    continue
+                seen_groups.add(tag)
+                filled = set()
+                for grandchild in child:
+                    position = group.get(grandchild.tag)
+                    if position is not None and position not in filled:
+                        values[position] = element_value(grandchild)
+                        filled.add(position)
+                continue
+            index = self.direct.get(tag)
+            if index is not None and values[index] is None:
+                values[index] = element_value(child)
+        return ABNRecord(*values)
+
+    def parse(self, content: Union[bytes, str]) -> Optional[ABNRecord]:
+        """Parses a raw SearchByABNv201408 response; None if it has no business entity."""
+        entity = self.find_entity(ET.fromstring(content))
+        if entity is None:
+            return None
+        return self.extract(entity)
+
+ENTITY_EXTRACTOR = BusinessEntityExtractor()
+
+def parse_entity(content: Union[bytes, str]) -> Optional[ABNRecord]:
+    """ENTITY_EXTRACTOR.parse as a module-level function, so it can be sent to a parse worker."""
+    return ENTITY_EXTRACTOR.parse(content)
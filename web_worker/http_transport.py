@@ -0,0 +1,172 @@
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from requests import Session, Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import (
+    ChunkedEncodingError,
+    ConnectionError,
+    ContentDecodingError,
+    Timeout,
+)
+from urllib3.util.request import ACCEPT_ENCODING
+
+from utility.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# The registers' live endpoints, keyed by the environment variable that overrides each.
+# benchmarks/replay.py sets these to point every client at a local replay server.
+REGISTER_URLS: Dict[str, str] = {
+    "NSW_REGISTER_URL": "https://applications.fairtrading.nsw.gov.au/assocregister",
+    "ACNC_CKAN_URL": "https://data.gov.au/data/",
+    "ABR_WSDL_URL": "https://abr.business.gov.au/ABRXMLSearch/AbrXmlSearch.asmx?WSDL",
+}
+
+def register_url(name: str) -> str:
+    """The endpoint REGISTER_URLS[name], or its override from the environment."""
+    return os.getenv(name, REGISTER_URLS[name])
+
+# Status codes worth another attempt; anything else is returned to the caller as-is
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Network-level failures that are worth another attempt
+RETRYABLE_EXCEPTIONS = (ConnectionError, Timeout, ChunkedEncodingError, ContentDecodingError)
+
+# Keep-alive pool size per register host (connections kept open for reuse)
+HOST_POOL_SIZES: Dict[str, int] = {
+    "abr.business.gov.au": 8,
+    "data.gov.au": 4,
+    "applications.fairtrading.nsw.gov.au": 2,
+}
+DEFAULT_POOL_SIZE = 4
+
+# (connect, read) timeout in seconds applied when a caller does not pass one
+DEFAULT_TIMEOUT: Tuple[float, float] = (10.0, 60.0)
+
+# urllib3 advertises "br" only when brotli/brotlicffi is importable, so it can decode it
+DEFAULT_HEADERS = {
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+}
+
+
+class RetryingSession(Session):
+    """
+    requests.Session with a sized keep-alive pool, default timeouts and jittered retries.
+
+    Retries cover connection errors, timeouts and RETRYABLE_STATUS responses. Other
+    responses (including 4xx) are returned unchanged so callers keep using
+    raise_for_status(); other RequestExceptions are raised immediately. Because it is a
+    plain Session it can be handed to zeep transports and RemoteCKAN directly.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = 3,
+                 backoff: float = 1.0, max_backoff: float = 30.0,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT):
+        super().__init__()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs) -> Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        host = urlsplit(url).hostname or ""
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except RETRYABLE_EXCEPTIONS as e:
+                self._record(host, type(e).__name__, started)
+                if attempt >= self.max_retries:
+                    logger.error(f"{method} {url} failed after {attempt + 1} attempts: {e}")
+                    raise
+                wait = self._backoff_delay(attempt)
+                METRICS.inc("http_retries_total", host=host, reason=type(e).__name__)
+                logger.warning(f"{method} {url} failed ({e}); retrying in {wait:.1f}s")
+            else:
+                self._record(host, str(response.status_code), started, response, kwargs.get("stream"))
+                if not self._is_retryable(response) or attempt >= self.max_retries:
+                    return response
+                wait = self._backoff_delay(attempt, response)
+                METRICS.inc("http_retries_total", host=host, reason=str(response.status_code))
+                logger.warning(f"{method} {url} returned {response.status_code}; retrying in {wait:.1f}s")
+                response.close()
+            time.sleep(wait)
+            attempt += 1
+
+    @staticmethod
+    def _record(host: str, status: str, started: float, response: Optional[Response] = None, stream: bool = False):
+        """Per-attempt latency, outcome and body size, labelled with the caller's source and unit."""
+        METRICS.observe("http_request_seconds", time.perf_counter() - started, host=host)
+        METRICS.inc("http_requests_total", host=host, status=status)
+        if response is None:
+            return
+        if stream:
+            # A streamed body has not been read yet; count what the server declared
+            length = response.headers.get("Content-Length", "")
+            size = int(length) if length.isdigit() else 0
+        else:
+            size = len(response.content)
+        METRICS.inc("http_response_bytes_total", size, host=host)
+
+    def _is_retryable(self, response: Response) -> bool:
+        if response.status_code not in RETRYABLE_STATUS:
+            return False
+        # A SOAP fault comes back as a 500 but will fail the same way every time
+        if response.status_code == 500 and b"Fault>" in response.content[:2048]:
+            return False
+        return True
+
+    def _backoff_delay(self, attempt: int, response: Optional[Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        # Full jitter: spread retries from many workers instead of retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+
+_shared_sessions: Dict[str, RetryingSession] = {}
+_shared_lock = threading.Lock()
+
+
+def new_session(url: str, **kwargs) -> RetryingSession:
+    """Returns a new RetryingSession with its pool sized for the host of url."""
+    host = urlsplit(url).hostname or ""
+    kwargs.setdefault("pool_size", HOST_POOL_SIZES.get(host, DEFAULT_POOL_SIZE))
+    return RetryingSession(**kwargs)
+
+
+def shared_session(url: str) -> RetryingSession:
+    """
+    Returns the process-wide RetryingSession for the host of url, creating it on first use.
+    Only use this for stateless APIs; scrapers that rely on cookies should call new_session.
+    """
+    host = urlsplit(url).hostname or ""
+    with _shared_lock:
+        session = _shared_sessions.get(host)
+        if session is None:
+            session = new_session(url)
+            _shared_sessions[host] = session
+        return session
+
+
+def close_shared_sessions():
+    with _shared_lock:
+        for session in _shared_sessions.values():
+            session.close()
+        _shared_sessions.clear()
+
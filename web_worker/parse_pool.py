@@ -0,0 +1,115 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from utility.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Parser processes; 0 parses inline on the fetching thread (the default outside main.py)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+# Responses submitted but not yet parsed; a fetcher blocks in submit() beyond this
+MAX_PENDING = int(os.getenv("PARSE_MAX_PENDING", "64"))
+
+
+def _timed(parse: Callable[[Any], Any], content: Any):
+    # Runs in the worker: its metrics registry is not the parent's, so the time travels back
+    started = time.perf_counter()
+    result = parse(content)
+    return result, time.perf_counter() - started
+
+
+class ParseJob:
+    """A submitted response; result() returns the parsed value and records its parse time."""
+
+    def __init__(self, stage: str, future: Future):
+        self.stage = stage
+        self.future = future
+
+    def result(self) -> Any:
+        result, seconds = self.future.result()
+        # Observed in the caller's labels() context, so it is attributed to the source and unit
+        METRICS.observe("parse_seconds", seconds, stage=self.stage)
+        return result
+
+
+class ParsePool:
+    """
+    Bounded hand-off from fetchers to parser processes.
+
+    Fetchers submit raw response bodies and carry on with the next request; a process
+    pool turns them into records, so ElementTree work runs on every
+    core instead of holding the GIL between requests. At most max_pending bodies are
+    waiting or being parsed at once: submit() blocks until a slot frees up, which keeps
+    memory flat when the registers answer faster than the parsers keep up. Parse
+    functions and their results must be picklable (module-level functions and records).
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS, max_pending: int = MAX_PENDING):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._executor = None
+        if workers > 0:
+            # spawn, as on Windows: workers start clean instead of inheriting sessions and locks
+            self._executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def submit(self, stage: str, parse: Callable[[Any], Any], content: Any) -> ParseJob:
+        if self._executor is None:
+            future = Future()
+            try:
+                future.set_result(_timed(parse, content))
+            except Exception as e:
+                future.set_exception(e)
+            return ParseJob(stage, future)
+        started = time.perf_counter()
+        self._slots.acquire()
+        METRICS.observe("parse_wait_seconds", time.perf_counter() - started, stage=stage)
+        try:
+            future = self._executor.submit(_timed, parse, content)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return ParseJob(stage, future)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_pool: Optional[ParsePool] = None
+_pool_lock = threading.Lock()
+
+
+def configure_parse_pool(workers: int = PARSE_WORKERS, max_pending: int = MAX_PENDING) -> ParsePool:
+    """Replaces the process-wide pool; main.py calls this once per run with --parse-workers."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = ParsePool(workers, max_pending)
+        if workers > 0:
+            logger.info(f"Parsing responses in {workers} worker processes")
+        return _pool
+
+
+def parse_pool() -> ParsePool:
+    """Returns the process-wide ParsePool, creating it from PARSE_WORKERS on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool()
+        return _pool
+
+
+def close_parse_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,184 @@
+import json
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Tuple
+
+class Record(Mapping):
+    """
+    Read-only, tuple-backed row with a fixed field order.
+
+    Records behave like the dicts the scrapers used to return (record["name"],
+    record.get(...), keys(), csv.DictWriter, json.dumps(dict(record))) but store only a
+    tuple of values; the field names live once on the class. Values of INTERNED fields are
+    passed through sys.intern so repeated statuses and types share one string object.
+    """
+    __slots__ = ("_values",)
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED: FrozenSet[str] = frozenset()
+    _INDEX: Dict[str, int] = {}
+    _INTERN_AT: Tuple[int, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._INDEX = {field: i for i, field in enumerate(cls.FIELDS)}
+        cls._INTERN_AT = tuple(cls._INDEX[field] for field in cls.INTERNED)
+
+    def __init__(self, *values):
+        if len(values) != len(self.FIELDS):
+            raise TypeError(f"{type(self).__name__} takes {len(self.FIELDS)} values, got {len(values)}")
+        if self._INTERN_AT:
+            values = list(values)
+            for i in self._INTERN_AT:
+                if isinstance(values[i], str):
+                    values[i] = sys.intern(values[i])
+        self._values = tuple(values)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Record":
+        return cls(*(data.get(field) for field in cls.FIELDS))
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._INDEX[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __getattr__(self, name: str) -> Any:
+        index = type(self)._INDEX.get(name)
+        if index is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self[name]
+
+    def __reduce__(self):
+        return (type(self), self._values)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(zip(self.FIELDS, (self[field] for field in self.FIELDS)))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+class NSWAssociationRecord(Record):
+    """One search result row from the NSW Fair Trading association register."""
+    __slots__ = ()
+    FIELDS = (
+        "name",
+        "organisation_number",
+        "organisation_type",
+        "status",
+        "date_registered",
+        "date_removed",
+        "registered_office_address",
+        "organisation_id",
+    )
+    INTERNED = frozenset({"organisation_type", "status"})
+
+class ABNRecord(Record):
+    """
+    One ABR businessEntity201408 flattened into the columns of abn_register_results_*.csv.
+
+    Nested fields (GST, DGR, trading names, address, tax concessions) may be passed as
+    parsed values; they are encoded to JSON once on construction and the parsed tree is
+    dropped, since a JSON string is far smaller than the dicts and lists it encodes.
+    raw() decodes them again only when a caller needs the structure.
+    """
+    __slots__ = ()
+    FIELDS = (
+        "abn",
+        "isCurrent",
+        "replacedFrom",
+        "entityStatus",
+        "effectiveFrom",
+        "effectiveTo",
+        "entityTypeCode",
+        "entityDescription",
+        "acnc_status",
+        "acnc_status_from",
+        "acnc_status_to",
+        "record_last_updated",
+        "gst",
+        "dgr",
+        "main_trading_names",
+        "other_trading_names",
+        "main_business_physical_address",
+        "tax_concession_endorsements",
+    )
+    INTERNED = frozenset({"isCurrent", "entityStatus", "entityTypeCode", "entityDescription", "acnc_status"})
+    JSON_FIELDS = frozenset({
+        "gst",
+        "dgr",
+        "main_trading_names",
+        "other_trading_names",
+        "main_business_physical_address",
+        "tax_concession_endorsements",
+    })
+
+    def __init__(self, *values):
+        super().__init__(*values)
+        if any(not isinstance(self._values[i], (str, type(None))) for i in self._JSON_AT):
+            values = list(self._values)
+            for i in self._JSON_AT:
+                if values[i] is not None and not isinstance(values[i], str):
+                    values[i] = json.dumps(values[i])
+            self._values = tuple(values)
+
+    def raw(self, key: str) -> Any:
+        """Returns a nested field decoded from JSON rather than as a string."""
+        value = self[key]
+        if key in self.JSON_FIELDS and value is not None:
+            return json.loads(value)
+        return value
+
+ABNRecord._JSON_AT = tuple(ABNRecord._INDEX[field] for field in ABNRecord.JSON_FIELDS)
+
+class ACNCCharityRecord(Mapping):
+    """
+    One ACNC register record from the CKAN datastore.
+
+    The datastore returns the same columns for every record, so the column tuple and its
+    index are shared by every record with that layout and each record holds only its
+    values. Location and size values are interned.
+    """
+    __slots__ = ("_fields", "_index", "_values")
+    INTERNED = frozenset({"State", "Town_City", "Postcode", "Country", "Charity_Size"})
+    _layouts: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], Dict[str, int], Tuple[int, ...]]] = {}
+
+    def __init__(self, data: Mapping):
+        fields = tuple(data)
+        layout = self._layouts.get(fields)
+        if layout is None:
+            index = {field: i for i, field in enumerate(fields)}
+            intern_at = tuple(index[field] for field in self.INTERNED if field in index)
+            layout = self._layouts[fields] = (fields, index, intern_at)
+        self._fields, self._index, intern_at = layout
+        values = list(data.values())
+        for i in intern_at:
+            if isinstance(values[i], str):
+                values[i] = sys.intern(values[i])
+        self._values = tuple(values)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __reduce__(self):
+        return (type(self), (dict(zip(self._fields, self._values)),))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self._values))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+def as_dicts(records: Iterable[Mapping]) -> Iterator[Dict[str, Any]]:
+    """Plain dicts for sinks that need them (e.g. SQLAlchemy bulk inserts)."""
+    for record in records:
+        yield dict(record.items())
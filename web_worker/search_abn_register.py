@@ -1,32 +1,73 @@
 import os
 import time
 import logging
-import json
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional, Any
-from dotenv import load_dotenv
-from requests import Session
+from functools import lru_cache
+from typing import List, Dict, Optional
 from requests.exceptions import RequestException
-import zeep
-from zeep.transports import Transport
 import xml.etree.ElementTree as ET
 
-load_dotenv()
-ABN_GUID: str = os.getenv("PRIVATE_ABN_SEARCH_GUID", "")
-if not ABN_GUID:
-    raise ValueError("PRIVATE_ABN_SEARCH_GUID environment variable is not set.")
+from config_data.addresses import normalise_postcode, state_code
+from web_worker.http_transport import register_url, shared_session, close_shared_sessions
+from web_worker.abn_details import abn_details, main_location
+from web_worker.abr_extract import parse_entity
+from web_worker.parse_pool import parse_pool
+from utility.metrics import METRICS
 
 NAMESPACE = {'ns': 'http://abr.business.gov.au/ABRXMLSearch/'}
+WSDL_URL = register_url("ABR_WSDL_URL")
+# Pause between ABN detail lookups, to stay within the ABR's usage limits
+LOOKUP_DELAY = float(os.getenv("ABR_LOOKUP_DELAY", "0.4"))
+
+def abn_guid() -> str:
+    """The ABR web services GUID from .env or the environment, read when the first query runs."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    guid = os.getenv("PRIVATE_ABN_SEARCH_GUID", "")
+    if not guid:
+        raise ValueError("PRIVATE_ABN_SEARCH_GUID environment variable is not set.")
+    return guid
+
+@lru_cache(maxsize=None)
+def _wsdl_cache():
+    # Parsed WSDL is reused by every ABRClient instead of being re-fetched per postcode
+    from zeep.cache import InMemoryCache
+
+    return InMemoryCache()
+
+@lru_cache(maxsize=None)
+def _transport_class():
+    from zeep.transports import Transport
+
+    class CustomTransport(Transport):
+        def __init__(self, session=None, cache=None):
+            super().__init__(session=session, cache=cache)
+            self.last_response = None
+        def post(self, address, message, headers):
+            response = super().post(address, message, headers)
+            self.last_response = response
+            return response
+
+    return CustomTransport
+
+def __getattr__(name):
+    # zeep and the GUID are loaded when the first ABR query runs, not at import
+    if name == "ABN_GUID":
+        return abn_guid()
+    if name == "CustomTransport":
+        return _transport_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class ABRClient:
     def __init__(self, guid: str):
+        import zeep
+
         self.guid = guid
-        self.session = Session()
-        self.transport = CustomTransport(session=self.session)
-        self.client = zeep.Client(
-            'https://abr.business.gov.au/ABRXMLSearch/AbrXmlSearch.asmx?WSDL',
-            transport=self.transport
-        )
+        # Pooled keep-alive session shared with every other ABRClient; retries live there
+        self.session = shared_session(WSDL_URL)
+        self.transport = _transport_class()(session=self.session, cache=_wsdl_cache())
+        self.client = zeep.Client(WSDL_URL, transport=self.transport)
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         self._check_maintenance()
@@ -43,7 +84,12 @@ class ABRClient:
             if start <= now <= end:
                 raise RuntimeError(f"ABR Service under maintenance until {end.strftime('%Y-%m-%d %H:%M AEST')}")
 
-    def search_charities(self, postcode, state, max_abns=None) -> List[Dict]:
+    def search_charities(self, postcode, state, max_abns=None, strict=False) -> List[Dict]:
+        """
+        Charities whose main business address is in postcode. A failed ABN detail lookup
+        or parse drops that ABN unless strict, when the first failure is raised once every other
+        ABN has been looked up, so the postcode is not mistaken for a complete result.
+        """
         search_params = {
             'postcode': postcode,
             'state': '',
@@ -55,214 +101,119 @@ class ABRClient:
 
         abns = self._call_search_by_charity(search_params, max_abns)
         charities = []
-
+        wanted = (normalise_postcode(postcode), state_code(state))
+
+        # Details fetched within the memo's max_age, by this search or any other, are not fetched again
+        store = abn_details()
+        details = []
+        # Detail responses go to the parse pool while the next lookup is in flight
+        pool = parse_pool()
+        pending = []
+        failures = []
         for abn in abns:
-            parsed_details = self._lookup_abn_details(abn)
-            if not parsed_details:
+            detail = store.get(abn)
+            if detail is not None:
+                METRICS.inc("abn_details_memo_hits_total")
+                details.append((abn, detail.record))
                 continue
-
-            be = extract_business_entity(parsed_details)
-
-            # Only include those whose main location matches search
-            main_addr = be.get("mainBusinessPhysicalAddress")
-            postcode_val = None
-            state_code = None
-            if main_addr:
-                postcode_val = main_addr.get("postcode")
-                state_code = (main_addr.get("stateCode") or '').upper()
-            if state_code == state.upper() and postcode_val == postcode:
-                charities.append(format_record(be))
-            time.sleep(0.4)
-        self.logger.info(f"Returning {len(charities)} charity results")
+            METRICS.inc("abn_details_memo_misses_total")
+            try:
+                content = self._fetch_abn_details(abn)
+            except (RequestException, RuntimeError) as e:
+                logging.error(f"Failed SearchByABNv201408 for ABN {abn}: {e}")
+                METRICS.inc("abn_details_failures_total")
+                failures.append(e)
+                continue
+            pending.append((abn, pool.submit("abn_details", parse_entity, content)))
+            time.sleep(LOOKUP_DELAY)
+        for abn, job in pending:
+            try:
+                record = job.result()
+            except Exception as e:
+                logging.error(f"Failed to parse details for ABN {abn}: {e}")
+                METRICS.inc("abn_details_failures_total")
+                failures.append(e)
+                continue
+            details.append((abn, store.put(abn, record).record))
+        if failures and strict:
+            # The ABNs that were found stay in the memo, so a retry only looks up the failed ones
+            self.logger.error(f"{len(failures)} of {len(abns)} ABN lookups failed for postcode {postcode}")
+            raise failures[0]
+
+        found = set()
+        for abn, record in details:
+            if record is None:
+                logging.error(f"No business entity in response for ABN {abn}")
+                continue
+            # Only include those whose main location matches search; the memo keeps the others
+            # under their own postcode, where located() finds them
+            if main_location(record) == wanted:
+                charities.append(record)
+                found.add(record["abn"])
+            else:
+                METRICS.inc("abn_out_of_area_total")
+
+        # Out-of-area results of earlier searches that belong to this postcode
+        routed = [record for record in store.located(state, postcode) if record["abn"] not in found]
+        if routed:
+            METRICS.inc("abn_routed_rows_total", len(routed))
+            charities.extend(routed)
+        self.logger.info(f"Returning {len(charities)} charity results ({len(routed)} found by other searches)")
         return charities
 
     def _call_search_by_charity(self, params, limit) -> List[str]:
-        max_retries = 3
-        content = None        
-        for attempt in range(max_retries):
-            try:
-                self.client.service.SearchByCharity(**params)
-                if not self.transport.last_response:
-                    raise RuntimeError("No response from SearchByCharity")
-                content = self.transport.last_response.content
-                break
-            except RequestException as e:
-                if attempt == max_retries - 1:
-                    raise
-                time.sleep(2 ** attempt)
-
-        if content is None:
-            raise RuntimeError("Failed to get response content after all retries")
+        # Transient failures are retried by the shared session; anything raised here is final.
+        # raw_response: the body is parsed below, so zeep does not build objects from it first
+        with self.client.settings(raw_response=True):
+            response = self.client.service.SearchByCharity(**params)
+        if response is None:
+            raise RuntimeError("No response from SearchByCharity")
+        response.raise_for_status()
+        content = response.content
 
         if isinstance(content, bytes):
             result = content.decode('utf-8')
         else:
             result = content
             
-        root = ET.fromstring(result)
-        abn_list = root.findall('.//ns:abn', namespaces=NAMESPACE)
-        abns = [abn.text for abn in abn_list if abn.text]
+        with METRICS.timer("parse_seconds", stage="charity_search"):
+            root = ET.fromstring(result)
+            abn_list = root.findall('.//ns:abn', namespaces=NAMESPACE)
+            abns = [abn.text for abn in abn_list if abn.text]
         if limit is not None:
             abns = abns[:limit]
         return abns
 
-    def _lookup_abn_details(self, abn) -> Optional[Any]:
+    def _fetch_abn_details(self, abn) -> bytes:
         """
-        Returns all values from the response XML as a nested dict (or text/None).
+        Returns the raw SearchByABNv201408 response for the ABN. Raises RequestException
+        (after the session's retries) or RuntimeError if there is no response.
         """
-        max_retries = 3
         params = dict(
             searchString=abn,
             includeHistoricalDetails='N',
             authenticationGuid=self.guid
         )
-        res = None
-
-        for attempt in range(max_retries):
-            try:
-                self.client.service.SearchByABNv201408(**params)
-                if not self.transport.last_response:
-                    raise RuntimeError(f"No response for ABN {abn}")
-                res = self.transport.last_response.content
-                break
-            except RequestException as e:
-                if attempt == max_retries - 1:
-                    logging.error(f"Failed SearchByABNv201408 for ABN {abn} after {max_retries} attempts: {e}")
-                    return None
-                time.sleep(2 ** attempt)
-
-        if res is None:
-            logging.error(f"No response content received for ABN {abn}")
-            return None
-
-        if isinstance(res, bytes):
-            res = res.decode('utf-8')
-
-        root = ET.fromstring(res)
-        # Extract the entire response
-        return etree_to_dict(root)
-
-class CustomTransport(Transport):
-    def __init__(self, session=None):
-        super().__init__(session=session)
-        self.last_response = None
-    def post(self, address, message, headers):
-        response = super().post(address, message, headers)
-        self.last_response = response
-        return response
-
-def etree_to_dict(elem) -> Any:
-    """
-    Recursively convert an xml.etree.ElementTree.Element into a dict or a text value.
-    """
-    d = {}
-    children = list(elem)
-    if children:
-        child_dict = {}
-        for child in children:
-            tag = child.tag
-            ns_idx = tag.find('}')
-            if ns_idx != -1:
-                tag = tag[ns_idx + 1:]
-            child_value = etree_to_dict(child)
-            if tag in child_dict:
-                if isinstance(child_dict[tag], list):
-                    child_dict[tag].append(child_value)
-                else:
-                    child_dict[tag] = [child_dict[tag], child_value]
-            else:
-                child_dict[tag] = child_value
-        d.update(child_dict)
-    text = (elem.text or '').strip()
-    if text and not children:
-        return text
-    elif text:
-        d['value'] = text
-    return d
-
-def extract_business_entity(details: dict) -> dict:
-    """
-    Returns the businessEntity201408 dictionary from parsed ABR XML.
-    """
-    response = (
-        details.get("Body", {})
-        .get("SearchByABNv201408Response", {})
-        .get("ABRPayloadSearchResults", {})
-        .get("response", {})
-    )
-    return response.get("businessEntity201408", {})
-
-def format_record(be: dict) -> dict:
-    """
-    Formats a businessEntity201408 dict into the requested flat record structure.
-    """
-    def get_path(node, *path):
-        curr = node
-        for key in path:
-            if isinstance(curr, list):
-                curr = curr[0] if curr else None
-            if not isinstance(curr, dict):
-                return None
-            curr = curr.get(key)
-        if isinstance(curr, dict) or isinstance(curr, list):
-            return curr
-        return curr
-
-    abn = get_path(be, "ABN", "identifierValue")
-    is_current = get_path(be, "ABN", "isCurrentIndicator")
-    replaced_from = get_path(be, "ABN", "replacedFrom")
-    entity_status = get_path(be, "entityStatus", "entityStatusCode")
-    effective_from = get_path(be, "entityStatus", "effectiveFrom")
-    effective_to = get_path(be, "entityStatus", "effectiveTo")
-    entity_type_code = get_path(be, "entityType", "entityTypeCode")
-    entity_type_description = get_path(be, "entityType", "entityDescription")
-    acnc_status = get_path(be, "ACNCRegistration", "status")
-    acnc_status_from = get_path(be, "ACNCRegistration", "effectiveFrom")
-    acnc_status_to = get_path(be, "ACNCRegistration", "effectiveTo")
-    record_last_updated = be.get("recordLastUpdatedDate")
-
-    gst = json.dumps(be.get("goodsAndServicesTax")) if be.get("goodsAndServicesTax") is not None else None
-    dgr = json.dumps(be.get("dgrEndorsement")) if be.get("dgrEndorsement") is not None else None
-    main_trading_names = json.dumps(be.get("mainTradingName")) if be.get("mainTradingName") is not None else None
-    other_trading_names = json.dumps(be.get("otherTradingName")) if be.get("otherTradingName") is not None else None
-    main_business_physical_address = json.dumps(be.get("mainBusinessPhysicalAddress")) if be.get("mainBusinessPhysicalAddress") is not None else None
-    tax_concession_endorsements = json.dumps(be.get("taxConcessionCharityEndorsement")) if be.get("taxConcessionCharityEndorsement") is not None else None
-
-    return {
-        "abn": abn,
-        "isCurrent": is_current,
-        "replacedFrom": replaced_from,
-        "entityStatus": entity_status,
-        "effectiveFrom": effective_from,
-        "effectiveTo": effective_to,
-        "entityTypeCode": entity_type_code,
-        "entityDescription": entity_type_description,
-        "acnc_status": acnc_status,
-        "acnc_status_from": acnc_status_from,
-        "acnc_status_to": acnc_status_to,
-        "record_last_updated": record_last_updated,
-        "gst": gst,
-        "dgr": dgr,
-        "main_trading_names": main_trading_names,
-        "other_trading_names": other_trading_names,
-        "main_business_physical_address": main_business_physical_address,
-        "tax_concession_endorsements": tax_concession_endorsements,
-    }
-
-def query_abn_register(state, postcode, max_abns=None) -> List[Dict]:
+        with self.client.settings(raw_response=True):
+            response = self.client.service.SearchByABNv201408(**params)
+        if response is None:
+            raise RuntimeError(f"No response for ABN {abn}")
+        response.raise_for_status()
+        if not response.content:
+            raise RuntimeError(f"No response content received for ABN {abn}")
+        return response.content
+
+def query_abn_register(state, postcode, max_abns=None, strict=False) -> List[Dict]:
     """
     Top-level function to query ABR register just like scrape_website or query_acnc_charities.
-    Returns a list of dict records in the output structure.
+    Returns a list of dict records in the output structure; with strict, a failed ABN
+    lookup is raised (see search_charities).
     """
-    client = ABRClient(ABN_GUID)
-    try:
-        return client.search_charities(postcode=postcode, state=state, max_abns=max_abns)
-    finally:
-        if hasattr(client, 'session'):
-            client.session.close()
+    client = ABRClient(abn_guid())
+    return client.search_charities(postcode=postcode, state=state, max_abns=max_abns, strict=strict)
 
 def main():
-    client = ABRClient(ABN_GUID)
+    client = ABRClient(abn_guid())
     try:
         charities = client.search_charities("BATLOW", "2730", "NSW")
         print(f"\nFound {len(charities)} charities:\n")
@@ -273,8 +224,7 @@ def main():
     except Exception as e:
         print(f"Error: {str(e)}")
     finally:
-        if hasattr(client, 'session'):
-            client.session.close()
+        close_shared_sessions()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,14 +1,22 @@
-import requests
 import json
 import itertools
-from ckanapi import RemoteCKAN
 
-def query_acnc_charities(town_city=None, state=None, postcode=None):
+from web_worker.http_transport import register_url, shared_session
+from web_worker.records import ACNCCharityRecord
+from utility.metrics import METRICS
+
+CKAN_URL = register_url("ACNC_CKAN_URL")
+
+def query_acnc_charities(town_city=None, state=None, postcode=None, strict=False):
     """
     Queries the ACNC Charity Register Data API based on provided filters.
     [function docstring remains the same]
+    With strict, an API error is raised instead of printed, so it is not taken for no results.
     """
-    rc = RemoteCKAN('https://data.gov.au/data/', apikey='')
+    from ckanapi import RemoteCKAN
+
+    # Shared pooled session: transient errors are retried there, so an error here is final
+    rc = RemoteCKAN(CKAN_URL, apikey='', session=shared_session(CKAN_URL))
     RESOURCE_ID = "eb1e6be4-5b13-4feb-b28e-388bf7c26f93"
 
     all_found_records = []
@@ -67,11 +75,13 @@ def query_acnc_charities(town_city=None, state=None, postcode=None):
                 data = rc.action.datastore_search(**params)
                 if data.get("records"):
                     records = data["records"]
-                    for record in records:
-                        abn = record.get('ABN')
-                        if abn and abn not in seen_abns:
-                            all_found_records.append(record)
-                            seen_abns.add(abn)
+                    METRICS.inc("pages_total")
+                    with METRICS.timer("parse_seconds", stage="datastore_records"):
+                        for record in records:
+                            abn = record.get('ABN')
+                            if abn and abn not in seen_abns:
+                                all_found_records.append(ACNCCharityRecord(record))
+                                seen_abns.add(abn)
                     if len(records) < PAGE_SIZE:
                         break
                     else:
@@ -79,6 +89,8 @@ def query_acnc_charities(town_city=None, state=None, postcode=None):
                 else:
                     break
             except Exception as e:
+                if strict:
+                    raise
                 print(f"API error for filters {current_filters}, offset {offset}: {e}")
                 break
 
@@ -1,24 +1,42 @@
-import requests
-from bs4 import BeautifulSoup, Tag
 import time
 import re
 
+from web_worker.http_transport import new_session, register_url
+from web_worker.records import NSWAssociationRecord
+from utility.metrics import METRICS
+
+REGISTER_URL = register_url("NSW_REGISTER_URL")
+
+def parse_results_page(html):
+    """
+    (records, aspnetForm fields, next page event target) for one results page, from a
+    single parse.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    records = NSWAssociationScraper._parse_results(soup)
+    next_target = NSWAssociationScraper._get_next_event_target(soup) if records else None
+    if not next_target:
+        return records, None, None
+    return records, NSWAssociationScraper._get_form_fields(soup), next_target
+
 class NSWAssociationScraper:
-    BASE_URL = "https://applications.fairtrading.nsw.gov.au/assocregister/RegistrationSearch.aspx"
-    DETAILS_URL = "https://applications.fairtrading.nsw.gov.au/assocregister/PublicRegisterDetails.aspx?Organisationid={orgid}"
+    BASE_URL = f"{REGISTER_URL}/RegistrationSearch.aspx"
+    DETAILS_URL = f"{REGISTER_URL}/PublicRegisterDetails.aspx?Organisationid={{orgid}}"
 
     def __init__(self):
-        self.session = requests.Session()
+        # Own session (not shared): the ASP.NET search keeps state in cookies
+        self.session = new_session(self.BASE_URL)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
 
-    def _get_form_fields(self, soup):
+    @staticmethod
+    def _get_form_fields(soup):
         form = soup.find('form', {'id': 'aspnetForm'})
         if form is None:
             raise Exception("Form not found!")
@@ -36,7 +54,8 @@ class NSWAssociationScraper:
                 fields[name] = selected.get('value', '') if selected else ''
         return fields
 
-    def _parse_results(self, soup):
+    @staticmethod
+    def _parse_results(soup):
         """Parse search results from the page"""
         results = []
         results_list = soup.find('span', id='ctl00_MainArea_ResultDataList')
@@ -85,20 +104,21 @@ class NSWAssociationScraper:
                     status = status_span.get_text(strip=True)
 
             if name:
-                results.append({
-                    "name": name,
-                    "organisation_number": org_number,
-                    "organisation_type": org_type,
-                    "status": status,
-                    "date_registered": date_registered,
-                    "date_removed": date_removed,
-                    "registered_office_address": reg_address,
-                    "organisation_id": orgid
-                })
+                results.append(NSWAssociationRecord(
+                    name,
+                    org_number,
+                    org_type,
+                    status,
+                    date_registered,
+                    date_removed,
+                    reg_address,
+                    orgid
+                ))
 
         return results
 
-    def _get_next_event_target(self, soup):
+    @staticmethod
+    def _get_next_event_target(soup):
         """Find the next page link event target"""
         candidates = [
             'ctl00_MainArea_PageNextLink',
@@ -118,8 +138,13 @@ class NSWAssociationScraper:
         return None
 
     def search_all(self, organisation_name=None, organisation_number=None, organisation_type=None,
-                   suburb=None, postcode=None, status=None, delay=0.5):
-        """Perform search and return all results across all pages"""
+                   suburb=None, postcode=None, status=None, delay=0.5, strict=False):
+        """
+        Perform search and return all results across all pages. Errors are printed and give
+        [] unless strict, when they are raised so a failed search is not mistaken for no results.
+        """
+        from bs4 import BeautifulSoup
+
         all_results = []
         page_num = 0
         try:
@@ -149,11 +174,17 @@ class NSWAssociationScraper:
             print(f"Performing search with suburb='{suburb}', postcode='{postcode}'...")
             search_response = self.session.post(self.BASE_URL, data=fields)
             search_response.raise_for_status()
-            search_soup = BeautifulSoup(search_response.text, 'html.parser')
 
+            # Each page is parsed once, on this thread: its rows, and the form fields and
+            # pager link the next postback is built from. Pages are requested in turn, as
+            # each postback needs the previous page's __VIEWSTATE, so a parse pool would
+            # have nothing to overlap with
             while True:
                 page_num += 1
-                new_results = self._parse_results(search_soup)
+                started = time.perf_counter()
+                new_results, fields, next_target = parse_results_page(search_response.text)
+                METRICS.observe("parse_seconds", time.perf_counter() - started, stage="results_page")
+                METRICS.inc("pages_total")
                 if not new_results:
                     print(f"Page {page_num}: no results found. Stopping.")
                     break
@@ -161,30 +192,31 @@ class NSWAssociationScraper:
                 all_results.extend(new_results)
                 print(f"Fetched page {page_num}: {len(new_results)} results, {len(all_results)} total so far.")
 
-                next_target = self._get_next_event_target(search_soup)
                 if not next_target:
                     print(f"No more pages after page {page_num}. Done.")
                     break
 
-                fields = self._get_form_fields(search_soup)
                 fields['__EVENTTARGET'] = next_target
                 fields['__EVENTARGUMENT'] = ''
 
                 time.sleep(delay)
-                next_response = self.session.post(self.BASE_URL, data=fields)
-                next_response.raise_for_status()
-                search_soup = BeautifulSoup(next_response.text, 'html.parser')
+                search_response = self.session.post(self.BASE_URL, data=fields)
+                search_response.raise_for_status()
 
             print(f"Completed search across {page_num} page(s). Found {len(all_results)} total results.")
             return all_results
 
         except Exception as e:
+            if strict:
+                raise
             print(f"Error during search: {e}")
             import traceback
             traceback.print_exc()
             return []
 
     def fetch_org_details(self, orgid):
+        from bs4 import BeautifulSoup, Tag
+
         url = self.DETAILS_URL.format(orgid=orgid)
         try:
             response = self.session.get(url)